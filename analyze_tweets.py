@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Stream tweets through analyze_content_full and write NDJSON analysis records
+
+Input is NDJSON (one JSON object or string per line) or plain text with
+one tweet per line, from a file or stdin. Every stage is a generator, so
+memory stays flat regardless of input size. Progress and throughput go
+to stderr.
+
+    python analyze_tweets.py tweets.ndjson --scores-only > scores.ndjson
+    cat drafts.txt | python analyze_tweets.py --format lines --workers 4
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from itertools import tee
+
+from parallel_analysis import iter_analyze_parallel, DEFAULT_CHUNK_SIZE
+
+TEXT_FIELDS = ("text", "full_text", "content")
+ID_FIELDS = ("id", "id_str", "tweet_id")
+
+
+def open_input(path):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def parse_records(lines, input_format="auto", field=None):
+    """Yield (line_no, tweet_id, text, error) for every non-empty input line"""
+    fields = (field,) if field else TEXT_FIELDS
+    for line_no, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        as_json = input_format == "ndjson" or (input_format == "auto" and line.lstrip()[:1] in ("{", '"'))
+        if not as_json:
+            yield line_no, None, line.strip(), None
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, str):
+            yield line_no, None, record.strip(), None
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, None, "Record must be a JSON object or string"
+            continue
+        tweet_id = next((record[k] for k in ID_FIELDS if k in record), None)
+        text = next((record[k] for k in fields if isinstance(record.get(k), str)), None)
+        if text is None or not text.strip():
+            yield line_no, tweet_id, None, "Content required"
+        else:
+            yield line_no, tweet_id, text.strip(), None
+
+
+def analyze_records(records, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, scores_only=False):
+    """Yield one output dict per parsed record, in input order"""
+    # Error records go through the chunker too (as None), so the lookahead of
+    # for_texts is bounded by the chunks in flight, whatever the error ratio
+    for_texts, for_output = tee(records)
+    texts = (text for _, _, text, _ in for_texts)
+    analyses = iter_analyze_parallel(texts, workers=workers, chunk_size=chunk_size, scores_only=scores_only)
+    for (line_no, tweet_id, text, error), analysis in zip(for_output, analyses):
+        out = {"line": line_no}
+        if tweet_id is not None:
+            out["id"] = tweet_id
+        if error is not None:
+            out["error"] = error
+        elif scores_only:
+            out["scores"] = analysis
+        else:
+            out["analysis"] = analysis
+        yield out
+
+
+class Progress:
+    """Periodic tweets/s report on stderr"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.count = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    def update(self, record):
+        self.count += 1
+        if "error" in record:
+            self.errors += 1
+        if self.interval and self.count % 256 == 0:
+            now = time.monotonic()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                self.report("⏳")
+
+    def report(self, prefix):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"{prefix} {self.count:,} tweets ({self.errors:,} errors) in {elapsed:.1f}s - {self.count / elapsed:,.0f} tweets/s",
+              file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream tweets through the YAPS content analyzer (NDJSON out)")
+    parser.add_argument("input", nargs="?", default="-", help="input file, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--format", choices=("auto", "ndjson", "lines"), default="auto", help="input format (default: auto per line)")
+    parser.add_argument("--field", help=f"JSON field holding the tweet text (default: first of {', '.join(TEXT_FIELDS)})")
+    parser.add_argument("--scores-only", action="store_true", help="emit numeric scores only")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, 0 = all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"tweets per worker chunk (default {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="seconds between progress reports, 0 to disable")
+    args = parser.parse_args(argv)
+
+    source = open_input(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    progress = Progress(args.progress_interval)
+    try:
+        records = parse_records(source, args.format, args.field)
+        for out in analyze_records(records, args.workers or None, args.chunk_size, args.scores_only):
+            sink.write(json.dumps(out, ensure_ascii=False))
+            sink.write("\n")
+            progress.update(out)
+    finally:
+        if args.output != "-":
+            sink.close()
+        if args.input != "-":
+            source.close()
+    progress.report("✅")
+
+
+if __name__ == "__main__":
+    main()
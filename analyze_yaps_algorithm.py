@@ -1,103 +1,117 @@
 #!/usr/bin/env python3
 """
 Analyze YAPS algorithm from Schema #517 attestations
+
+The analysis runs on NumPy arrays: ratios are grouped with np.unique
+instead of list scans, and candidate scaling factors are tested against
+every value in one broadcast, so a full schema works as well as the
+sample. By default the 20 newest attestations are fetched from EAS;
+--local reads every row from the attestation_store.py mirror, --snapshot
+the memory-mapped snapshot from attestation_snapshot.py.
+
+Requires numpy (pip install .[analysis]).
 """
 
-import requests
-import json
-import statistics
+import argparse
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
+import numpy as np
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {"query": query, "variables": variables or {}}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
+from eas_client import client, fetch_recent_attestations
+from schema_decoder import decoder_for
+from attestation_table import AttestationTable
+from attestation_store import AttestationStore, DB_PATH
 
-def analyze_yaps_attestations():
-    """Analyze YAPS attestations to reverse engineer algorithm"""
+SCHEMA = "uint64 twitterUserId, uint64 yapScaledPoints, uint64 yap24HScaledPoints, uint64 timestamp"
+SCHEMA_UID = "0x30c23ae07a72d6c4cafbe3c7a24f6b85427b9dacde030366376c8f87d794a802"
+
+# Fixed-point scales a points column might be stored with
+SCALE_CANDIDATES = np.unique(np.concatenate([10 ** np.arange(1, 19, dtype=np.uint64),
+                                             2 ** np.arange(1, 21, dtype=np.uint64)]))
+
+
+def fetch_columns(source="eas", db_path=DB_PATH):
+    """(twitter ids, yapScaledPoints, yap24HScaledPoints) arrays from EAS, the local mirror or a snapshot"""
+    if source == "snapshot":
+        from attestation_snapshot import open_snapshot
+        snapshot = open_snapshot(SCHEMA_UID)
+        if snapshot is None:
+            print(f"❌ No snapshot (run: python attestation_snapshot.py build {SCHEMA_UID})")
+            return None
+        return snapshot.column("twitterUserId"), snapshot.column("yapScaledPoints"), snapshot.column("yap24HScaledPoints")
+    
+    if source == "local":
+        with AttestationStore(db_path) as store:
+            rows = store.db.execute(
+                "SELECT twitter_user_id, yap_scaled_points, yap_24h_scaled_points FROM attestations "
+                "WHERE schema_id = ? AND twitter_user_id IS NOT NULL ORDER BY time_created DESC, id DESC", (SCHEMA_UID,)).fetchall()
+        return (np.array([int(row[0]) for row in rows], dtype=np.uint64),
+                np.array([row[1] or 0 for row in rows], dtype=np.uint64),
+                np.array([row[2] or 0 for row in rows], dtype=np.uint64))
+    
+    # Query more attestations for better analysis; records are ABI-decoded from `data`
+    decoder = decoder_for(SCHEMA)
+    attestations = fetch_recent_attestations([SCHEMA_UID], take=50, fields=("id", "attester", "data", "timeCreated"),
+                                             decoder=decoder)[SCHEMA_UID]
+    
+    if attestations is None:
+        print("Error querying attestations")
+        return None
     
-    schema_uid = "0x30c23ae07a72d6c4cafbe3c7a24f6b85427b9dacde030366376c8f87d794a802"
+    print(f"📊 Analyzing {len(attestations)} attestations...\n")
+    
+    # Parse attestation data into typed columns
+    parsed_data = AttestationTable(decoder)
+    parsed_data.extend(attestations[:20])  # Analyze first 20 for detailed view
+    return parsed_data.numpy("twitterUserId"), parsed_data.numpy("yapScaledPoints"), parsed_data.numpy("yap24HScaledPoints")
+
+
+def most_common(keys, limit=None):
+    """[(key, count)] by count descending, ties in order of first appearance"""
+    values, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    order = np.lexsort((first, -counts))[:limit]
+    return list(zip(values[order].tolist(), counts[order].tolist()))
+
+
+def common_scale_factors(values, candidates=SCALE_CANDIDATES, min_share=0.95):
+    """[(factor, share of values divisible by it)] for candidates that divide at least ``min_share`` of the values"""
+    if not len(values):
+        return []
+    divisible = np.zeros(len(candidates), dtype=np.int64)
+    # Row blocks keep the (rows x candidates) matrix small on a full schema
+    for start in range(0, len(values), 65536):
+        block = np.asarray(values[start:start + 65536], dtype=np.uint64)
+        divisible += ((block[:, None] % candidates[None, :]) == 0).sum(axis=0)
+    shares = divisible / len(values)
+    keep = shares >= min_share
+    return list(zip(candidates[keep].tolist(), shares[keep].tolist()))
+
+
+def analyze_yaps_attestations(source="eas", db_path=DB_PATH):
+    """Analyze YAPS attestations to reverse engineer algorithm"""
     
     print("🎯 ANALYZING YAPS ALGORITHM FROM SCHEMA #517")
-    print("Schema structure: uint64 twitterUserId, uint64 yapScaledPoints, uint64 yap24HScaledPoints, uint64 timestamp")
+    print(f"Schema structure: {SCHEMA}")
     print("="*80)
     
-    # Query more attestations for better analysis
-    query = """
-    query GetYAPSAttestations($schemaId: String!) {
-      attestations(
-        where: { schemaId: { equals: $schemaId } },
-        take: 50,
-        orderBy: [{ timeCreated: desc }]
-      ) {
-        id
-        attester
-        data
-        decodedDataJson
-        timeCreated
-      }
-    }
-    """
-    
-    variables = {"schemaId": schema_uid}
-    result = query_graphql(query, variables)
-    
-    if 'data' not in result or 'attestations' not in result['data']:
-        print(f"Error querying attestations: {result}")
+    columns = fetch_columns(source, db_path)
+    if columns is None:
         return
+    twitter_ids, yap_scaled, yap_24h = columns
     
-    attestations = result['data']['attestations']
-    print(f"📊 Analyzing {len(attestations)} attestations...\n")
-    
-    # Parse attestation data
-    parsed_data = []
-    
-    for att in attestations[:20]:  # Analyze first 20 for detailed view
-        if att['decodedDataJson']:
-            try:
-                decoded = json.loads(att['decodedDataJson'])
-                
-                data_point = {
-                    'timestamp': att['timeCreated'],
-                    'twitter_id': None,
-                    'yap_scaled': None,
-                    'yap_24h': None
-                }
-                
-                for field in decoded:
-                    name = field['name']
-                    value = field['value']['value'] if 'value' in field['value'] else field['value']
-                    
-                    if 'twitterUserId' in name:
-                        data_point['twitter_id'] = str(value)
-                    elif 'yapScaledPoints' in name and '24H' not in name:
-                        data_point['yap_scaled'] = int(value) if str(value).isdigit() else 0
-                    elif 'yap24HScaledPoints' in name:
-                        data_point['yap_24h'] = int(value) if str(value).isdigit() else 0
-                
-                if data_point['yap_scaled'] is not None and data_point['yap_24h'] is not None:
-                    parsed_data.append(data_point)
-                    
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                continue
-    
-    if not parsed_data:
+    if not len(yap_scaled):
         print("❌ No valid data found for analysis")
         return
     
-    print(f"✅ Successfully parsed {len(parsed_data)} data points\n")
+    print(f"✅ Successfully parsed {len(yap_scaled):,} data points\n")
     
     # Display sample data
     print("📋 SAMPLE ATTESTATION DATA:")
     print("-" * 80)
-    for i, data in enumerate(parsed_data[:10]):
-        ratio = data['yap_scaled'] / data['yap_24h'] if data['yap_24h'] > 0 else 0
-        print(f"{i+1:2d}. Twitter ID: {data['twitter_id'][:12]}...")
-        print(f"    Total Scaled:  {data['yap_scaled']:>12,}")
-        print(f"    24H Scaled:    {data['yap_24h']:>12,}")
+    for i, (twitter_id, scaled, h24) in enumerate(zip(twitter_ids[:10].tolist(), yap_scaled[:10].tolist(), yap_24h[:10].tolist())):
+        ratio = scaled / h24 if h24 > 0 else 0
+        print(f"{i+1:2d}. Twitter ID: {str(twitter_id)[:12]}...")
+        print(f"    Total Scaled:  {scaled:>12,}")
+        print(f"    24H Scaled:    {h24:>12,}")
         print(f"    Ratio:         {ratio:>12.2f}")
         print()
     
@@ -105,88 +119,79 @@ def analyze_yaps_attestations():
     print("\n🔍 ALGORITHM PATTERN ANALYSIS:")
     print("=" * 80)
     
-    total_scaled_points = [d['yap_scaled'] for d in parsed_data if d['yap_scaled'] > 0]
-    yap_24h_points = [d['yap_24h'] for d in parsed_data if d['yap_24h'] > 0]
-    ratios = [d['yap_scaled'] / d['yap_24h'] for d in parsed_data if d['yap_24h'] > 0]
+    total_scaled_points = yap_scaled[yap_scaled > 0]
+    yap_24h_points = yap_24h[yap_24h > 0]
+    has_24h = yap_24h > 0
+    ratios = yap_scaled[has_24h] / yap_24h[has_24h]
     
-    if total_scaled_points:
+    if len(total_scaled_points):
         print(f"📈 TOTAL SCALED POINTS ANALYSIS:")
-        print(f"   Range: {min(total_scaled_points):,} to {max(total_scaled_points):,}")
-        print(f"   Average: {statistics.mean(total_scaled_points):,.0f}")
-        print(f"   Median: {statistics.median(total_scaled_points):,.0f}")
+        print(f"   Range: {int(total_scaled_points.min()):,} to {int(total_scaled_points.max()):,}")
+        print(f"   Average: {total_scaled_points.mean():,.0f}")
+        print(f"   Median: {np.median(total_scaled_points):,.0f}")
         
-    if yap_24h_points:
+    if len(yap_24h_points):
         print(f"\n⏰ 24H SCALED POINTS ANALYSIS:")
-        print(f"   Range: {min(yap_24h_points):,} to {max(yap_24h_points):,}")
-        print(f"   Average: {statistics.mean(yap_24h_points):,.0f}")
-        print(f"   Median: {statistics.median(yap_24h_points):,.0f}")
+        print(f"   Range: {int(yap_24h_points.min()):,} to {int(yap_24h_points.max()):,}")
+        print(f"   Average: {yap_24h_points.mean():,.0f}")
+        print(f"   Median: {np.median(yap_24h_points):,.0f}")
     
-    if ratios:
+    if len(ratios):
         print(f"\n🧮 RATIO ANALYSIS (Total/24H):")
-        print(f"   Range: {min(ratios):.1f} to {max(ratios):.1f}")
-        print(f"   Average: {statistics.mean(ratios):.2f}")
-        print(f"   Median: {statistics.median(ratios):.2f}")
+        print(f"   Range: {ratios.min():.1f} to {ratios.max():.1f}")
+        print(f"   Average: {ratios.mean():.2f}")
+        print(f"   Median: {np.median(ratios):.2f}")
         
-        # Look for patterns
-        common_ratios = []
-        for ratio in ratios:
-            rounded = round(ratio, 1)
-            if rounded not in [r[0] for r in common_ratios]:
-                common_ratios.append((rounded, 1))
-            else:
-                for i, (r, count) in enumerate(common_ratios):
-                    if r == rounded:
-                        common_ratios[i] = (r, count + 1)
-                        break
-        
-        common_ratios.sort(key=lambda x: x[1], reverse=True)
-        print(f"   Most common ratios: {common_ratios[:5]}")
+        # Look for patterns: histogram of ratios rounded to one decimal. np.rint(ratios * 10)
+        # rounds halfway cases differently from round(), so round each distinct ratio once
+        distinct, inverse = np.unique(ratios, return_inverse=True)
+        rounded = np.array([round(ratio, 1) for ratio in distinct.tolist()])[inverse.reshape(-1)]
+        common_ratios = most_common(rounded, 5)
+        print(f"   Most common ratios: {common_ratios}")
     
     # Detect algorithm patterns
     print(f"\n🎯 ALGORITHM INSIGHTS:")
     print("=" * 80)
     
     # Pattern 1: Time-based accumulation
-    if ratios and statistics.mean(ratios) > 7:
-        avg_ratio = statistics.mean(ratios)
+    if len(ratios) and ratios.mean() > 7:
+        avg_ratio = ratios.mean()
         estimated_days = avg_ratio / 24 if avg_ratio > 24 else avg_ratio
         print(f"📅 Time Pattern Detected:")
         print(f"   Average ratio suggests {estimated_days:.1f} days of accumulation")
         print(f"   Indicates rolling/cumulative scoring system")
     
     # Pattern 2: Scaling factors
-    if total_scaled_points and yap_24h_points:
-        # Look for common scaling factors
-        scaling_factors = []
-        for data in parsed_data:
-            if data['yap_24h'] > 0 and data['yap_scaled'] > 0:
-                # Check if there's a consistent multiplier
-                factor = data['yap_scaled'] / data['yap_24h']
-                scaling_factors.append(factor)
+    if len(total_scaled_points) and len(yap_24h_points):
+        # Check if there's a consistent multiplier
+        both = has_24h & (yap_scaled > 0)
+        scaling_factors = yap_scaled[both] / yap_24h[both]
         
-        if scaling_factors:
-            # Find most common scaling range
-            factor_ranges = {}
-            for factor in scaling_factors:
-                range_key = int(factor / 10) * 10  # Group by tens
-                factor_ranges[range_key] = factor_ranges.get(range_key, 0) + 1
-            
-            most_common_range = max(factor_ranges.items(), key=lambda x: x[1])
+        if len(scaling_factors):
+            # Find most common scaling range, grouped by tens
+            range_key, occurrence = most_common((scaling_factors // 10).astype(np.int64) * 10, 1)[0]
             print(f"📊 Scaling Factor Pattern:")
-            print(f"   Most common range: {most_common_range[0]}-{most_common_range[0]+10}")
-            print(f"   Occurrence: {most_common_range[1]}/{len(scaling_factors)} samples")
+            print(f"   Most common range: {range_key}-{range_key+10}")
+            print(f"   Occurrence: {occurrence}/{len(scaling_factors)} samples")
+        
+        # Fixed-point scale: the largest candidate dividing (nearly) every value
+        for name, points in (("Total scaled", total_scaled_points), ("24H scaled", yap_24h_points)):
+            factors = common_scale_factors(points)
+            if factors:
+                factor, share = max(factors)
+                print(f"   {name} points divisible by {factor:,} in {share:.0%} of samples")
     
     # Pattern 3: Point distribution
-    if total_scaled_points:
-        # Check for tier-based distribution
-        sorted_points = sorted(total_scaled_points)
-        percentiles = [10, 25, 50, 75, 90, 95, 99]
+    if len(total_scaled_points):
+        # Check for tier-based distribution; partition places just the needed ranks, no full sort
+        percentiles = np.array([10, 25, 50, 75, 90, 95, 99])
+        indexes = (percentiles / 100 * len(total_scaled_points)).astype(np.int64)
+        partitioned = np.partition(total_scaled_points, indexes[indexes < len(total_scaled_points)])
         
         print(f"\n📊 POINT DISTRIBUTION (Possible Tiers):")
-        for p in percentiles:
-            idx = int((p / 100) * len(sorted_points))
-            if idx < len(sorted_points):
-                print(f"   {p:2d}th percentile: {sorted_points[idx]:>12,}")
+        for p, idx in zip(percentiles.tolist(), indexes.tolist()):
+            if idx < len(partitioned):
+                print(f"   {p:2d}th percentile: {int(partitioned[idx]):>12,}")
     
     print(f"\n🔬 REVERSE ENGINEERED ALGORITHM HYPOTHESIS:")
     print("=" * 80)
@@ -198,4 +203,11 @@ def analyze_yaps_attestations():
     print("5. Point ranges suggest tier-based multiplier system")
 
 if __name__ == "__main__":
-    analyze_yaps_attestations()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analyze the YAPS algorithm from Schema #517 attestations")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--local", action="store_const", dest="source", const="local", help="every row from the local attestation mirror")
+    source.add_argument("--snapshot", action="store_const", dest="source", const="snapshot", help="every row from the schema's snapshot")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    args = parser.parse_args()
+    analyze_yaps_attestations(args.source or "eas", args.db)
+    client.print_stats()
@@ -8,8 +8,14 @@ from flask import Flask, render_template, request, jsonify
 import os
 from openai import OpenAI
 
+from singleflight import SingleFlight
+from content_analysis import scoring_profile
+
 app = Flask(__name__)
 
+# Identical /generate requests that arrive together share one OpenAI call
+openai_calls = SingleFlight()
+
 PROJECTS = [
     {"name": "LIMITLESS", "mindshare": "7.00%", "category": "AI Agents"},
     {"name": "POLYMARKET", "mindshare": "6.41%", "category": "Prediction Markets"},
@@ -155,7 +161,9 @@ Buat 1 tweet berkualitas tinggi yang:
 
 Generate HANYA konten tweet-nya. Jangan include penjelasan atau metadata."""
 
-        response = client.chat.completions.create(
+        response = openai_calls.do(
+            ("generate", project_name, prompt_type),
+            client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": prompt_template['system']},
@@ -185,69 +193,7 @@ Generate HANYA konten tweet-nya. Jangan include penjelasan atau metadata."""
 
 def analyze_yaps_score(content):
     """Simple scoring analysis"""
-    score = {
-        'crypto_relevance': 0,
-        'engagement_potential': 0,
-        'semantic_quality': 0,
-        'total': 0,
-        'feedback': []
-    }
-    
-    if len(content) >= 50:
-        score['crypto_relevance'] += 3
-        score['feedback'].append('✅ Length optimal (50+ chars)')
-    
-    crypto_keywords = ['DeFi', 'L2', 'TVL', 'funding', 'protocol', 'AI', 'crypto', 'blockchain']
-    if any(kw.lower() in content.lower() for kw in crypto_keywords):
-        score['crypto_relevance'] += 4
-        score['feedback'].append('✅ Crypto-relevant topics')
-    
-    if any(char.isdigit() for char in content):
-        score['crypto_relevance'] += 3
-        score['feedback'].append('✅ Contains data/metrics')
-    else:
-        score['feedback'].append('⚠️ Tidak ada data numerik')
-    
-    tags_count = content.count('@')
-    if tags_count <= 2:
-        score['engagement_potential'] += 5
-        score['feedback'].append(f'✅ Tags optimal ({tags_count} tags)')
-    else:
-        score['engagement_potential'] += 2
-        score['feedback'].append(f'⚠️ Terlalu banyak tags ({tags_count})')
-    
-    if '?' in content:
-        score['engagement_potential'] += 3
-        score['feedback'].append('✅ Ada question untuk engagement')
-    
-    if len(content) <= 280:
-        score['engagement_potential'] += 2
-        score['feedback'].append('✅ Twitter-friendly length')
-    
-    if any(word in content.lower() for word in ['kenapa', 'bagaimana', 'mengapa', 'analisis', 'thesis']):
-        score['semantic_quality'] += 3
-        score['feedback'].append('✅ Analytical tone')
-    
-    if not any(spam in content.lower() for spam in ['gm', 'gn', 'lfg', 'wagmi']):
-        score['semantic_quality'] += 4
-        score['feedback'].append('✅ Tidak ada spam phrases')
-    
-    if len(content.split()) > 15:
-        score['semantic_quality'] += 3
-        score['feedback'].append('✅ Depth content (15+ words)')
-    
-    score['total'] = score['crypto_relevance'] + score['engagement_potential'] + score['semantic_quality']
-    
-    if score['total'] >= 18:
-        score['rating'] = 'EXCELLENT (High YAPS potential)'
-    elif score['total'] >= 14:
-        score['rating'] = 'GOOD (Medium-High YAPS)'
-    elif score['total'] >= 10:
-        score['rating'] = 'FAIR (Medium YAPS)'
-    else:
-        score['rating'] = 'NEEDS IMPROVEMENT'
-    
-    return score
+    return scoring_profile('yaps_simple').evaluate(content)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped columnar snapshots of a schema's attestations
+
+A snapshot is a directory with one fixed-width .npy file per column
+(timeCreated, revoked and every uint/int/bool schema field), string
+columns (attester, usernames, addresses...) as uint32 codes plus a small
+JSON string table, and meta.json describing the schema. Snapshot() opens
+the columns with numpy.load(mmap_mode='r'): nothing is parsed or copied
+up front, pages are read by the OS as the analysis touches them.
+
+    python attestation_snapshot.py build 0xcb66...             # from EAS
+    python attestation_snapshot.py build 0xcb66... --local     # from attestation_store.py
+    python attestation_snapshot.py info 0xcb66...
+
+Requires numpy (pip install .[analysis]).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from array import array
+
+import numpy as np
+
+from eas_client import client, query_graphql, iter_attestation_pages, EASError, DEFAULT_PAGE_SIZE
+from attestation_store import AttestationStore, DB_PATH
+from attestation_table import AttestationTable, StringColumn
+from schema_decoder import decoder_for
+
+SNAPSHOT_DIR = os.getenv('YAPS_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+SNAPSHOT_FIELDS = ("id", "attester", "data", "decodedDataJson", "timeCreated", "revoked")
+FORMAT_VERSION = 1
+
+_DTYPES = {'Q': np.uint64, 'q': np.int64, 'B': np.uint8}
+
+
+def snapshot_path(schema_id):
+    """Default snapshot directory of a schema"""
+    return os.path.join(SNAPSHOT_DIR, schema_id)
+
+
+def fetch_schema_string(schema_id):
+    """Schema definition string (e.g. "uint64 twitterUserId, ...") from EAS"""
+    query = """
+    query SchemaString($schemaId: String!) {
+      schema(where: { id: $schemaId }) {
+        schema
+      }
+    }
+    """
+    result = query_graphql(query, {"schemaId": schema_id})
+    schema = (result.get('data') or {}).get('schema')
+    if not schema:
+        raise EASError(f"SchemaString: schema {schema_id} not found ({result.get('errors', result)})")
+    return schema['schema']
+
+
+def write_snapshot(path, table, schema_id=None):
+    """Write an AttestationTable as a snapshot directory, replacing any previous one"""
+    tmp = f"{path}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    columns = {}
+    for name, column in table.columns.items():
+        if isinstance(column, array):
+            np.save(os.path.join(tmp, f"{name}.npy"), np.frombuffer(column, dtype=_DTYPES[column.typecode]) if len(column)
+                    else np.empty(0, dtype=_DTYPES[column.typecode]))
+            columns[name] = {"kind": "numeric", "dtype": np.dtype(_DTYPES[column.typecode]).str}
+            continue
+        if not isinstance(column, StringColumn):
+            # uint256 and arrays do not fit a fixed width; keep them as text
+            text = StringColumn()
+            for value in column:
+                text.append(None if value is None else json.dumps(value) if isinstance(value, list) else str(value))
+            column = text
+        np.save(os.path.join(tmp, f"{name}.codes.npy"), np.frombuffer(column.codes, dtype=np.uint32) if len(column)
+                else np.empty(0, dtype=np.uint32))
+        with open(os.path.join(tmp, f"{name}.strings.json"), "w", encoding="utf-8") as f:
+            json.dump(column.values, f, ensure_ascii=False)
+        columns[name] = {"kind": "string", "count": len(column.values) - 1}
+    with open(os.path.join(tmp, "ids.bin"), "wb") as f:
+        f.write(table._ids)
+    meta = {
+        "version": FORMAT_VERSION,
+        "schema_id": schema_id,
+        "schema": table.decoder.schema,
+        "fields": list(table.decoder.Record._fields),
+        "types": list(table.decoder.types),
+        "rows": len(table),
+        "columns": columns,
+        "created_at": time.time(),
+    }
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return meta
+
+
+def build_snapshot(schema_id, path=None, schema=None, page_size=DEFAULT_PAGE_SIZE, store=None, progress=None):
+    """Download (or read from a local AttestationStore) every attestation of a schema into a snapshot"""
+    decoder = decoder_for(schema or fetch_schema_string(schema_id))
+    table = AttestationTable(decoder)
+    if store is not None:
+        rows = store.db.execute(
+            "SELECT id, attester, data, decoded_json, time_created, revoked FROM attestations "
+            "WHERE schema_id = ? ORDER BY time_created DESC, id DESC", (schema_id,))
+        table.extend({"id": row["id"], "attester": row["attester"], "data": row["data"], "decodedDataJson": row["decoded_json"],
+                      "timeCreated": row["time_created"], "revoked": row["revoked"]} for row in rows)
+    else:
+        for page in iter_attestation_pages(schema_id, page_size, fields=SNAPSHOT_FIELDS, decoder=decoder):
+            table.extend(page)
+            if progress:
+                progress(len(table))
+    return write_snapshot(path or snapshot_path(schema_id), table, schema_id)
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot directory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.meta.get('version')} in {path}")
+        self.schema = self.meta["schema"]
+        self.fields = self.meta["fields"]
+        self.types = dict(zip(self.fields, self.meta["types"]))
+        self._columns = {}
+        self._strings = {}
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    @property
+    def columns(self):
+        return self.meta["columns"]
+
+    def is_numeric(self, name):
+        return self.columns[name]["kind"] == "numeric"
+
+    def column(self, name):
+        """Memory-mapped array: the values of a numeric column, the codes of a string column"""
+        mapped = self._columns.get(name)
+        if mapped is None:
+            info = self.columns[name]
+            filename = f"{name}.npy" if info["kind"] == "numeric" else f"{name}.codes.npy"
+            # np.load cannot mmap a zero-length array
+            mapped = np.load(os.path.join(self.path, filename), mmap_mode='r' if self.meta["rows"] else None)
+            self._columns[name] = mapped
+        return mapped
+
+    def strings(self, name):
+        """String table of a string column; codes index into it, 0 is None"""
+        values = self._strings.get(name)
+        if values is None:
+            with open(os.path.join(self.path, f"{name}.strings.json"), encoding="utf-8") as f:
+                values = self._strings[name] = json.load(f)
+        return values
+
+    def values(self, name):
+        """Column as Python values (strings decoded); copies, for small slices or string columns"""
+        if self.is_numeric(name):
+            return self.column(name).tolist()
+        table = self.strings(name)
+        return [table[code] for code in self.column(name).tolist()]
+
+    def ids(self):
+        """Attestation ids, in row order"""
+        with open(os.path.join(self.path, "ids.bin"), "rb") as f:
+            raw = f.read()
+        return ["0x" + raw[i:i + 32].hex() for i in range(0, len(raw), 32)]
+
+
+def open_snapshot(schema_id, path=None):
+    """Snapshot of a schema if one has been built, else None"""
+    path = path or snapshot_path(schema_id)
+    return Snapshot(path) if os.path.exists(os.path.join(path, "meta.json")) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory-mapped columnar snapshots of attestations")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="download a schema's attestations into a snapshot")
+    build_cmd.add_argument("schema_id")
+    build_cmd.add_argument("-o", "--output", help=f"snapshot directory (default {SNAPSHOT_DIR}/<schema_id>)")
+    build_cmd.add_argument("--schema", help="schema string (default: looked up on EAS)")
+    build_cmd.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    build_cmd.add_argument("--local", action="store_true", help="read from the local attestation mirror instead of EAS")
+    build_cmd.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    info_cmd = commands.add_parser("info", help="describe a snapshot")
+    info_cmd.add_argument("schema_id")
+    info_cmd.add_argument("-p", "--path", help="snapshot directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.monotonic()
+        store = AttestationStore(args.db) if args.local else None
+        try:
+            meta = build_snapshot(args.schema_id, args.output, args.schema, args.page_size, store,
+                                  progress=lambda n: print(f"   ⏳ {n:,} attestations", file=sys.stderr))
+        except EASError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            if store is not None:
+                store.close()
+        print(f"✅ {meta['rows']:,} attestations -> {args.output or snapshot_path(args.schema_id)} "
+              f"in {time.monotonic() - started:.1f}s")
+        client.print_stats()
+    else:
+        started = time.perf_counter()
+        snapshot = open_snapshot(args.schema_id, args.path)
+        if snapshot is None:
+            print(f"❌ No snapshot for {args.schema_id} (run: python attestation_snapshot.py build {args.schema_id})")
+            sys.exit(1)
+        print(f"📦 {snapshot.path}: {len(snapshot):,} rows, opened in {(time.perf_counter() - started) * 1000:.1f}ms")
+        print(f"   Schema: {snapshot.schema}")
+        for name, info in snapshot.columns.items():
+            detail = info["dtype"] if info["kind"] == "numeric" else f"{info['count']:,} distinct strings"
+            print(f"   • {name}: {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of YAPS attestations
+
+Attestations are stored with their decoded YAPS fields in indexed
+columns, so repeat analyses query the local file instead of downloading
+everything from base.easscan.org again. ``sync`` only fetches what is new:
+attestations created at or after the schema's high-water mark, plus
+revocations since the last revocation seen.
+
+``latest_attestations`` is a materialized view of the newest non-revoked
+attestation per (schema, twitterUserId). sync keeps it current in
+O(changed rows): a new attestation replaces the user's entry if it is
+newer, and revoking the current one re-reads that user's rows only.
+Current-state queries (latest(), current_attestations()) never scan
+history.
+
+    python attestation_store.py sync                 # all known YAPS schemas
+    python attestation_store.py sync --schema 0x30c2...
+    python attestation_store.py user 1422186185196113922
+    python attestation_store.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from eas_client import iter_attestations, iter_attestation_pages, decode_fields, DEFAULT_PAGE_SIZE
+from schema_decoder import to_int
+
+DB_PATH = os.getenv('YAPS_DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'yaps_attestations.db'))
+
+YAPS_SCHEMAS = {
+    "0x2d5c948c6fb42412de88dc8fba09abed76f948136f3628b55b8a9560f288e701": "Schema #155",
+    "0x2df5d9cbf7ed0cdc7ce5daa6e7aba03aa4e7f538aa515e5c56de053887938ddf": "Schema #156",
+    "0x30c23ae07a72d6c4cafbe3c7a24f6b85427b9dacde030366376c8f87d794a802": "Schema #517 (Scaled Points)",
+    "0x69a0626ec645ae8c2429f9190782f396ce64e5ce0a82096d09891b9515e67fa7": "Schema #546 (Monthly Points)",
+    "0xcb66276cf243e78fad68dd5e633f7bb56814b49ac9a91256615340591577a0e8": "New YAPS schema",
+}
+
+SYNC_FIELDS = ("id", "schemaId", "attester", "recipient", "data", "decodedDataJson", "timeCreated", "revoked", "revocationTime")
+
+# decodedDataJson field name -> column
+FIELD_COLUMNS = {
+    "twitterUserId": "twitter_user_id",
+    "twitterUsername": "twitter_username",
+    "yapPoints": "yap_points",
+    "yapScaledPoints": "yap_scaled_points",
+    "yap24HScaledPoints": "yap_24h_scaled_points",
+    "timestamp": "timestamp",
+}
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS attestations (
+    id TEXT PRIMARY KEY,
+    schema_id TEXT NOT NULL,
+    attester TEXT,
+    recipient TEXT,
+    time_created INTEGER NOT NULL,
+    revoked INTEGER NOT NULL DEFAULT 0,
+    revocation_time INTEGER NOT NULL DEFAULT 0,
+    twitter_user_id TEXT,
+    twitter_username TEXT,
+    yap_points INTEGER,
+    yap_scaled_points INTEGER,
+    yap_24h_scaled_points INTEGER,
+    timestamp INTEGER,
+    data TEXT,
+    decoded_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_att_schema_time ON attestations (schema_id, time_created);
+CREATE INDEX IF NOT EXISTS idx_att_user ON attestations (twitter_user_id, schema_id, time_created);
+CREATE INDEX IF NOT EXISTS idx_att_username ON attestations (twitter_username COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_att_yap_points ON attestations (schema_id, yap_points);
+CREATE INDEX IF NOT EXISTS idx_att_yap_scaled ON attestations (schema_id, yap_scaled_points);
+CREATE INDEX IF NOT EXISTS idx_att_yap_24h ON attestations (schema_id, yap_24h_scaled_points);
+CREATE INDEX IF NOT EXISTS idx_att_timestamp ON attestations (schema_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_att_revoked ON attestations (schema_id, revoked);
+CREATE TABLE IF NOT EXISTS latest_attestations (
+    schema_id TEXT NOT NULL,
+    twitter_user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    time_created INTEGER NOT NULL,
+    PRIMARY KEY (schema_id, twitter_user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_latest_id ON latest_attestations (id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    schema_id TEXT PRIMARY KEY,
+    high_water INTEGER NOT NULL DEFAULT 0,
+    revocation_high_water INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+);
+"""
+
+INT64_MAX = 2 ** 63 - 1
+# PRAGMA user_version once latest_attestations has been backfilled
+LATEST_VIEW_VERSION = 1
+
+ADVANCE_LATEST_SQL = """
+INSERT INTO latest_attestations (schema_id, twitter_user_id, id, time_created)
+VALUES (:schema_id, :twitter_user_id, :id, :time_created)
+ON CONFLICT (schema_id, twitter_user_id) DO UPDATE SET id = excluded.id, time_created = excluded.time_created
+WHERE (excluded.time_created, excluded.id) > (latest_attestations.time_created, latest_attestations.id)
+"""
+
+RECOMPUTE_LATEST_SQL = """
+INSERT OR REPLACE INTO latest_attestations (schema_id, twitter_user_id, id, time_created)
+SELECT schema_id, twitter_user_id, id, time_created FROM attestations
+WHERE twitter_user_id = ? AND schema_id = ? AND revoked = 0
+ORDER BY time_created DESC, id DESC LIMIT 1
+"""
+
+
+def _column_value(column, value):
+    if column == "twitter_username":
+        return value if isinstance(value, str) else None
+    number = to_int(value)
+    if column == "twitter_user_id":
+        return str(number) if number is not None else None
+    # SQLite integers are signed 64-bit
+    return number if number is not None and number <= INT64_MAX else None
+
+
+def attestation_row(att):
+    """Column values for one attestation as returned by iter_attestations()"""
+    row = {
+        "id": att["id"],
+        "schema_id": att["schemaId"],
+        "attester": att.get("attester"),
+        "recipient": att.get("recipient"),
+        "time_created": int(att["timeCreated"]),
+        "revoked": 1 if att.get("revoked") else 0,
+        "revocation_time": int(att.get("revocationTime") or 0),
+        "data": att.get("data"),
+        "decoded_json": att.get("decodedDataJson"),
+    }
+    for column in FIELD_COLUMNS.values():
+        row[column] = None
+    for name, value in (att.get("fields") or {}).items():
+        column = FIELD_COLUMNS.get(name)
+        if column is not None:
+            row[column] = _column_value(column, value)
+    return row
+
+
+class AttestationStore:
+    """SQLite attestation mirror with incremental sync"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA_SQL)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < LATEST_VIEW_VERSION:
+            self.rebuild_latest()
+            self.db.execute(f"PRAGMA user_version = {LATEST_VIEW_VERSION}")
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def high_water(self, schema_id):
+        row = self.db.execute("SELECT high_water, revocation_high_water FROM sync_state WHERE schema_id = ?", (schema_id,)).fetchone()
+        return (row["high_water"], row["revocation_high_water"]) if row else (0, 0)
+
+    def upsert(self, attestations):
+        rows = [attestation_row(att) for att in attestations]
+        if rows:
+            columns = list(rows[0])
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO attestations ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})",
+                rows,
+            )
+            self._update_latest(rows)
+        return rows
+
+    def _update_latest(self, rows):
+        """Fold upserted rows into latest_attestations"""
+        users = [row for row in rows if row["twitter_user_id"] is not None]
+        self.db.executemany(ADVANCE_LATEST_SQL, [row for row in users if not row["revoked"]])
+        for row in users:
+            if row["revoked"]:
+                self._revoke_latest(row["id"])
+
+    def _revoke_latest(self, attestation_id):
+        """Re-point the user's latest entry if ``attestation_id`` was it; True when it was"""
+        current = self.db.execute("SELECT schema_id, twitter_user_id FROM latest_attestations WHERE id = ?",
+                                  (attestation_id,)).fetchone()
+        if current is None:
+            return False
+        self.db.execute("DELETE FROM latest_attestations WHERE schema_id = ? AND twitter_user_id = ?",
+                        (current["schema_id"], current["twitter_user_id"]))
+        self.db.execute(RECOMPUTE_LATEST_SQL, (current["twitter_user_id"], current["schema_id"]))
+        return True
+
+    def rebuild_latest(self, schema_id=None):
+        """Recompute latest_attestations from the full history (one-off backfill)"""
+        where, params = ("AND schema_id = ?", (schema_id,)) if schema_id else ("", ())
+        self.db.execute(f"DELETE FROM latest_attestations WHERE 1 {where}", params)
+        self.db.execute(f"""
+            INSERT INTO latest_attestations (schema_id, twitter_user_id, id, time_created)
+            SELECT schema_id, twitter_user_id, id, time_created FROM (
+                SELECT schema_id, twitter_user_id, id, time_created,
+                       ROW_NUMBER() OVER (PARTITION BY schema_id, twitter_user_id ORDER BY time_created DESC, id DESC) AS n
+                FROM attestations WHERE revoked = 0 AND twitter_user_id IS NOT NULL {where}
+            ) WHERE n = 1
+        """, params)
+
+    def sync(self, schema_id, page_size=DEFAULT_PAGE_SIZE, progress=None, eas=None):
+        """Fetch attestations newer than the high-water mark and new revocations.
+
+        Pages are read oldest first and committed one by one together with
+        the new high-water mark, so an interrupted sync resumes where it
+        stopped. The mark itself is re-read (``gte``) because more
+        attestations can land in the same second. Returns (fetched, newly revoked).
+        """
+        high_water, revocation_high_water = self.high_water(schema_id)
+        fetched = 0
+        for page in iter_attestation_pages(schema_id, page_size, fields=SYNC_FIELDS, order="asc",
+                                           where={"timeCreated": {"gte": high_water}}, eas=eas):
+            rows = self.upsert(page)
+            high_water = max([high_water] + [row["time_created"] for row in rows])
+            self._save_state(schema_id, high_water, revocation_high_water)
+            self.db.commit()
+            fetched += len(rows)
+            if progress:
+                progress(fetched)
+
+        # Revocations change old rows, which the timeCreated mark never revisits
+        revoked = 0
+        for att in iter_attestations(schema_id, page_size, fields=("revoked", "revocationTime"), order="asc",
+                                     where={"revoked": {"equals": True}, "revocationTime": {"gte": revocation_high_water}},
+                                     eas=eas):
+            revocation_time = int(att.get("revocationTime") or 0)
+            changed = self.db.execute(
+                "UPDATE attestations SET revoked = 1, revocation_time = ? WHERE id = ? AND revoked = 0",
+                (revocation_time, att["id"]),
+            ).rowcount
+            if changed:
+                self._revoke_latest(att["id"])
+            revoked += changed
+            revocation_high_water = max(revocation_high_water, revocation_time)
+        self._save_state(schema_id, high_water, revocation_high_water)
+        self.db.commit()
+        return fetched, revoked
+
+    def _save_state(self, schema_id, high_water, revocation_high_water):
+        self.db.execute(
+            "INSERT OR REPLACE INTO sync_state (schema_id, high_water, revocation_high_water, synced_at) VALUES (?, ?, ?, ?)",
+            (schema_id, high_water, revocation_high_water, time.time()),
+        )
+
+    def user_attestations(self, twitter_user_id, schema_id=None, include_revoked=True):
+        """Attestations of one Twitter user, newest first"""
+        sql = "SELECT * FROM attestations WHERE twitter_user_id = ?"
+        params = [str(twitter_user_id)]
+        if schema_id is not None:
+            sql += " AND schema_id = ?"
+            params.append(schema_id)
+        if not include_revoked:
+            sql += " AND revoked = 0"
+        sql += " ORDER BY time_created DESC, id DESC"
+        return self.db.execute(sql, params).fetchall()
+
+    def latest(self, twitter_user_id, schema_id=None):
+        """Newest non-revoked attestation of a user, one row per schema"""
+        sql = ("SELECT a.* FROM latest_attestations l JOIN attestations a ON a.id = l.id "
+               "WHERE l.twitter_user_id = ?")
+        params = [str(twitter_user_id)]
+        if schema_id is not None:
+            sql += " AND l.schema_id = ?"
+            params.append(schema_id)
+        return self.db.execute(sql, params).fetchall()
+
+    def latest_by_username(self, username, schema_id=None):
+        """Newest non-revoked attestations whose latest record carries this username (case-insensitive)"""
+        sql = ("SELECT a.* FROM latest_attestations l JOIN attestations a ON a.id = l.id "
+               "WHERE a.twitter_username = ? COLLATE NOCASE")
+        params = [username.lstrip("@")]
+        if schema_id is not None:
+            sql += " AND l.schema_id = ?"
+            params.append(schema_id)
+        return self.db.execute(sql + " ORDER BY a.time_created DESC, a.id DESC", params).fetchall()
+
+    def current_attestations(self, schema_id):
+        """Cursor over the newest non-revoked attestation of every user in a schema"""
+        return self.db.execute("SELECT a.* FROM latest_attestations l JOIN attestations a ON a.id = l.id "
+                               "WHERE l.schema_id = ?", (schema_id,))
+
+    def username_attestations(self, username, schema_id=None):
+        """Attestations by Twitter username (case-insensitive, leading @ ignored), newest first"""
+        sql = "SELECT * FROM attestations WHERE twitter_username = ? COLLATE NOCASE"
+        params = [username.lstrip("@")]
+        if schema_id is not None:
+            sql += " AND schema_id = ?"
+            params.append(schema_id)
+        sql += " ORDER BY time_created DESC, id DESC"
+        return self.db.execute(sql, params).fetchall()
+
+    def stats(self):
+        rows = self.db.execute("""
+            SELECT a.schema_id, COUNT(*) AS attestations, SUM(a.revoked) AS revoked,
+                   COUNT(DISTINCT a.twitter_user_id) AS users, s.high_water, s.synced_at,
+                   (SELECT COUNT(*) FROM latest_attestations l WHERE l.schema_id = a.schema_id) AS current_users
+            FROM attestations a LEFT JOIN sync_state s ON s.schema_id = a.schema_id
+            GROUP BY a.schema_id
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+
+def decoded_fields(row):
+    """name -> value of a stored row's decodedDataJson, like iter_attestations()' ``fields``"""
+    return decode_fields(json.loads(row["decoded_json"])) if row["decoded_json"] else {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local SQLite mirror of YAPS attestations")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync_cmd = commands.add_parser("sync", help="fetch new attestations and revocations")
+    sync_cmd.add_argument("--schema", action="append", help="schema UID (repeatable, default: all known YAPS schemas)")
+    sync_cmd.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    user_cmd = commands.add_parser("user", help="show stored attestations of a Twitter user id or @username")
+    user_cmd.add_argument("user")
+    commands.add_parser("stats", help="rows per schema and sync state")
+    args = parser.parse_args(argv)
+
+    with AttestationStore(args.db) as store:
+        if args.command == "sync":
+            for schema_id in args.schema or YAPS_SCHEMAS:
+                started = time.monotonic()
+                print(f"🔄 {YAPS_SCHEMAS.get(schema_id, schema_id)}")
+                new, revoked = store.sync(schema_id, args.page_size,
+                                          progress=lambda n: print(f"   ⏳ {n:,} attestations", file=sys.stderr))
+                print(f"   ✅ {new:,} fetched, {revoked:,} newly revoked in {time.monotonic() - started:.1f}s")
+        elif args.command == "user":
+            started = time.perf_counter()
+            if args.user.isdigit():
+                rows, current = store.user_attestations(args.user), store.latest(args.user)
+            else:
+                rows, current = store.username_attestations(args.user), store.latest_by_username(args.user)
+            current = {row["id"] for row in current}
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"🔍 {len(rows)} attestation(s) for {args.user} ({elapsed:.1f}ms), ⭐ = current")
+            for row in rows:
+                status = " (revoked)" if row["revoked"] else " ⭐" if row["id"] in current else ""
+                print(f"   • {YAPS_SCHEMAS.get(row['schema_id'], row['schema_id'][:10])} @ {row['time_created']}{status}: "
+                      f"{json.dumps(decoded_fields(row))}")
+        else:
+            for row in store.stats():
+                print(f"📊 {YAPS_SCHEMAS.get(row['schema_id'], row['schema_id'])}: {row['attestations']:,} attestations, "
+                      f"{row['users']:,} users ({row['current_users']:,} with a current attestation), "
+                      f"{row['revoked'] or 0:,} revoked, high-water {row['high_water']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Benchmark analyze_content_full: the per-list scorer it replaced vs the generated kaito_full evaluator
+"""
+
+import random
+import sys
+import timeit
+
+sys.path.insert(0, "api")
+sys.path.insert(0, "tests")
+
+from content_analysis import analyze_content_full, scoring_profile
+from index import generate_template_content
+from legacy_scorers import analyze_content_full as legacy_analyze_content_full
+
+
+def per_tweet_us(fn, tweets, number):
+    seconds = timeit.timeit(lambda: [fn(t) for t in tweets], number=number)
+    return seconds / number / len(tweets) * 1e6
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    projects = ["Monad", "Base", "Sentient", "Polymarket"]
+    prompt_types = ["data-driven", "competitive", "thesis", "custom"]
+    tweets = [generate_template_content(p, t, "why is TVL up?") for p in projects for t in prompt_types for _ in range(25)]
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    evaluate = scoring_profile('kaito_full').evaluate
+
+    assert all(legacy_analyze_content_full(t) == analyze_content_full(t) for t in tweets)
+
+    legacy = per_tweet_us(legacy_analyze_content_full, tweets, number)
+    generated = per_tweet_us(evaluate, tweets, number)
+    full = per_tweet_us(analyze_content_full, tweets, number)
+
+    print(f"📊 {len(tweets)} tweets x {number} rounds")
+    print(f"   Per-list scorer (before):      {legacy:8.2f} µs/tweet")
+    print(f"   CompiledProfile.evaluate:      {generated:8.2f} µs/tweet  ({legacy / generated:.2f}x)")
+    print(f"   analyze_content_full:          {full:8.2f} µs/tweet  ({legacy / full:.2f}x)")
@@ -0,0 +1,125 @@
+"""
+Vectorized bulk scoring for offline tweet corpora (requires numpy)
+
+Texts are reduced to feature arrays in one pass, then every score of a
+scoring profile (kaito_full, the analyze_content_full() rules, by
+default) is computed as array operations over the whole corpus. Signals
+and scores are compiled from the same profile in scoring_rules.json that
+analyze_content_full() evaluates, so editing the rules changes both.
+Arithmetic runs in the same order as the scalar code, and rounded scores
+go through Python's round() once per distinct value, so the results match
+the scalar path exactly.
+"""
+
+import functools
+
+import numpy as np
+
+from content_analysis import scoring_profile
+from rule_engine import BUILTIN_FEATURES, RuleError, condition_source, has_digit
+
+BULK_PROFILE = 'kaito_full'
+
+
+def feature_names(profile):
+    """Per-text inputs of a profile: builtin features, term sets, patterns, occurrences"""
+    return BUILTIN_FEATURES + tuple(profile.terms) + tuple(profile.patterns) + tuple(profile.spec.get("occurrences", {}))
+
+
+def extract_features(texts, profile=None):
+    """Turn an iterable of texts into a dict of feature arrays (one row per text)"""
+    profile = profile or scoring_profile(BULK_PROFILE)
+    vocabulary = profile.vocabulary
+    term_sets = list(profile.terms.values())
+    searches = [pattern.search for pattern in profile.patterns.values()]
+    literals = list(profile.spec.get("occurrences", {}).values())
+    rows = []
+    for content in texts:
+        content_lower = content.lower()
+        found = frozenset(filter(content_lower.__contains__, vocabulary))
+        rows.append((
+            len(content),
+            len(content.split()),
+            has_digit(content),
+            *[len(found & terms) for terms in term_sets],
+            *[search(content) is not None for search in searches],
+            *[content.count(literal) for literal in literals],
+        ))
+    names = feature_names(profile)
+    table = np.array(rows, dtype=np.int64).reshape(len(rows), len(names))
+    flags = {"digit", *profile.patterns}
+    return {name: table[:, i].astype(bool) if name in flags else table[:, i] for i, name in enumerate(names)}
+
+
+def _round(values, ndigits):
+    """Python round() of every element (np.round rounds some halfway cases differently)"""
+    distinct, inverse = np.unique(values, return_inverse=True)
+    return np.array([round(value, ndigits) for value in distinct.tolist()], dtype=np.float64)[inverse.reshape(-1)]
+
+
+@functools.lru_cache(maxsize=8)
+def _vector_scorer(profile):
+    """Compile a profile's signals and scores into scores(features) over arrays"""
+    spec = profile.spec
+    names = set(profile.names)
+
+    def condition(text):
+        return condition_source(text, names, vectorized=True)
+
+    lines = [f"v_{name} = f[{name!r}]" for name in feature_names(profile)]
+    for signal_name, text in spec.get("signals", {}).items():
+        lines.append(f"v_{signal_name} = {condition(text)}")
+    for score in spec.get("scores", []):
+        name = score["name"]
+        if "rules" in score:
+            lines.append("score = np.zeros(len(v_length), dtype=np.int64)")
+            for rule in score["rules"]:
+                points, else_points = rule.get("points", 0), rule.get("else_points", 0)
+                if not points and not else_points:
+                    continue
+                if "when" not in rule:
+                    lines.append(f"score = score + {points!r}")
+                else:
+                    lines.append(f"score = score + np.where({condition(rule['when'])}, {points!r}, {else_points!r})")
+            if score.get("max") is not None:
+                lines.append(f"score = np.minimum({score['max']!r}, score)")
+            if score.get("min") is not None:
+                lines.append(f"score = np.maximum({score['min']!r}, score)")
+            value = "score"
+        elif "weights" in score:
+            value = "0"
+            for source, weight in score["weights"]:
+                term = f"(v_{source} * {weight!r})"
+                value = term if value == "0" else f"({value} + {term})"
+            if score.get("round") is not None:
+                value = f"_round({value}, {score['round']})"
+        elif "from" in score:
+            value = f"v_{score['from']}"
+            for factor in score.get("multiply", []):
+                value = f"({value} * {factor!r})"
+            if score.get("truncate"):
+                value = f"np.trunc({value}).astype(np.int64)"
+        else:
+            raise RuleError(f"{profile.name}: score {name!r} needs rules, weights or from")
+        lines.append(f"v_{name} = {value}")
+    result = ", ".join(f"{score['name']!r}: v_{score['name']}" for score in spec.get("scores", []))
+    lines.append(f"return {{{result}}}")
+
+    source = "def scores(f):\n" + "\n".join("    " + line for line in lines) + "\n"
+    namespace = {"np": np, "_round": _round}
+    exec(compile(source, f"<bulk scoring profile {profile.name}>", "exec"), namespace)
+    return namespace["scores"]
+
+
+def score_features(features, profile=None):
+    """Compute every score of a profile from its feature arrays"""
+    return _vector_scorer(profile or scoring_profile(BULK_PROFILE))(features)
+
+
+def score_bulk(texts, profile=None):
+    """Score a corpus; returns feature and score arrays in input order"""
+    profile = profile or scoring_profile(BULK_PROFILE)
+    features = extract_features(texts, profile)
+    result = dict(features)
+    result.update(score_features(features, profile))
+    return result
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Bulk YAPS lookup for many Twitter accounts
+
+Reads Twitter user ids and/or @usernames (one per line, '#' comments
+allowed), streams every schema's attestations once, newest first, and
+keeps the first hit per wanted user in a dict keyed by twitterUserId:
+that is the user's latest record. Streaming stops early once every
+wanted user has been seen. Output is one row per (user, schema) as CSV
+or JSON.
+
+    python bulk_yaps_lookup.py accounts.txt -o yaps.csv
+    python bulk_yaps_lookup.py accounts.txt --format json --local
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from eas_client import client, iter_attestations, EASError
+from attestation_store import AttestationStore, DB_PATH, decoded_fields
+from schema_decoder import to_int
+from check_my_yaps import SCHEMAS
+
+BASE_COLUMNS = ["input", "schema", "found", "twitterUserId", "twitterUsername", "timeCreated", "revoked"]
+
+
+def read_targets(lines):
+    """Split input lines into (ordered inputs, wanted ids, wanted lowercase usernames)"""
+    inputs, ids, usernames = [], set(), set()
+    for line in lines:
+        entry = line.split("#", 1)[0].strip()
+        if not entry or entry in inputs:
+            continue
+        inputs.append(entry)
+        if entry.isdigit():
+            ids.add(str(int(entry)))
+        else:
+            usernames.add(entry.lstrip("@").lower())
+    return inputs, ids, usernames
+
+
+def _plain(value):
+    # BigNumber dicts -> int, everything else as decoded
+    return to_int(value) if isinstance(value, dict) else value
+
+
+def _identity(fields):
+    user_id = username = None
+    for name, value in fields.items():
+        if user_id is None and 'twitterUserId' in name:
+            number = to_int(value)
+            user_id = str(number) if number is not None else None
+        elif username is None and 'twitterUsername' in name and isinstance(value, str):
+            username = value
+    return user_id, username
+
+
+def latest_from_eas(schema_uid, ids, usernames, include_revoked=False):
+    """twitterUserId -> latest record for the wanted users, in one pass over the schema"""
+    index = {}
+    pending_ids, pending_names = set(ids), set(usernames)
+    for att in iter_attestations(schema_uid, fields=("decodedDataJson", "timeCreated", "revoked")):
+        if att['fields'] is None or (att['revoked'] and not include_revoked):
+            continue
+        user_id, username = _identity(att['fields'])
+        if user_id is None or user_id in index:
+            continue
+        name_key = username.lower() if username else None
+        if user_id in ids or name_key in usernames:
+            index[user_id] = {
+                "twitterUserId": user_id,
+                "twitterUsername": username,
+                "timeCreated": att['timeCreated'],
+                "revoked": att['revoked'],
+                "fields": {name: _plain(value) for name, value in att['fields'].items()},
+            }
+            pending_ids.discard(user_id)
+            pending_names.discard(name_key)
+            if not pending_ids and not pending_names:
+                break
+    return index
+
+
+def latest_from_store(store, schema_uid, ids, usernames, include_revoked=False):
+    """Same as latest_from_eas() from the local mirror's indexes"""
+    index = {}
+    if include_revoked:
+        rows = [row for user_id in ids for row in store.user_attestations(user_id, schema_uid)[:1]]
+        rows.extend(row for name in usernames for row in store.username_attestations(name, schema_uid)[:1])
+    else:
+        # Materialized latest-per-user view: no history scan
+        rows = [row for user_id in ids for row in store.latest(user_id, schema_uid)]
+        rows.extend(row for name in usernames for row in store.latest_by_username(name, schema_uid)[:1])
+    for row in rows:
+        fields = decoded_fields(row)
+        index.setdefault(row['twitter_user_id'], {
+            "twitterUserId": row['twitter_user_id'],
+            "twitterUsername": row['twitter_username'],
+            "timeCreated": row['time_created'],
+            "revoked": bool(row['revoked']),
+            "fields": {name: _plain(value) for name, value in fields.items()},
+        })
+    return index
+
+
+def build_table(inputs, results):
+    """One row per (input, schema); ``results`` maps schema name -> latest-record index"""
+    by_name = {schema: {(record["twitterUsername"] or "").lower(): record for record in index.values()}
+               for schema, index in results.items()}
+    rows = []
+    for entry in inputs:
+        for schema, index in results.items():
+            if entry.isdigit():
+                record = index.get(str(int(entry)))
+            else:
+                record = by_name[schema].get(entry.lstrip("@").lower())
+            row = {"input": entry, "schema": schema, "found": record is not None}
+            if record is not None:
+                row.update({k: record[k] for k in ("twitterUserId", "twitterUsername", "timeCreated", "revoked")})
+                row.update({k: v for k, v in record["fields"].items() if k not in row})
+            rows.append(row)
+    return rows
+
+
+def write_table(rows, out, fmt):
+    if fmt == "json":
+        json.dump(rows, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return
+    columns = BASE_COLUMNS + sorted({key for row in rows for key in row} - set(BASE_COLUMNS))
+    writer = csv.DictWriter(out, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latest YAPS attestation per user for many Twitter accounts")
+    parser.add_argument("accounts", help="file with one Twitter id or @username per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--format", choices=("csv", "json"), help="output format (default: from the output extension, else csv)")
+    parser.add_argument("--schema", action="append", help="schema UID (repeatable, default: the check_my_yaps schemas)")
+    parser.add_argument("--local", action="store_true", help="read from the local attestation mirror instead of EAS")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    parser.add_argument("--include-revoked", action="store_true", help="allow revoked attestations as the latest record")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.accounts == "-" else open(args.accounts, encoding="utf-8")
+    with source:
+        inputs, ids, usernames = read_targets(source)
+    if not inputs:
+        parser.error("no accounts in input")
+    fmt = args.format or ("json" if args.output.endswith(".json") else "csv")
+    schemas = {uid: uid for uid in args.schema} if args.schema else {name: uid for name, uid in SCHEMAS.items()}
+
+    print(f"🔍 Looking up {len(inputs)} account(s) in {len(schemas)} schema(s)", file=sys.stderr)
+    store = AttestationStore(args.db) if args.local else None
+    results = {}
+    for schema_name, schema_uid in schemas.items():
+        started = time.monotonic()
+        try:
+            if store is not None:
+                results[schema_name] = latest_from_store(store, schema_uid, ids, usernames, args.include_revoked)
+            else:
+                results[schema_name] = latest_from_eas(schema_uid, ids, usernames, args.include_revoked)
+        except EASError as e:
+            print(f"❌ {schema_name}: {e}", file=sys.stderr)
+            results[schema_name] = {}
+            continue
+        print(f"   ✅ {schema_name}: {len(results[schema_name])} user(s) found in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    if store is not None:
+        store.close()
+
+    rows = build_table(inputs, results)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        write_table(rows, out, fmt)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Caching helpers shared by the Flask apps
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class StaleWhileRevalidateCache:
+    """Cache a single value with a TTL.
+
+    Once the TTL expires the stale value keeps being served while one
+    background thread refreshes it. If the loader fails and nothing was
+    cached yet, ``fallback()`` is served and the load is retried after
+    ``retry_after`` seconds instead of on every request.
+    """
+
+    def __init__(self, loader, ttl, fallback=None, retry_after=30):
+        self.loader = loader
+        self.ttl = ttl
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._value = _MISSING
+        self._expires_at = 0.0
+        self._refreshing = False
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def get(self):
+        """Return the cached value, loading or refreshing it when needed"""
+        with self._lock:
+            if self._value is not _MISSING:
+                if time.monotonic() < self._expires_at:
+                    self.hits += 1
+                    return self._value
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, daemon=True).start()
+                return self._value
+            self.misses += 1
+        return self._load()
+
+    def invalidate(self):
+        """Drop the cached value so the next get() loads synchronously"""
+        with self._lock:
+            self._value = _MISSING
+            self._expires_at = 0.0
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "ttl": self.ttl,
+                "cached": self._value is not _MISSING,
+            }
+
+    def _load(self):
+        try:
+            value = self.loader()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+                if self._value is not _MISSING:
+                    return self._value
+                if self.fallback is None:
+                    raise
+                value = self.fallback()
+                self._store(value, self.retry_after)
+            return value
+        with self._lock:
+            self._store(value, self.ttl)
+        return value
+
+    def _refresh(self):
+        try:
+            value = self.loader()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+                # keep serving the stale value, try again later
+                self._expires_at = time.monotonic() + self.retry_after
+                self._refreshing = False
+            return
+        with self._lock:
+            self.refreshes += 1
+            self._store(value, self.ttl)
+            self._refreshing = False
+
+    def _store(self, value, ttl):
+        self._value = value
+        self._expires_at = time.monotonic() + ttl
+
+
+class LRUCache:
+    """Bounded mapping with least-recently-used and age-based eviction"""
+
+    def __init__(self, max_size=1024, max_age=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, stored_at = entry
+            if self.max_age is not None and time.monotonic() - stored_at > self.max_age:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for ``key``, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit rate and eviction counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "max_age": self.max_age,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,118 +1,130 @@
 #!/usr/bin/env python3
 """
 Check YAPS score for specific Twitter user from on-chain attestations
+
+The user is narrowed on the server (decodedDataJson contains the user id,
+decimal or hex), so a check is one small request per schema, and the
+schemas are queried concurrently. If EAS is unreachable, the local
+mirror from attestation_store.py is used instead.
+
+    python check_my_yaps.py 1422186185196113922
+    python check_my_yaps.py 1422186185196113922 --local
 """
 
-import requests
+import argparse
 import json
+import os
+
+from eas_client import client, iter_attestations, uint_value_filter, map_concurrent, EASError
+from attestation_store import AttestationStore, DB_PATH
+from schema_decoder import to_int
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
 TWITTER_USER_ID = "1422186185196113922"
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {"query": query, "variables": variables or {}}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
+# Schema UIDs we need to check
+SCHEMAS = {
+    "Schema #517 (Scaled Points)": "0x30c23ae07a72d6c4cafbe3c7a24f6b85427b9dacde030366376c8f87d794a802",
+    "Schema #546 (Monthly Points)": "0x69a0626ec645ae8c2429f9190782f396ce64e5ce0a82096d09891b9515e67fa7"
+}
+
+def fetch_user_attestations(schema_uid, twitter_user_id):
+    """User's attestations from EAS, filtered server-side, newest first"""
+    user_id = int(twitter_user_id)
+    user_attestations = []
+    for att in iter_attestations(schema_uid, page_size=50, fields=("decodedDataJson", "timeCreated", "revoked"),
+                                 where=uint_value_filter(user_id)):
+        if att['fields'] is None:
+            continue
+        # The server filter is a substring match, confirm the actual field
+        if any('twitterUserId' in name and to_int(value) == user_id for name, value in att['fields'].items()):
+            user_attestations.append({
+                'decoded': att['decoded'],
+                'timestamp': att['timeCreated'],
+                'revoked': att['revoked']
+            })
+    return user_attestations
+
+def local_user_attestations(store, schema_uid, twitter_user_id):
+    """User's attestations from the local mirror, newest first"""
+    return [{
+        'decoded': json.loads(row['decoded_json']),
+        'timestamp': row['time_created'],
+        'revoked': bool(row['revoked'])
+    } for row in store.user_attestations(twitter_user_id, schema_uid) if row['decoded_json']]
 
-def check_yaps_score():
+def latest_attestation(user_attestations):
+    """Newest non-revoked attestation of a newest-first list; the newest one if all are revoked"""
+    return next((att for att in user_attestations if not att['revoked']), user_attestations[0])
+
+def check_yaps_score(twitter_user_id=TWITTER_USER_ID, local=False, db_path=DB_PATH):
     """Check YAPS score for user"""
-    
-    print(f"🔍 Checking YAPS score for Twitter ID: {TWITTER_USER_ID}")
-    print(f"Username: @dgkorojr (KoroJR)")
+
+    print(f"🔍 Checking YAPS score for Twitter ID: {twitter_user_id}")
     print("="*80)
-    
-    # Schema UIDs we need to check
-    schemas = {
-        "Schema #517 (Scaled Points)": "0x30c23ae07a72d6c4cafbe3c7a24f6b85427b9dacde030366376c8f87d794a802",
-        "Schema #546 (Monthly Points)": "0x69a0626ec645ae8c2429f9190782f396ce64e5ce0a82096d09891b9515e67fa7"
-    }
-    
-    for schema_name, schema_uid in schemas.items():
+
+    store = AttestationStore(db_path) if local or os.path.exists(db_path) else None
+
+    # All schemas are queried at once; results are printed in schema order
+    fetched = {}
+    if not local:
+        fetched = {uid: (result, error) for uid, result, error in
+                   map_concurrent(lambda uid: fetch_user_attestations(uid, twitter_user_id), SCHEMAS.values())}
+
+    for schema_name, schema_uid in SCHEMAS.items():
         print(f"\n📊 {schema_name}")
         print("-"*80)
-        
-        # Query attestations for this schema
-        query = """
-        query GetUserAttestations($schemaId: String!) {
-          attestations(
-            where: { schemaId: { equals: $schemaId } },
-            take: 1000,
-            orderBy: [{ timeCreated: desc }]
-          ) {
-            id
-            data
-            decodedDataJson
-            timeCreated
-            revoked
-          }
-        }
-        """
-        
-        variables = {"schemaId": schema_uid}
-        result = query_graphql(query, variables)
-        
-        if 'data' not in result or 'attestations' not in result['data']:
-            print(f"❌ Error querying: {result}")
-            continue
-        
-        attestations = result['data']['attestations']
-        
-        # Find attestations for this Twitter user
-        user_attestations = []
-        
-        for att in attestations:
-            if not att['decodedDataJson']:
-                continue
-                
-            try:
-                decoded = json.loads(att['decodedDataJson'])
-                
-                # Check if this attestation is for our user
-                for field in decoded:
-                    if 'twitterUserId' in field['name']:
-                        twitter_id = str(field['value']['value'] if 'value' in field['value'] else field['value'])
-                        
-                        if twitter_id == TWITTER_USER_ID:
-                            user_attestations.append({
-                                'decoded': decoded,
-                                'timestamp': att['timeCreated'],
-                                'revoked': att['revoked']
-                            })
-                            break
-            except (json.JSONDecodeError, KeyError):
+
+        user_attestations = None
+        if not local:
+            user_attestations, error = fetched[schema_uid]
+            if isinstance(error, EASError):
+                print(f"❌ Error querying: {error}")
+            elif error is not None:
+                raise error
+        if user_attestations is None:
+            if store is None:
+                print(f"⚠️  No local mirror at {db_path} (run: python attestation_store.py sync)")
                 continue
-        
+            print("💾 Using local attestation mirror")
+            user_attestations = local_user_attestations(store, schema_uid, twitter_user_id)
+
         if not user_attestations:
             print(f"❌ No attestations found for this user in {schema_name}")
             continue
-        
+
         print(f"✅ Found {len(user_attestations)} attestation(s)")
-        
-        # Display the most recent attestation
-        latest = user_attestations[0]
+
+        # Display the most recent attestation that still stands
+        latest = latest_attestation(user_attestations)
         print(f"\n📅 Latest Attestation:")
         print(f"   Timestamp: {latest['timestamp']}")
         print(f"   Revoked: {latest['revoked']}")
         print(f"\n   Data:")
-        
+
         for field in latest['decoded']:
             name = field['name']
             value = field['value']['value'] if 'value' in field['value'] else field['value']
-            field_type = field['type']
-            
+
             # Format display
-            if 'Points' in name or 'points' in name:
-                if str(value).isdigit():
-                    print(f"   • {name}: {int(value):,}")
-                else:
-                    print(f"   • {name}: {value}")
+            points = to_int(value) if 'Points' in name or 'points' in name else None
+            if points is not None:
+                print(f"   • {name}: {points:,}")
             else:
                 print(f"   • {name}: {value}")
-    
+
+    if store is not None:
+        store.close()
+
     print("\n" + "="*80)
     print("✨ YAPS Score Check Complete!")
 
 if __name__ == "__main__":
-    check_yaps_score()
+    parser = argparse.ArgumentParser(description="Check YAPS score for a Twitter user from on-chain attestations")
+    parser.add_argument("twitter_user_id", nargs="?", default=TWITTER_USER_ID, help=f"numeric Twitter user id (default {TWITTER_USER_ID})")
+    parser.add_argument("--local", action="store_true", help="only use the local attestation mirror")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    args = parser.parse_args()
+    if not args.twitter_user_id.isdigit():
+        parser.error("twitter_user_id must be numeric")
+    check_yaps_score(args.twitter_user_id, args.local, args.db)
+    client.print_stats()
@@ -0,0 +1,68 @@
+"""
+Kaito YAPS + Twitter algorithm content analysis
+
+The scoring rules of every app live in scoring_rules.json and are
+compiled by rule_engine into generated evaluate functions. This module
+loads them and exposes the entry points the apps and bulk scorers use.
+Edits to the rules file are picked up by running workers (see RulesFile).
+"""
+
+import hashlib
+import os
+
+from caching import LRUCache
+from rule_engine import RulesFile
+
+RULES_PATH = os.getenv('SCORING_RULES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_rules.json'))
+
+scoring_rules = RulesFile(RULES_PATH, check_interval=float(os.getenv('SCORING_RULES_CHECK_INTERVAL', '2')))
+
+# Results shared between requests; callers must treat them as read-only
+analysis_cache = LRUCache(
+    max_size=int(os.getenv('ANALYSIS_CACHE_SIZE', '2048')),
+    max_age=float(os.getenv('ANALYSIS_CACHE_TTL', '3600')),
+)
+
+
+def scoring_profile(name):
+    """Compiled scoring profile by name (kaito_full, kaito_lite, yaps_simple)"""
+    return scoring_rules.profiles()[name]
+
+
+def analyze_content_full(content):
+    """Shared function for full Kaito + Twitter algorithm analysis"""
+    return scoring_rules.profiles()['kaito_full'].evaluate(content)
+
+
+def analysis_scores(analysis):
+    """Numeric scores of an analysis dict, without the detail strings"""
+    kaito = analysis["kaito_yaps"]
+    breakdown = kaito["breakdown"]
+    return {
+        "total_score": kaito["total_score"],
+        "estimated_yaps": kaito["estimated_yaps"],
+        "content_optimization": breakdown["content_optimization"]["score"],
+        "engagement_strategy": breakdown["engagement_strategy"]["score"],
+        "content_quality": breakdown["content_quality"]["score"],
+        "twitter_score": analysis["twitter_algorithm"]["score"],
+    }
+
+
+def content_key(content):
+    """Cache key for a tweet.
+
+    Scores depend on the exact characters (length, case, repeats), so the
+    key is a digest of the text as analyzed; the endpoints strip
+    surrounding whitespace before it gets here.
+    """
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def analyze_content_cached(content):
+    """analyze_content_full memoized in analysis_cache.
+
+    The key includes the ruleset version, so results computed before a
+    rules reload are never served after it (old entries age out of the LRU).
+    """
+    version, profiles = scoring_rules.current()
+    return analysis_cache.get_or_compute((version, content_key(content)), lambda: profiles['kaito_full'].evaluate(content))
@@ -0,0 +1,305 @@
+"""
+Shared EAS GraphQL client for the YAPS research scripts
+
+One pooled requests.Session (keep-alive reuse across calls and threads),
+connect/read timeouts, retries with jittered exponential backoff on
+429/5xx and connection errors, and latency metrics per GraphQL operation.
+iter_attestations() pages through every attestation of a schema with a
+cursor, so scripts see all of them at bounded memory. map_concurrent()
+and fetch_recent_attestations() query several schemas at once (bounded
+thread pool, aliased multi-schema requests).
+
+Configuration (environment):
+- EAS_GRAPHQL_URL: endpoint (default Base mainnet easscan)
+- EAS_CONNECT_TIMEOUT / EAS_READ_TIMEOUT: seconds (default 5 / 30)
+- EAS_MAX_RETRIES: retries after the first attempt (default 3)
+- EAS_PAGE_SIZE: attestations per page for iter_attestations (default 500)
+- EAS_MAX_CONCURRENCY: parallel requests in map_concurrent (default 4)
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GRAPHQL_URL = os.getenv('EAS_GRAPHQL_URL', "https://base.easscan.org/graphql")
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_PAGE_SIZE = int(os.getenv('EAS_PAGE_SIZE', '500'))
+MAX_CONCURRENCY = int(os.getenv('EAS_MAX_CONCURRENCY', '4'))
+ATTESTATION_FIELDS = ("id", "attester", "recipient", "data", "decodedDataJson", "timeCreated", "revoked")
+
+_OPERATION_RE = re.compile(r'\b(?:query|mutation)\s+(\w+)')
+
+
+class EASError(RuntimeError):
+    """Raised when a GraphQL call still fails after all retries"""
+
+
+class EASClient:
+    """Pooled GraphQL client with timeouts, retries and latency metrics"""
+
+    def __init__(self, url=GRAPHQL_URL, connect_timeout=5.0, read_timeout=30.0, max_retries=3,
+                 backoff=0.5, max_backoff=10.0, pool_size=10):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def query(self, query, variables=None):
+        """Execute a GraphQL query and return the decoded response body.
+
+        GraphQL-level errors come back in the body as usual; only transport
+        failures and 429/5xx responses that outlast the retries raise EASError.
+        """
+        operation = self._operation(query)
+        payload = {"query": query, "variables": variables or {}}
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        self._record(operation, started, attempt, failed=True)
+                        raise EASError(f"{operation}: HTTP {response.status_code}, response is not JSON") from None
+                    self._record(operation, started, attempt, failed=False)
+                    return body
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get("Retry-After")
+            if attempt == self.max_retries:
+                break
+            time.sleep(self._delay(attempt, retry_after))
+        self._record(operation, started, self.max_retries, failed=True)
+        raise EASError(f"{operation}: {error} after {self.max_retries + 1} attempts")
+
+    def stats(self):
+        """Per-operation call counts and latency (ms), slowest operations first"""
+        with self._lock:
+            rows = []
+            for operation, m in self._metrics.items():
+                rows.append({
+                    "operation": operation,
+                    "calls": m["calls"],
+                    "retries": m["retries"],
+                    "failures": m["failures"],
+                    "avg_ms": round(m["total"] / m["calls"] * 1000, 1),
+                    "max_ms": round(m["max"] * 1000, 1),
+                    "last_ms": round(m["last"] * 1000, 1),
+                })
+        return sorted(rows, key=lambda row: -row["avg_ms"] * row["calls"])
+
+    def print_stats(self, file=sys.stderr):
+        rows = self.stats()
+        if not rows:
+            return
+        print("\n📡 EAS GraphQL calls:", file=file)
+        for row in rows:
+            print(f"   {row['operation']}: {row['calls']} call(s), avg {row['avg_ms']}ms, max {row['max_ms']}ms, "
+                  f"{row['retries']} retries, {row['failures']} failed", file=file)
+
+    def _operation(self, query):
+        match = _OPERATION_RE.search(query)
+        return match.group(1) if match else "anonymous"
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after is not None:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        # Full jitter: spread concurrent retries instead of retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _record(self, operation, started, retries, failed):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            m = self._metrics.get(operation)
+            if m is None:
+                m = self._metrics[operation] = {"calls": 0, "retries": 0, "failures": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            m["calls"] += 1
+            m["retries"] += retries
+            m["failures"] += failed
+            m["total"] += elapsed
+            m["max"] = max(m["max"], elapsed)
+            m["last"] = elapsed
+
+
+client = EASClient(
+    connect_timeout=float(os.getenv('EAS_CONNECT_TIMEOUT', '5')),
+    read_timeout=float(os.getenv('EAS_READ_TIMEOUT', '30')),
+    max_retries=int(os.getenv('EAS_MAX_RETRIES', '3')),
+)
+
+
+def query_graphql(query, variables=None):
+    """Execute GraphQL query with the shared client"""
+    return client.query(query, variables)
+
+
+def decode_fields(decoded):
+    """Map field name -> value from a parsed decodedDataJson list"""
+    fields = {}
+    for field in decoded:
+        value = field['value']
+        fields[field['name']] = value['value'] if isinstance(value, dict) and 'value' in value else value
+    return fields
+
+
+def _decode(att, decoder=None):
+    if decoder is not None:
+        att['record'] = decoder.decode(att)
+        return att
+    att['decoded'] = att['fields'] = None
+    if att.get('decodedDataJson'):
+        try:
+            decoded = json.loads(att['decodedDataJson'])
+            att['decoded'], att['fields'] = decoded, decode_fields(decoded)
+        except (ValueError, KeyError, TypeError):
+            pass
+    return att
+
+
+def uint_value_filter(value):
+    """AttestationWhereInput narrowing decodedDataJson to rows that contain a uint value.
+
+    decodedDataJson renders uints as a decimal string or number, or as an
+    ethers BigNumber ``{"type": "BigNumber", "hex": "0x..."}``; the filter
+    ORs all of them. It is a substring match, so callers still compare the
+    decoded field exactly.
+    """
+    value = int(value)
+    patterns = (f'"{value}"', f':{value},', f':{value}}}', f'"{value:#x}"')
+    return {"OR": [{"decodedDataJson": {"contains": pattern}} for pattern in patterns]}
+
+
+def iter_attestation_pages(schema_id, page_size=DEFAULT_PAGE_SIZE, fields=ATTESTATION_FIELDS, where=None,
+                           order="desc", decoder=None, eas=None):
+    """Yield every attestation of a schema, one page (list) at a time.
+
+    Pages are ordered by timeCreated then id and continue from the id of
+    the last row seen (Prisma cursor + skip 1), so rows created while
+    paging do not shift later pages. Each record gets ``decoded`` (the
+    parsed decodedDataJson list) and ``fields`` (name -> value), both None
+    when the attestation has no decodable data. With a schema_decoder
+    ``decoder`` the record gets ``record`` (a typed namedtuple, decoded
+    from ``data`` when selected) instead, and no JSON is parsed. ``where``
+    adds AttestationWhereInput filters next to the schemaId.
+    """
+    if order not in ("asc", "desc"):
+        raise ValueError("order must be 'asc' or 'desc'")
+    if page_size < 1:
+        raise ValueError("page_size must be >= 1")
+    eas = eas or client
+    selection = " ".join(dict.fromkeys(("id", "timeCreated") + tuple(fields)))
+    query = f"""
+    query AttestationPage($where: AttestationWhereInput, $take: Int!, $skip: Int, $cursor: AttestationWhereUniqueInput) {{
+      attestations(
+        where: $where,
+        take: $take,
+        skip: $skip,
+        cursor: $cursor,
+        orderBy: [{{ timeCreated: {order} }}, {{ id: {order} }}]
+      ) {{
+        {selection}
+      }}
+    }}
+    """
+    variables = {"where": {"schemaId": {"equals": schema_id}, **(where or {})}, "take": page_size}
+    while True:
+        result = eas.query(query, variables)
+        if 'data' not in result or not result['data'] or 'attestations' not in result['data']:
+            raise EASError(f"AttestationPage: {result.get('errors', result)}")
+        page = result['data']['attestations']
+        for att in page:
+            _decode(att, decoder)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        variables["cursor"] = {"id": page[-1]['id']}
+        variables["skip"] = 1
+
+
+def iter_attestations(schema_id, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+    """Flat version of iter_attestation_pages()"""
+    for page in iter_attestation_pages(schema_id, page_size, **kwargs):
+        yield from page
+
+
+def map_concurrent(fn, items, max_workers=None):
+    """Run fn(item) for every item on a bounded thread pool.
+
+    Returns [(item, result, error)] in input order; ``error`` is the
+    exception fn raised (and ``result`` None), so one failing schema does
+    not hide the others. All threads share the pooled client session.
+    """
+    items = list(items)
+    workers = max(1, min(max_workers or MAX_CONCURRENCY, len(items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fn, item) for item in items]
+    results = []
+    for item, future in zip(items, futures):
+        error = future.exception()
+        results.append((item, None if error else future.result(), error))
+    return results
+
+
+def fetch_recent_attestations(schema_ids, take=20, fields=ATTESTATION_FIELDS, per_request=5, max_workers=None,
+                              decoder=None, eas=None):
+    """Newest ``take`` attestations of several schemas: {schema_id: [records] or None}.
+
+    Up to ``per_request`` schemas share one GraphQL request as aliased
+    ``attestations`` fields; larger lists are split into requests that run
+    concurrently. A schema whose alias came back null maps to None.
+    Records are decoded like iter_attestation_pages() records (``decoder``
+    applies to every schema, so only pass one for schemas sharing it).
+    """
+    schema_ids = list(dict.fromkeys(schema_ids))
+    eas = eas or client
+    selection = " ".join(dict.fromkeys(("id", "timeCreated") + tuple(fields)))
+
+    def fetch_group(group):
+        params = ", ".join(f"$s{i}: String!" for i in range(len(group)))
+        aliases = "\n".join(
+            f"s{i}: attestations(where: {{ schemaId: {{ equals: $s{i} }} }}, take: {int(take)}, "
+            f"orderBy: [{{ timeCreated: desc }}, {{ id: desc }}]) {{ {selection} }}"
+            for i in range(len(group))
+        )
+        result = eas.query(f"query RecentAttestations({params}) {{\n{aliases}\n}}",
+                           {f"s{i}": schema_id for i, schema_id in enumerate(group)})
+        data = result.get('data')
+        if not data:
+            raise EASError(f"RecentAttestations: {result.get('errors', result)}")
+        return {schema_id: ([_decode(att, decoder) for att in data[f"s{i}"]] if data.get(f"s{i}") is not None else None)
+                for i, schema_id in enumerate(group)}
+
+    groups = [schema_ids[i:i + per_request] for i in range(0, len(schema_ids), per_request)]
+    fetched = {}
+    for group, result, error in map_concurrent(fetch_group, groups, max_workers):
+        if error is not None:
+            if not isinstance(error, EASError):
+                raise error
+            print(f"❌ {error}", file=sys.stderr)
+            result = dict.fromkeys(group)
+        fetched.update(result)
+    return {schema_id: fetched[schema_id] for schema_id in schema_ids}
@@ -1,21 +1,25 @@
 #!/usr/bin/env python3
 """
 Explore new YAPS schema to find scoring parameters
+
+If a snapshot of the schema exists (python attestation_snapshot.py build
+<schema uid>), analyze_scoring_patterns() reads its memory-mapped columns
+instead of downloading every attestation.
 """
 
-import requests
 import json
 from datetime import datetime
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
-SCHEMA_UID = "0xcb66276cf243e78fad68dd5e633f7bb56814b49ac9a91256615340591577a0e8"
+from eas_client import client, query_graphql, iter_attestation_pages, EASError
+from streaming_stats import StreamingStats, numeric
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {"query": query, "variables": variables or {}}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
+try:
+    import numpy as np
+    from attestation_snapshot import open_snapshot
+except ImportError:  # numpy is optional (pip install .[analysis])
+    np = None
+
+SCHEMA_UID = "0xcb66276cf243e78fad68dd5e633f7bb56814b49ac9a91256615340591577a0e8"
 
 def explore_schema():
     """Get schema details and structure"""
@@ -57,31 +61,12 @@ def get_attestations():
     print("\n📊 RECENT ATTESTATIONS:")
     print("-"*100)
     
-    query = """
-    query GetAttestations($schemaId: String!) {
-      attestations(
-        where: { schemaId: { equals: $schemaId } },
-        take: 20,
-        orderBy: [{ timeCreated: desc }]
-      ) {
-        id
-        attester
-        recipient
-        data
-        decodedDataJson
-        timeCreated
-        revoked
-      }
-    }
-    """
-    
-    result = query_graphql(query, {"schemaId": SCHEMA_UID})
-    
-    if 'data' not in result or 'attestations' not in result['data']:
-        print(f"❌ Error: {result}")
+    try:
+        attestations = next(iter_attestation_pages(SCHEMA_UID, page_size=20), [])
+    except EASError as e:
+        print(f"❌ Error: {e}")
         return
     
-    attestations = result['data']['attestations']
     print(f"✅ Found {len(attestations)} recent attestations\n")
     
     # Analyze first few attestations
@@ -110,83 +95,85 @@ def get_attestations():
             except Exception as e:
                 print(f"   ⚠️  Decode error: {e}")
 
+def analyze_snapshot(snapshot):
+    """Field statistics straight from a snapshot's memory-mapped columns"""
+    
+    print(f"✅ Scanned {len(snapshot):,} attestations (snapshot {snapshot.path})")
+    print("\n📈 FIELD STATISTICS:\n")
+    
+    for field_name in snapshot.fields:
+        if not snapshot.is_numeric(field_name) or not len(snapshot):
+            continue
+        values = snapshot.column(field_name)
+        
+        print(f"🔸 {field_name} ({snapshot.types[field_name]}):")
+        print(f"   Samples: {len(values)}")
+        print(f"   Range: {int(values.min()):,} - {int(values.max()):,}")
+        print(f"   Average: {int(values.mean()):,}")
+        print(f"   p50 / p90 / p99: {' / '.join(f'{int(v):,}' for v in np.quantile(values, (0.5, 0.9, 0.99), method='inverted_cdf'))}")
+        
+        # Show distribution for point fields
+        if 'point' in field_name.lower() or 'score' in field_name.lower():
+            print(f"   Distribution: {np.unique(values)[:10].tolist()}")
+        print()
+
 def analyze_scoring_patterns():
     """Analyze all attestations to find scoring patterns"""
     
     print("\n\n🎯 SCORING PATTERN ANALYSIS:")
     print("="*100)
     
-    query = """
-    query GetAllAttestations($schemaId: String!) {
-      attestations(
-        where: { schemaId: { equals: $schemaId } },
-        take: 500,
-        orderBy: [{ timeCreated: desc }]
-      ) {
-        decodedDataJson
-        timeCreated
-      }
-    }
-    """
-    
-    result = query_graphql(query, {"schemaId": SCHEMA_UID})
-    
-    if 'data' not in result or 'attestations' not in result['data']:
-        print(f"❌ Error: {result}")
+    snapshot = open_snapshot(SCHEMA_UID) if np is not None else None
+    if snapshot is not None:
+        analyze_snapshot(snapshot)
         return
     
-    attestations = result['data']['attestations']
-    
-    # Collect all field names and their ranges
+    # Collect all field names and their ranges, one page at a time, in constant memory
     field_stats = {}
-    
-    for att in attestations:
-        if not att['decodedDataJson']:
-            continue
-            
-        try:
-            decoded = json.loads(att['decodedDataJson'])
-            
-            for field in decoded:
-                name = field['name']
-                value = field['value']['value'] if 'value' in field['value'] else field['value']
-                
-                if name not in field_stats:
-                    field_stats[name] = {
-                        'type': field['type'],
-                        'values': [],
-                        'min': None,
-                        'max': None,
-                        'avg': None
-                    }
+    total = 0
+    
+    try:
+        for page in iter_attestation_pages(SCHEMA_UID, fields=("decodedDataJson", "timeCreated")):
+            total += len(page)
+            for att in page:
+                if att['decoded'] is None:
+                    continue
                 
-                # Collect numeric values
-                if isinstance(value, (int, float)):
-                    field_stats[name]['values'].append(value)
-                elif isinstance(value, str) and value.isdigit():
-                    field_stats[name]['values'].append(int(value))
+                for field in att['decoded']:
+                    name = field['name']
+                    value = att['fields'][name]
                     
-        except Exception:
-            continue
+                    if name not in field_stats:
+                        field_stats[name] = {
+                            'type': field['type'],
+                            'stats': StreamingStats(track_lowest=10)
+                        }
+                    
+                    # Collect numeric values
+                    value = numeric(value)
+                    if value is not None:
+                        field_stats[name]['stats'].update(value)
+    except EASError as e:
+        print(f"❌ Error: {e}")
+        return
+    
+    print(f"✅ Scanned {total:,} attestations")
     
     # Calculate statistics
     print("\n📈 FIELD STATISTICS:\n")
     
-    for field_name, stats in field_stats.items():
-        if stats['values']:
-            values = stats['values']
-            stats['min'] = min(values)
-            stats['max'] = max(values)
-            stats['avg'] = sum(values) / len(values)
-            
-            print(f"🔸 {field_name} ({stats['type']}):")
-            print(f"   Samples: {len(values)}")
-            print(f"   Range: {int(stats['min']):,} - {int(stats['max']):,}")
-            print(f"   Average: {int(stats['avg']):,}")
+    for field_name, field in field_stats.items():
+        stats = field['stats']
+        if stats.count:
+            print(f"🔸 {field_name} ({field['type']}):")
+            print(f"   Samples: {stats.count}")
+            print(f"   Range: {int(stats.min):,} - {int(stats.max):,}")
+            print(f"   Average: {int(stats.mean):,}")
+            print(f"   p50 / p90 / p99: {' / '.join(f'{int(v):,}' for v in stats.sketch.quantiles((0.5, 0.9, 0.99)))}")
             
             # Show distribution for point fields
             if 'point' in field_name.lower() or 'score' in field_name.lower():
-                print(f"   Distribution: {sorted(set(values))[:10]}")
+                print(f"   Distribution: {stats.lowest}")
             print()
 
 if __name__ == "__main__":
@@ -196,3 +183,4 @@ if __name__ == "__main__":
     
     print("\n" + "="*100)
     print("✨ Schema Analysis Complete!")
+    client.print_stats()
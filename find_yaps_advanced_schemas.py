@@ -3,70 +3,46 @@
 Find YAPS advanced schemas (517-520) with yap24HScaledPoints and yapScaledPoints
 """
 
-import requests
 import json
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
+from eas_client import client, query_graphql
+from schema_registry import SchemaRegistry
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {"query": query, "variables": variables or {}}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
 
-def find_schemas_by_position():
-    """Find schemas 517-520 by querying all schemas and finding by position"""
-    query = """
-    query GetSchemas {
-      schemata(orderBy: [{ id: asc }], take: 600) {
-        id
-        schema
-        creator
-        txid
-        time
-        index
-      }
-    }
-    """
+def find_schemas_by_position(registry):
+    """Find schemas 517-520 by index in the cached schema registry"""
+    print(f"Found {len(registry)} total schemas")
+    
+    # Check schemas 517-520
+    target_positions = [517, 518, 519, 520]
+    found_schemas = {}
     
-    result = query_graphql(query)
-    if 'data' in result and 'schemata' in result['data']:
-        schemas = result['data']['schemata']
-        print(f"Found {len(schemas)} total schemas")
+    for target in target_positions:
+        schema = registry.by_index(target)
+        if schema is None:
+            continue
+        found_schemas[target] = schema
         
-        # Check schemas 517-520
-        target_positions = [517, 518, 519, 520]
-        found_schemas = {}
+        print(f"\n{'='*60}")
+        print(f"SCHEMA #{target}")
+        print(f"{'='*60}")
+        print(f"UID: {schema['id']}")
+        print(f"Schema: {schema['schema']}")
+        print(f"Creator: {schema['creator']}")
+        print(f"Time: {schema['time']}")
+        print(f"TxID: {schema['txid']}")
         
-        for target in target_positions:
-            if target <= len(schemas):
-                schema = schemas[target-1]  # Array is 0-indexed
-                found_schemas[target] = schema
-                
-                print(f"\n{'='*60}")
-                print(f"SCHEMA #{target}")
-                print(f"{'='*60}")
-                print(f"UID: {schema['id']}")
-                print(f"Schema: {schema['schema']}")
-                print(f"Creator: {schema['creator']}")
-                print(f"Time: {schema['time']}")
-                print(f"TxID: {schema['txid']}")
-                
-                # Check if it contains YAPS-related fields
-                schema_lower = schema['schema'].lower()
-                if any(keyword in schema_lower for keyword in ['yap', 'scaled', '24h']):
-                    print("🎯 POTENTIAL YAPS SCHEMA DETECTED!")
-                    
-                    if 'yap24hscaled' in schema_lower:
-                        print("✅ Contains yap24HScaledPoints")
-                    if 'yapscaled' in schema_lower:
-                        print("✅ Contains yapScaledPoints")
-        
-        return found_schemas
-    else:
-        print(f"Error querying schemas: {result}")
-        return {}
+        # Check if it contains YAPS-related fields
+        schema_lower = schema['schema'].lower()
+        if any(keyword in schema_lower for keyword in ['yap', 'scaled', '24h']):
+            print("🎯 POTENTIAL YAPS SCHEMA DETECTED!")
+            
+            if 'yap24hscaled' in schema_lower:
+                print("✅ Contains yap24HScaledPoints")
+            if 'yapscaled' in schema_lower:
+                print("✅ Contains yapScaledPoints")
+    
+    return found_schemas
 
 def analyze_advanced_yaps_schema(schema_uid, schema_structure):
     """Analyze attestations from advanced YAPS schema"""
@@ -158,11 +134,14 @@ if __name__ == "__main__":
     print("🚀 SEARCHING FOR ADVANCED YAPS SCHEMAS (517-520)")
     print("Looking for yap24HScaledPoints and yapScaledPoints...")
     
-    schemas = find_schemas_by_position()
+    with SchemaRegistry() as registry:
+        registry.ensure_fresh()
+        schemas = find_schemas_by_position(registry)
     
     # Analyze any YAPS schemas found
     for pos, schema in schemas.items():
         schema_lower = schema['schema'].lower()
         if any(keyword in schema_lower for keyword in ['yap', 'scaled']):
             print(f"\n🎯 Found YAPS schema at position {pos}!")
-            analyze_advanced_yaps_schema(schema['id'], schema['schema'])
\ No newline at end of file
+            analyze_advanced_yaps_schema(schema['id'], schema['schema'])
+    client.print_stats()
@@ -3,17 +3,10 @@
 Get YAPS attestations from specific schemas to analyze algorithm parameters
 """
 
-import requests
 import json
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
+from eas_client import client, fetch_recent_attestations
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {"query": query, "variables": variables or {}}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
 
 def analyze_yaps_attestations():
     """Get and analyze YAPS attestations from known schemas"""
@@ -34,6 +27,9 @@ def analyze_yaps_attestations():
         }
     }
     
+    # One aliased request for all schemas instead of one round trip each
+    recent = fetch_recent_attestations([info["uid"] for info in yaps_schemas.values()], take=20)
+    
     for schema_name, schema_info in yaps_schemas.items():
         print(f"\n{'='*60}")
         print(f"Analyzing {schema_name}")  
@@ -41,30 +37,8 @@ def analyze_yaps_attestations():
         print(f"Fields: {schema_info['fields']}")
         print(f"{'='*60}")
         
-        # Query attestations for this schema
-        query = """
-        query GetYAPSAttestations($schemaId: String!) {
-          attestations(
-            where: { schemaId: { equals: $schemaId } },
-            take: 20,
-            orderBy: [{ timeCreated: desc }]
-          ) {
-            id
-            attester
-            recipient  
-            data
-            decodedDataJson
-            timeCreated
-            revoked
-          }
-        }
-        """
-        
-        variables = {"schemaId": schema_info["uid"]}
-        result = query_graphql(query, variables)
-        
-        if 'data' in result and 'attestations' in result['data']:
-            attestations = result['data']['attestations']
+        attestations = recent[schema_info["uid"]]
+        if attestations is not None:
             print(f"Found {len(attestations)} attestations\n")
             
             if attestations:
@@ -131,9 +105,10 @@ def analyze_yaps_attestations():
             else:
                 print("No attestations found for this schema")
         else:
-            print(f"Error querying attestations: {result}")
+            print(f"Error querying attestations for {schema_name}")
 
 if __name__ == "__main__":
     print("🚀 YAPS Algorithm Parameter Analysis")
     print("Analyzing attestations from discovered YAPS schemas...\n")
-    analyze_yaps_attestations()
\ No newline at end of file
+    analyze_yaps_attestations()
+    client.print_stats()
@@ -4,25 +4,38 @@ import requests
 import re
 import random
 
+from caching import StaleWhileRevalidateCache
+from singleflight import SingleFlight
+from leaderboard import Leaderboard, LEADERBOARD_REFRESH, leaderboard_response, rank_response, refresher
+from content_analysis import scoring_profile, scoring_rules
+
 app = Flask(__name__)
 
+KAITO_PROJECTS_TTL = int(os.getenv('KAITO_PROJECTS_TTL', '300'))
+
+upstream_calls = SingleFlight()
+
+def load_kaito_projects():
+    """Scrape the Pre-TGE arena; raises when Kaito is down or returns nothing"""
+    response = requests.get("https://yaps.kaito.ai/pre-tge", timeout=10)
+    if response.status_code != 200:
+        raise requests.HTTPError(f"Kaito returned {response.status_code}")
+    html = response.text
+    pattern = r'(MOMENTUM|LIMITLESS|POLYMARKET|SENTIENT|MONAD|OPENSEA|BASE|ALLORA|YIELDBASIS|CYSIC|BILLIONS|MET|WALLCHAIN|IRYS|RECALL|KITE|MASK|EVERLYN|DZ|TALUS|BERACHAIN|STORY)'
+    matches = re.findall(pattern, html)
+    seen = set()
+    projects = []
+    for match in matches:
+        if match not in seen and len(projects) < 20:
+            projects.append({"name": match.title() if match != "MASK" else "MetaMask", "mindshare": "High", "category": get_category(match)})
+            seen.add(match)
+    if not projects:
+        raise ValueError("No projects found on Kaito page")
+    return projects
+
 def fetch_kaito_projects():
-    try:
-        response = requests.get("https://yaps.kaito.ai/pre-tge", timeout=10)
-        if response.status_code != 200:
-            return get_fallback_projects()
-        html = response.text
-        pattern = r'(MOMENTUM|LIMITLESS|POLYMARKET|SENTIENT|MONAD|OPENSEA|BASE|ALLORA|YIELDBASIS|CYSIC|BILLIONS|MET|WALLCHAIN|IRYS|RECALL|KITE|MASK|EVERLYN|DZ|TALUS|BERACHAIN|STORY)'
-        matches = re.findall(pattern, html)
-        seen = set()
-        projects = []
-        for match in matches:
-            if match not in seen and len(projects) < 20:
-                projects.append({"name": match.title() if match != "MASK" else "MetaMask", "mindshare": "High", "category": get_category(match)})
-                seen.add(match)
-        return projects if projects else get_fallback_projects()
-    except:
-        return get_fallback_projects()
+    """Cached project list: stale-while-revalidate, fallback when Kaito is down"""
+    return kaito_projects_cache.get()
 
 def get_fallback_projects():
     return [
@@ -31,6 +44,11 @@ def get_fallback_projects():
         {"name": "Sentient", "mindshare": "High", "category": "AI Agents"},
     ]
 
+kaito_projects_cache = StaleWhileRevalidateCache(lambda: upstream_calls.do("kaito:pre-tge", load_kaito_projects), ttl=KAITO_PROJECTS_TTL, fallback=get_fallback_projects)
+
+leaderboard = Leaderboard()
+leaderboard_cache = StaleWhileRevalidateCache(lambda: upstream_calls.do("eas:leaderboard", refresher(leaderboard)), ttl=LEADERBOARD_REFRESH)
+
 def get_category(project):
     categories = {
         "LIMITLESS": "AI Tools", "SENTIENT": "AI Agents", "POLYMARKET": "Prediction Markets",
@@ -50,6 +68,26 @@ def home():
     projects = fetch_kaito_projects()
     return render_template('index.html', projects=projects, prompts=PROMPTS)
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify({"kaito_projects": kaito_projects_cache.stats(), "upstream_calls": upstream_calls.stats(), "scoring_rules": scoring_rules.stats(), "leaderboard": leaderboard_cache.stats()})
+
+@app.route('/leaderboard')
+def get_leaderboard():
+    try:
+        payload, status = leaderboard_response(leaderboard_cache.get, request.args.get('limit', 100), request.args.get('offset', 0))
+        return jsonify(payload), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/rank/<twitter_id>')
+def get_rank(twitter_id):
+    try:
+        payload, status = rank_response(leaderboard_cache.get, twitter_id)
+        return jsonify(payload), status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/generate', methods=['POST'])
 def generate():
     try:
@@ -138,177 +176,8 @@ def analyze_content():
         if not content:
             return jsonify({"error": "Content required"}), 400
         
-        char_count = len(content)
-        optimal_length = 150 <= char_count <= 280
-        min_length = char_count >= 50
-        
-        crypto_keywords = ['defi', 'layer', 'l2', 'ai', 'rwa', 'tvl', 'airdrop', 'protocol', 'chain', 'token', 'nft', 'dao', 'staking', 'yield', 'bridge', 'zk', 'rollup', 'evm', 'smart contract']
-        content_lower = content.lower()
-        keyword_count = sum(1 for kw in crypto_keywords if kw in content_lower)
-        has_crypto_focus = keyword_count >= 1
-        
-        keyword_stuffing = keyword_count > 5
-        
-        generic_phrases = ['to the moon', 'lfg', 'gm', 'ser', 'ngmi', 'wagmi', 'bullish', 'bearish']
-        generic_count = sum(1 for phrase in generic_phrases if phrase in content_lower)
-        is_original = generic_count < 2
-        
-        content_opt_score = 0
-        if min_length: content_opt_score += 2
-        if optimal_length: content_opt_score += 3
-        if has_crypto_focus: content_opt_score += 3
-        if is_original: content_opt_score += 2
-        content_opt_score = min(10, content_opt_score)
-        
-        has_question = '?' in content
-        has_data = any(char.isdigit() for char in content)
-        has_cta = any(word in content_lower for word in ['what', 'how', 'why', 'thoughts', 'think', 'opinion'])
-        
-        engagement_score = 0
-        if has_question: engagement_score += 4
-        if has_data: engagement_score += 3
-        if has_cta: engagement_score += 3
-        engagement_score = min(10, engagement_score)
-        
-        has_metrics = bool(re.search(r'\d+[%$MBK]|\$\d+|\d+x', content))
-        has_analysis = len(content.split()) > 15
-        no_spam_pattern = not bool(re.search(r'(.)\1{3,}', content))
-        
-        quality_score = 0
-        if has_metrics: quality_score += 4
-        if has_analysis: quality_score += 3
-        if no_spam_pattern: quality_score += 3
-        quality_score = min(10, quality_score)
-        
-        content_types = []
-        if 'tvl' in content_lower or 'revenue' in content_lower: content_types.append("Protocol analysis ?")
-        if has_metrics and ('vs' in content_lower or 'compare' in content_lower): content_types.append("Comparison ?")
-        if 'airdrop' in content_lower and 'risk' in content_lower: content_types.append("Airdrop strategy ?")
-        if re.search(r'thread|1/', content_lower): content_types.append("Thread format ?")
-        
-        penalties = []
-        if keyword_stuffing: penalties.append("?? Keyword stuffing detected")
-        if 'kaito' in content_lower and '@' in content: penalties.append("?? Avoid tagging Kaito")
-        if generic_count >= 3: penalties.append("?? Too many generic phrases")
-        if char_count < 50: penalties.append("?? Too short (min 50 chars)")
-        if not has_crypto_focus: penalties.append("?? No crypto-specific topic")
-        
-        suggestions = []
-        if not has_question: suggestions.append("?? Add question untuk drive discussion")
-        if not has_data: suggestions.append("?? Include metrics/data untuk credibility")
-        if char_count < 150: suggestions.append("?? Expand to 150-280 chars (optimal)")
-        if not content_types: suggestions.append("?? Try protocol deep-dive atau comparison format")
-        if not is_original: suggestions.append("?? Add personal analysis/unique insight")
-        
-        total_score = (content_opt_score * 0.3) + (engagement_score * 0.5) + (quality_score * 0.2)
-        total_score = round(total_score, 1)
-        
-        estimated_yaps = int(total_score * 0.7 * 75)
-        
-        if total_score >= 9:
-            rating = "????? Excellent - High YAPS potential!"
-        elif total_score >= 7:
-            rating = "???? Good - Solid content"
-        elif total_score >= 5:
-            rating = "??? Fair - Needs improvement"
-        else:
-            rating = "?? Poor - Optimize further"
-        
-        # Build Twitter Algorithm scoring
-        twitter_score = 0
-        engagement_factors = []
-        twitter_penalties = []
-        
-        if has_question:
-            twitter_score += 35
-            engagement_factors.append("? Has question (+35 pts, drives Reply 75x)")
-        if has_cta:
-            twitter_score += 25
-            engagement_factors.append("?? Call-to-action (+25 pts)")
-        if has_data:
-            twitter_score += 15
-            engagement_factors.append("?? Data/metrics (+15 pts)")
-        if optimal_length:
-            twitter_score += 15
-            engagement_factors.append("?? Optimal length 150-280 chars (+15 pts)")
-        if no_spam_pattern:
-            twitter_score += 10
-            engagement_factors.append("?? No spam patterns (+10 pts)")
-        
-        # Twitter penalties
-        spam_keywords = ['follow me', 'rt this', 'like if']
-        if any(spam in content_lower for spam in spam_keywords):
-            twitter_score -= 20
-            twitter_penalties.append("?? Engagement farming detected (-20 pts)")
-        if keyword_stuffing:
-            twitter_score -= 15
-            twitter_penalties.append("?? Keyword stuffing (-15 pts)")
-        
-        twitter_score = max(0, min(100, twitter_score))
-        
-        if twitter_score >= 80:
-            twitter_rating = "?? Potensi Viral - Engagement sangat tinggi"
-        elif twitter_score >= 60:
-            twitter_rating = "?? Jangkauan Bagus - Above average"
-        elif twitter_score >= 40:
-            twitter_rating = "?? Jangkauan Sedang - Standard"
-        else:
-            twitter_rating = "?? Jangkauan Rendah - Perlu optimasi"
-        
-        return jsonify({
-            "success": True,
-            "analysis": {
-                "kaito_yaps": {
-                    "total_score": total_score,
-                    "rating": rating,
-                    "estimated_yaps": estimated_yaps,
-                    "breakdown": {
-                        "content_optimization": {
-                            "score": content_opt_score,
-                            "weight": "30%",
-                            "details": {
-                                "length": f"{char_count} chars" + (" ? optimal" if optimal_length else " ?? adjust to 150-280"),
-                                "crypto_focus": "? Yes" if has_crypto_focus else "? No crypto topic",
-                                "originality": "? Original" if is_original else "?? Too generic",
-                                "keywords": f"{keyword_count} keywords" + (" ?" if 1 <= keyword_count <= 3 else " ??")
-                            }
-                        },
-                        "engagement_strategy": {
-                            "score": engagement_score,
-                            "weight": "50%",
-                            "details": {
-                                "question": "? Yes" if has_question else "? No",
-                                "data_driven": "? Yes" if has_data else "? No data/metrics",
-                                "cta": "? Yes" if has_cta else "? No call-to-action"
-                            }
-                        },
-                        "content_quality": {
-                            "score": quality_score,
-                            "weight": "20%",
-                            "details": {
-                                "metrics": "? Includes metrics" if has_metrics else "? No specific metrics",
-                                "depth": "? Detailed analysis" if has_analysis else "?? Surface-level",
-                                "spam_check": "? Clean" if no_spam_pattern else "?? Spam pattern detected"
-                            }
-                        }
-                    },
-                    "penalties": penalties if penalties else ["? No penalties detected"]
-                },
-                "twitter_algorithm": {
-                    "score": twitter_score,
-                    "rating": twitter_rating,
-                    "engagement_factors": engagement_factors if engagement_factors else ["?? Standard engagement"],
-                    "penalties": twitter_penalties if twitter_penalties else [],
-                    "algorithm_notes": [
-                        "?? Reply (75x) > Conversation (30x) > Retweet (10x) > Like (1x)",
-                        "? 30 menit pertama paling penting untuk velocity",
-                        "? Question = boost Reply = 75x engagement weight"
-                    ]
-                },
-                "content_types": content_types if content_types else ["?? Standard tweet format"],
-                "suggestions": suggestions if suggestions else ["? Content is well-optimized!"]
-            }
-        })
+        analysis = scoring_profile('kaito_lite').evaluate(content)
+        return jsonify({"success": True, "analysis": analysis})
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+YAPS leaderboard over attestations
+
+Leaderboard keeps each user's latest points and a sorted index of
+(-points, twitterUserId) keys. Top-K is a slice of the index and a
+user's rank is one bisect; an attestation that changes a user's points
+moves a single key. sync() pulls only attestations created since the
+last one seen, so refreshing a loaded board is one small request, plus
+revocations since the last one seen: revoking a user's current
+attestation re-fetches just that user's newest remaining one.
+
+    python leaderboard.py top 100
+    python leaderboard.py rank @dgkorojr --local
+
+Configuration (environment):
+- LEADERBOARD_SCHEMA: schema UID (default Schema #155)
+- LEADERBOARD_FIELD: points field (default yapPoints)
+- LEADERBOARD_REFRESH: seconds between incremental syncs in the Flask app (default 60)
+
+In the Flask apps a cold board is seeded from the local mirror when one
+exists (YAPS_DB_PATH); otherwise the first full sync runs in a background
+thread and /leaderboard and /rank answer 503 until it has finished.
+"""
+
+import argparse
+import bisect
+import os
+import sys
+import threading
+import time
+
+from eas_client import client, iter_attestations, uint_value_filter, EASError
+from attestation_store import AttestationStore, DB_PATH, YAPS_SCHEMAS, decoded_fields
+from schema_decoder import to_int
+from streaming_stats import numeric
+
+LEADERBOARD_SCHEMA = os.getenv('LEADERBOARD_SCHEMA', "0x2d5c948c6fb42412de88dc8fba09abed76f948136f3628b55b8a9560f288e701")
+LEADERBOARD_FIELD = os.getenv('LEADERBOARD_FIELD', 'yapPoints')
+LEADERBOARD_REFRESH = int(os.getenv('LEADERBOARD_REFRESH', '60'))
+MAX_LIMIT = 1000
+
+
+class LeaderboardLoading(Exception):
+    """Raised while a cold board is still being filled in the background"""
+
+
+class Leaderboard:
+    """Latest points per user with a sorted rank index, updated incrementally"""
+
+    def __init__(self, schema_id=LEADERBOARD_SCHEMA, field=LEADERBOARD_FIELD):
+        self.schema_id = schema_id
+        self.field = field
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._index = []
+        self._by_name = {}
+        self.high_water = 0
+        self.revocation_high_water = 0
+        self.updated_at = None
+        # True once a full pass (or a seed from the local mirror) has finished
+        self.complete = False
+        self._bulk_started = None
+        self._warmup = None
+        self._sync_lock = threading.Lock()
+        self.last_error = None
+
+    def __len__(self):
+        return len(self._index)
+
+    def apply(self, user_id, points, time_created, attestation_id=None, username=None, defer_index=False):
+        """Record a user's points if newer than what is held; returns True when the board changed.
+
+        With ``defer_index`` only the entry is stored; call reindex() once
+        after a bulk load instead of moving keys one at a time.
+        """
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                if (entry["timeCreated"], entry["id"] or "") >= (time_created, attestation_id or ""):
+                    return False
+                if not defer_index:
+                    del self._index[bisect.bisect_left(self._index, (-entry["points"], user_id))]
+            username = username or (entry and entry["twitterUsername"])
+            self._entries[user_id] = {
+                "twitterUserId": user_id,
+                "twitterUsername": username,
+                "points": points,
+                "timeCreated": time_created,
+                "id": attestation_id,
+            }
+            if not defer_index:
+                bisect.insort(self._index, (-points, user_id))
+            if username:
+                self._by_name[username.lower()] = user_id
+            self.high_water = max(self.high_water, time_created)
+            return True
+
+    def remove(self, user_id):
+        """Drop a user from the board; returns True when they were on it"""
+        with self._lock:
+            entry = self._entries.pop(str(user_id), None)
+            if entry is None:
+                return False
+            del self._index[bisect.bisect_left(self._index, (-entry["points"], entry["twitterUserId"]))]
+            if entry["twitterUsername"] and self._by_name.get(entry["twitterUsername"].lower()) == entry["twitterUserId"]:
+                del self._by_name[entry["twitterUsername"].lower()]
+            return True
+
+    def reindex(self):
+        """Rebuild the sorted index from the entries"""
+        with self._lock:
+            self._index = sorted((-entry["points"], user_id) for user_id, entry in self._entries.items())
+
+    def apply_fields(self, fields, time_created, attestation_id=None, defer_index=False):
+        """apply() from a decoded name -> value mapping; False when the fields hold no user or points"""
+        user_id = to_int(fields.get("twitterUserId"))
+        points = numeric(fields.get(self.field))
+        if user_id is None or points is None:
+            return False
+        username = fields.get("twitterUsername")
+        return self.apply(user_id, points, time_created, attestation_id, username if isinstance(username, str) else None, defer_index)
+
+    def sync(self, page_size=500, eas=None):
+        """Apply attestations created since the newest one seen; returns how many were applied.
+
+        Until a first pass has reached the end, entries are loaded without
+        moving index keys and the index is rebuilt afterwards, also when a
+        page fails; the next sync then resumes the pass from the high-water mark.
+        """
+        with self._sync_lock:
+            return self._sync(page_size, eas)
+
+    def _sync(self, page_size, eas):
+        applied = 0
+        bulk = not self.complete
+        if bulk and self._bulk_started is None:
+            self._bulk_started = int(time.time())
+        try:
+            # gte: more attestations can land in the same second as the high-water mark
+            for att in iter_attestations(self.schema_id, page_size, fields=("decodedDataJson", "timeCreated", "revoked"),
+                                         order="asc", where={"timeCreated": {"gte": self.high_water}}, eas=eas):
+                self.high_water = max(self.high_water, int(att['timeCreated']))
+                if att['fields'] is None or att['revoked']:
+                    continue
+                applied += self.apply_fields(att['fields'], int(att['timeCreated']), att['id'], bulk)
+        finally:
+            if bulk:
+                self.reindex()
+        if bulk:
+            # Rows read in this pass already carry their revoked flag; only revocations since
+            # the pass started matter (with a margin for block time vs. local clock)
+            self.revocation_high_water = max(self.revocation_high_water, self._bulk_started - 300)
+            self.complete = True
+        applied += self._sync_revocations(page_size, eas)
+        self.updated_at = time.time()
+        return applied
+
+    def _sync_revocations(self, page_size=500, eas=None):
+        """Replace users whose current attestation was revoked since the last pass"""
+        changed = 0
+        for att in iter_attestations(self.schema_id, page_size, fields=("decodedDataJson", "revocationTime"), order="asc",
+                                     where={"revoked": {"equals": True}, "revocationTime": {"gte": self.revocation_high_water}},
+                                     eas=eas):
+            self.revocation_high_water = max(self.revocation_high_water, int(att.get('revocationTime') or 0))
+            user_id = to_int((att['fields'] or {}).get("twitterUserId"))
+            entry = self._entries.get(str(user_id))
+            if entry is None or entry["id"] != att['id']:
+                continue
+            self.remove(user_id)
+            # The user's newest attestation that still stands, filtered on the server
+            for newer in iter_attestations(self.schema_id, 50, fields=("decodedDataJson", "timeCreated"),
+                                           where={**uint_value_filter(user_id), "revoked": {"equals": False}}, eas=eas):
+                if newer['fields'] is not None and to_int(newer['fields'].get("twitterUserId")) == user_id:
+                    self.apply_fields(newer['fields'], int(newer['timeCreated']), newer['id'])
+                    break
+            changed += 1
+        return changed
+
+    def load_store(self, store):
+        """Seed the board from a local AttestationStore's latest-per-user view"""
+        applied = 0
+        bulk = not self._entries
+        try:
+            for row in store.current_attestations(self.schema_id):
+                applied += self.apply_fields(decoded_fields(row), row["time_created"], row["id"], bulk)
+        finally:
+            if bulk:
+                self.reindex()
+        # Continue from where the mirror's own sync stopped
+        high_water, revocation_high_water = store.high_water(self.schema_id)
+        self.high_water = max(self.high_water, high_water)
+        self.revocation_high_water = max(self.revocation_high_water, revocation_high_water)
+        self.complete = True
+        self.updated_at = time.time()
+        return applied
+
+    def warm_up(self, page_size=500, eas=None):
+        """Start the first full sync in a background thread unless one is running; returns the thread"""
+        with self._lock:
+            if self._warmup is None or not self._warmup.is_alive():
+                self._warmup = threading.Thread(target=self._warm_up, args=(page_size, eas), daemon=True)
+                self._warmup.start()
+            return self._warmup
+
+    def _warm_up(self, page_size, eas):
+        try:
+            self.sync(page_size, eas)
+            self.last_error = None
+        except Exception as e:
+            # The next warm_up() resumes from the high-water mark
+            self.last_error = str(e)
+            print(f"⚠️ Leaderboard sync failed after {len(self._entries):,} users: {e}")
+
+    def _rank_of(self, points):
+        # Competition ranking: equal points share a rank (1, 2, 2, 4)
+        return bisect.bisect_left(self._index, (-points,)) + 1
+
+    def top(self, limit=100, offset=0):
+        """Entries ranked offset+1 .. offset+limit, with their rank"""
+        with self._lock:
+            return [{"rank": self._rank_of(-key[0]), **self._entries[key[1]]}
+                    for key in self._index[offset:offset + limit]]
+
+    def lookup(self, user):
+        """Entry with rank for a Twitter id or @username, None if not on the board"""
+        with self._lock:
+            user = str(user).strip()
+            user_id = user if user.isdigit() else self._by_name.get(user.lstrip("@").lower())
+            entry = self._entries.get(str(int(user_id))) if user_id else None
+            if entry is None:
+                return None
+            return {"rank": self._rank_of(entry["points"]), "total": len(self._index), **entry}
+
+
+def _loading_response(error):
+    return {"error": str(error), "loading": True}, 503
+
+
+def leaderboard_response(get_board, limit, offset):
+    """(payload, status) for GET /leaderboard; ``get_board`` is only called once the parameters are valid"""
+    try:
+        limit, offset = int(limit), int(offset)
+    except (TypeError, ValueError):
+        return {"error": "limit and offset must be integers"}, 400
+    if limit < 1 or offset < 0:
+        return {"error": "limit must be >= 1 and offset >= 0"}, 400
+    if limit > MAX_LIMIT:
+        return {"error": f"limit too large (max {MAX_LIMIT})"}, 400
+    try:
+        board = get_board()
+    except LeaderboardLoading as e:
+        return _loading_response(e)
+    return {
+        "success": True,
+        "schema": board.schema_id,
+        "field": board.field,
+        "total": len(board),
+        "updated_at": board.updated_at,
+        "entries": board.top(limit, offset),
+    }, 200
+
+
+def rank_response(get_board, user):
+    """(payload, status) for GET /rank/<twitter_id>"""
+    try:
+        board = get_board()
+    except LeaderboardLoading as e:
+        return _loading_response(e)
+    entry = board.lookup(user)
+    if entry is None:
+        return {"error": f"{user} is not on the leaderboard"}, 404
+    return {"success": True, "schema": board.schema_id, "field": board.field, **entry}, 200
+
+
+def refresher(board, db_path=DB_PATH, eas=None):
+    """Loader for a refresh cache: seeds from the local mirror once, then syncs incrementally from EAS.
+
+    A cold board without a mirror raises LeaderboardLoading while its first
+    full sync runs in the background, so no request waits on it.
+    """
+    def refresh():
+        if not board.complete and not board.high_water and os.path.exists(db_path):
+            with AttestationStore(db_path) as store:
+                board.load_store(store)
+        if not board.complete:
+            board.warm_up(eas=eas)
+            message = f"Leaderboard is loading ({len(board._entries):,} users so far), retry shortly"
+            if board.last_error:
+                message += f" (last attempt failed: {board.last_error})"
+            raise LeaderboardLoading(message)
+        board.sync(eas=eas)
+        return board
+    return refresh
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YAPS leaderboard over attestations")
+    parser.add_argument("--schema", default=LEADERBOARD_SCHEMA, help="schema UID (default LEADERBOARD_SCHEMA)")
+    parser.add_argument("--field", default=LEADERBOARD_FIELD, help="points field (default LEADERBOARD_FIELD)")
+    parser.add_argument("--local", action="store_true", help="read from the local attestation mirror instead of EAS")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    top_cmd = commands.add_parser("top", help="top users by points")
+    top_cmd.add_argument("limit", type=int, nargs="?", default=100)
+    rank_cmd = commands.add_parser("rank", help="rank of a Twitter id or @username")
+    rank_cmd.add_argument("user")
+    args = parser.parse_args(argv)
+
+    board = Leaderboard(args.schema, args.field)
+    started = time.monotonic()
+    try:
+        if args.local:
+            with AttestationStore(args.db) as store:
+                board.load_store(store)
+        else:
+            board.sync()
+    except EASError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"🏆 {YAPS_SCHEMAS.get(args.schema, args.schema)}: {len(board):,} users by {args.field} "
+          f"({time.monotonic() - started:.1f}s)")
+
+    if args.command == "top":
+        for entry in board.top(args.limit):
+            print(f"   {entry['rank']:>5}. {entry['twitterUsername'] or entry['twitterUserId']:<24} {entry['points']:>16,}")
+    else:
+        entry = board.lookup(args.user)
+        if entry is None:
+            print(f"❌ {args.user} is not on the leaderboard")
+        else:
+            print(f"🎯 {entry['twitterUsername'] or entry['twitterUserId']}: rank {entry['rank']:,} of {entry['total']:,} "
+                  f"with {entry['points']:,} {args.field}")
+    if not args.local:
+        client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Process-pool analysis for large tweet archives
+
+Input is cut into chunks that are scored with analyze_content_full in
+worker processes. Results come back in input order, and only a bounded
+number of chunks is in flight at once, so the input can be a generator
+of any size.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from content_analysis import analyze_content_full, analysis_scores
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_chunk(contents, scores_only=False):
+    """Score one chunk in the current process; a None content yields None"""
+    if scores_only:
+        return [None if content is None else analysis_scores(analyze_content_full(content)) for content in contents]
+    return [None if content is None else analyze_content_full(content) for content in contents]
+
+
+def iter_analyze_parallel(contents, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, scores_only=False):
+    """Yield one analysis per content, in input order.
+
+    None contents are placeholders: they yield None and keep their place,
+    so callers can stream records that have no text alongside the rest.
+    ``workers`` defaults to os.cpu_count(); with a single worker the
+    chunks are scored in-process. At most ``2 * workers`` chunks are
+    submitted ahead of the consumer.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    if workers == 1:
+        for chunk in _chunks(contents, chunk_size):
+            yield from analyze_chunk(chunk, scores_only)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(contents, chunk_size):
+            pending.append(executor.submit(analyze_chunk, chunk, scores_only))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def analyze_parallel(contents, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, scores_only=False):
+    """List version of iter_analyze_parallel()"""
+    return list(iter_analyze_parallel(contents, workers, chunk_size, scores_only))
@@ -3,85 +3,37 @@
 Query YAPS schemas #525 and #546 from EAS GraphQL API
 """
 
-import requests
 import json
 
-# Base network GraphQL endpoint
-GRAPHQL_URL = "https://base.easscan.org/graphql"
+from eas_client import client, fetch_recent_attestations, GRAPHQL_URL
+from schema_registry import SchemaRegistry
 
-def query_graphql(query, variables=None):
-    """Execute GraphQL query"""
-    payload = {
-        "query": query,
-        "variables": variables or {}
-    }
-    
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.post(GRAPHQL_URL, json=payload, headers=headers)
-    return response.json()
 
-def find_schemas_by_range():
-    """Find schemas by looking at all schemas and filtering by creation order"""
-    query = """
-    query GetAllSchemas {
-      schemata(orderBy: [{ id: asc }], take: 1000) {
-        id
-        schema
-        creator
-        txid
-        time
-        index
-      }
-    }
-    """
+def find_schemas_by_range(registry):
+    """Look up schemas #525 and #546 in the cached schema registry"""
+    print(f"Found {len(registry)} schemas")
     
-    result = query_graphql(query)
-    if 'data' in result and 'schemata' in result['data']:
-        schemas = result['data']['schemata']
-        print(f"Found {len(schemas)} schemas")
-        
-        # Look for schemas around position 525 and 546
-        target_positions = [525, 546]
-        for target in target_positions:
-            if target < len(schemas):
-                schema = schemas[target-1]  # Array is 0-indexed
-                print(f"\n=== Schema #{target} ===")
-                print(f"UID: {schema['id']}")
-                print(f"Schema: {schema['schema']}")
-                print(f"Creator: {schema['creator']}")
-                print(f"Time: {schema['time']}")
-                print(f"TxID: {schema['txid']}")
-    else:
-        print("Error querying schemas:", result)
+    target_positions = [525, 546]
+    for target in target_positions:
+        schema = registry.by_index(target)
+        if schema is None:
+            print(f"\n=== Schema #{target} not registered ===")
+            continue
+        print(f"\n=== Schema #{target} ===")
+        print(f"UID: {schema['id']}")
+        print(f"Schema: {schema['schema']}")
+        print(f"Creator: {schema['creator']}")
+        print(f"Time: {schema['time']}")
+        print(f"TxID: {schema['txid']}")
 
-def query_attestations_by_schema_uid(schema_uid):
-    """Get attestations for a specific schema UID"""
-    query = """
-    query GetAttestationsBySchema($schemaId: String!) {
-      attestations(
-        where: { schemaId: { equals: $schemaId } },
-        take: 10,
-        orderBy: [{ timeCreated: desc }]
-      ) {
-        id
-        attester  
-        recipient
-        data
-        decodedDataJson
-        timeCreated
-        revoked
-      }
-    }
-    """
+def query_attestations_by_schema_uids(schema_uids):
+    """Get attestations for several schema UIDs in one aliased request"""
+    recent = fetch_recent_attestations(schema_uids, take=10)
     
-    variables = {"schemaId": schema_uid}
-    result = query_graphql(query, variables)
-    
-    if 'data' in result and 'attestations' in result['data']:
-        attestations = result['data']['attestations']
+    for schema_uid, attestations in recent.items():
+        if attestations is None:
+            print(f"Error querying attestations for {schema_uid}")
+            continue
         print(f"\n=== Found {len(attestations)} attestations for schema {schema_uid} ===")
         
         for i, attestation in enumerate(attestations[:3]):  # Show first 3
@@ -98,51 +50,33 @@ def query_attestations_by_schema_uid(schema_uid):
                     print(f"  Decoded Data: {json.dumps(decoded, indent=4)}")
                 except json.JSONDecodeError:
                     print(f"  Decoded Data: {attestation['decodedDataJson']}")
-    else:
-        print(f"Error querying attestations for {schema_uid}:", result)
 
-def search_yaps_related():
+def search_yaps_related(registry):
     """Search for YAPS-related schemas by looking at schema descriptions"""
-    query = """
-    query SearchSchemas {
-      schemata(take: 800) {
-        id
-        schema
-        creator
-        index
-      }
-    }
-    """
+    # Look for score, yaps, lifetime, monthly keywords
+    yaps_candidates = registry.search(['score', 'yaps', 'lifetime', 'monthly', 'point', 'rating'])
     
-    result = query_graphql(query)
-    if 'data' in result and 'schemata' in result['data']:
-        schemas = result['data']['schemata']
-        
-        # Look for potential YAPS schemas by checking schema content
-        yaps_candidates = []
-        for i, schema in enumerate(schemas):
-            schema_text = schema['schema'].lower()
-            # Look for score, yaps, lifetime, monthly keywords
-            if any(keyword in schema_text for keyword in ['score', 'yaps', 'lifetime', 'monthly', 'point', 'rating']):
-                yaps_candidates.append((i+1, schema))
-                
-        print(f"\n=== Found {len(yaps_candidates)} potential YAPS-related schemas ===")
-        for pos, schema in yaps_candidates:
-            print(f"\nSchema #{pos} (estimated)")
-            print(f"  UID: {schema['id']}")  
-            print(f"  Schema: {schema['schema']}")
-            print(f"  Creator: {schema['creator']}")
+    print(f"\n=== Found {len(yaps_candidates)} potential YAPS-related schemas ===")
+    for schema in yaps_candidates:
+        print(f"\nSchema #{schema['index']}")
+        print(f"  UID: {schema['id']}")  
+        print(f"  Schema: {schema['schema']}")
+        print(f"  Creator: {schema['creator']}")
 
 if __name__ == "__main__":
     print("=== Querying YAPS Schemas from EAS GraphQL ===")
     print("Endpoint:", GRAPHQL_URL)
     
+    # Schemata come from the local registry cache, refreshed incrementally
+    registry = SchemaRegistry()
+    registry.ensure_fresh()
+    
     # Try multiple approaches
     print("\n1. Searching for YAPS-related schemas by content...")
-    search_yaps_related()
+    search_yaps_related(registry)
     
     print("\n2. Looking at schemas by position...")
-    find_schemas_by_range()
+    find_schemas_by_range(registry)
     
     # Found YAPS schemas - let's query their attestations
     yaps_schema_uids = [
@@ -152,5 +86,6 @@ if __name__ == "__main__":
     ]
     
     print("\n3. Querying YAPS attestations for algorithm analysis...")
-    for uid in yaps_schema_uids:
-        query_attestations_by_schema_uid(uid)
\ No newline at end of file
+    query_attestations_by_schema_uids(yaps_schema_uids)
+    registry.close()
+    client.print_stats()
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
-import requests
 import json
 
-GRAPHQL_URL = "https://base.easscan.org/graphql"
+from eas_client import client, query_graphql
+
 SCHEMA_UID = "0xcb66276cf243e78fad68dd5e633f7bb56814b49ac9a91256615340591577a0e8"
 
 query = """
@@ -18,7 +18,7 @@ query GetAttestations($schemaId: String!) {
 }
 """
 
-result = requests.post(GRAPHQL_URL, json={"query": query, "variables": {"schemaId": SCHEMA_UID}}).json()
+result = query_graphql(query, {"schemaId": SCHEMA_UID})
 
 if 'data' in result and 'attestations' in result['data']:
     attestations = result['data']['attestations']
@@ -50,3 +50,5 @@ if 'data' in result and 'attestations' in result['data']:
         print(f"   Min Points: {min(all_points):,}")
         print(f"   Max Points: {max(all_points):,}")
         print(f"   Avg Points: {int(sum(all_points)/len(all_points)):,}")
+
+client.print_stats()
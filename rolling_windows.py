@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Rolling-window point deltas per user
+
+YAPS scores over rolling 24h, 48h, 7d, 30d, 3m, 6m and 12m windows.
+RollingWindows turns each user's cumulative yapPoints attestations into
+deltas (points gained since the previous attestation) and keeps, per
+user, one time-ordered event buffer with a start pointer and a running
+sum per window. Appending an attestation adds its delta to every sum;
+moving time forward subtracts the events that fall out of a window as
+its pointer passes them. Every event enters and leaves each window once,
+so appends are amortized O(1) and a window query reads a running sum.
+Events older than the largest window are dropped.
+
+The first attestation seen for a user is the baseline (no delta), and
+attestations revoked after they were appended stay counted.
+
+    python rolling_windows.py 1422186185196113922
+    python rolling_windows.py --top 7d --local
+"""
+
+import argparse
+import sys
+import time
+
+from eas_client import client, iter_attestations, EASError
+from attestation_store import AttestationStore, DB_PATH, YAPS_SCHEMAS, decoded_fields
+from schema_decoder import to_int
+from streaming_stats import numeric
+from leaderboard import LEADERBOARD_SCHEMA, LEADERBOARD_FIELD
+
+DAY = 86400
+WINDOWS = {
+    "24h": DAY,
+    "48h": 2 * DAY,
+    "7d": 7 * DAY,
+    "30d": 30 * DAY,
+    "3m": 90 * DAY,
+    "6m": 180 * DAY,
+    "12m": 365 * DAY,
+}
+
+
+class _UserSeries:
+    __slots__ = ("times", "deltas", "base", "starts", "sums", "now", "last_key", "last_points")
+
+    def __init__(self, n_windows):
+        self.times = []
+        self.deltas = []
+        self.base = 0               # absolute index of times[0]
+        self.starts = [0] * n_windows
+        self.sums = [0] * n_windows
+        self.now = 0
+        self.last_key = None
+        self.last_points = None
+
+
+class RollingWindows:
+    """Per-user point deltas over fixed rolling windows, maintained incrementally"""
+
+    def __init__(self, windows=WINDOWS):
+        self.names = list(windows)
+        self.spans = [windows[name] for name in self.names]
+        self._slot = {name: i for i, name in enumerate(self.names)}
+        self._users = {}
+        self.appended = 0
+        self.out_of_order = 0
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, user_id):
+        return str(user_id) in self._users
+
+    def append(self, user_id, points, timestamp, attestation_id=None):
+        """Add a cumulative-points observation; returns the delta, None for a baseline or out-of-order row"""
+        series = self._users.get(str(user_id))
+        if series is None:
+            series = self._users[str(user_id)] = _UserSeries(len(self.spans))
+        key = (timestamp, attestation_id or "")
+        if series.last_key is not None and key <= series.last_key:
+            # Re-read of a row already seen, or history arriving late: deltas only run forward
+            if key < series.last_key:
+                self.out_of_order += 1
+            return None
+        series.last_key = key
+        previous, series.last_points = series.last_points, points
+        self._advance(series, timestamp)
+        if previous is None:
+            return None
+        delta = points - previous
+        series.times.append(timestamp)
+        series.deltas.append(delta)
+        for i, span in enumerate(self.spans):
+            if timestamp > series.now - span:
+                series.sums[i] += delta
+            else:
+                # Already outside this window (a query moved the clock past it); every
+                # earlier event has left the window too, so the pointer just skips it
+                series.starts[i] += 1
+        self.appended += 1
+        return delta
+
+    def _advance(self, series, now):
+        """Move every window of a user to end at ``now`` (never backwards)"""
+        if now <= series.now:
+            return
+        series.now = now
+        times, deltas, base = series.times, series.deltas, series.base
+        end = base + len(times)
+        for i, span in enumerate(self.spans):
+            start, cutoff = series.starts[i], now - span
+            while start < end and times[start - base] <= cutoff:
+                series.sums[i] -= deltas[start - base]
+                start += 1
+            series.starts[i] = start
+        # Drop events every window has passed, in batches to keep this amortized O(1)
+        dropped = min(series.starts) - base
+        if dropped and dropped * 2 >= len(times):
+            del times[:dropped], deltas[:dropped]
+            series.base += dropped
+
+    def window(self, user_id, name, now=None):
+        """Points gained by a user in the window ending at ``now`` (default: the user's latest attestation)"""
+        series = self._users.get(str(user_id))
+        if series is None:
+            return None
+        if now is not None:
+            self._advance(series, now)
+        return series.sums[self._slot[name]]
+
+    def user_windows(self, user_id, now=None):
+        """{window name: points gained} for one user, None if unknown"""
+        series = self._users.get(str(user_id))
+        if series is None:
+            return None
+        if now is not None:
+            self._advance(series, now)
+        return dict(zip(self.names, series.sums))
+
+    def top(self, name, limit=10, now=None):
+        """[(user_id, points gained)] with the largest gains in a window"""
+        slot = self._slot[name]
+        totals = []
+        for user_id, series in self._users.items():
+            if now is not None:
+                self._advance(series, now)
+            totals.append((series.sums[slot], user_id))
+        totals.sort(reverse=True)
+        return [(user_id, gained) for gained, user_id in totals[:limit]]
+
+    def append_fields(self, fields, timestamp, attestation_id=None, field=LEADERBOARD_FIELD):
+        """append() from a decoded name -> value mapping"""
+        user_id = to_int(fields.get("twitterUserId"))
+        points = numeric(fields.get(field))
+        if user_id is None or points is None:
+            return None
+        return self.append(user_id, points, timestamp, attestation_id)
+
+
+def feed_store(windows, store, schema_id, field=LEADERBOARD_FIELD):
+    """Append a schema's non-revoked history from the local mirror, oldest first; returns rows read"""
+    rows = store.db.execute("SELECT id, time_created, decoded_json FROM attestations WHERE schema_id = ? AND revoked = 0 "
+                            "ORDER BY time_created, id", (schema_id,))
+    count = 0
+    for row in rows:
+        windows.append_fields(decoded_fields(row), row["time_created"], row["id"], field)
+        count += 1
+    return count
+
+
+def feed_eas(windows, schema_id, since=0, field=LEADERBOARD_FIELD):
+    """Append a schema's attestations created at or after ``since`` from EAS; returns the new high-water mark"""
+    high_water = since
+    for att in iter_attestations(schema_id, fields=("decodedDataJson", "timeCreated", "revoked"), order="asc",
+                                 where={"timeCreated": {"gte": since}}):
+        high_water = max(high_water, int(att['timeCreated']))
+        if att['fields'] is not None and not att['revoked']:
+            windows.append_fields(att['fields'], int(att['timeCreated']), att['id'], field)
+    return high_water
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling-window YAPS point deltas per user")
+    parser.add_argument("user", nargs="?", help="Twitter user id to show")
+    parser.add_argument("--top", choices=list(WINDOWS), help="show the biggest gainers in a window")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--schema", default=LEADERBOARD_SCHEMA, help="schema UID (default LEADERBOARD_SCHEMA)")
+    parser.add_argument("--field", default=LEADERBOARD_FIELD, help="cumulative points field (default LEADERBOARD_FIELD)")
+    parser.add_argument("--local", action="store_true", help="read from the local attestation mirror instead of EAS")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    args = parser.parse_args(argv)
+    if not args.user and not args.top:
+        parser.error("give a user id and/or --top WINDOW")
+
+    windows = RollingWindows()
+    started = time.monotonic()
+    try:
+        if args.local:
+            with AttestationStore(args.db) as store:
+                feed_store(windows, store, args.schema, args.field)
+        else:
+            feed_eas(windows, args.schema, field=args.field)
+    except EASError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    now = int(time.time())
+    print(f"⏱️  {YAPS_SCHEMAS.get(args.schema, args.schema)}: {windows.appended:,} {args.field} deltas for "
+          f"{len(windows):,} users ({time.monotonic() - started:.1f}s)")
+
+    if args.user:
+        gained = windows.user_windows(args.user, now)
+        if gained is None:
+            print(f"❌ No attestations for {args.user}")
+        else:
+            print(f"\n📈 {args.user}:")
+            for name, points in gained.items():
+                print(f"   {name:>4}: {points:>+16,}")
+    if args.top:
+        print(f"\n🏆 Top gainers, last {args.top}:")
+        for rank, (user_id, points) in enumerate(windows.top(args.top, args.limit, now), 1):
+            print(f"   {rank:>3}. {user_id:<22} {points:>+16,}")
+    if not args.local:
+        client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
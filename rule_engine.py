@@ -0,0 +1,541 @@
+"""
+Declarative scoring rule engine
+
+A scoring profile is plain data (see scoring_rules.json): term sets,
+regexes, derived signals, scores built from weighted rules, threshold
+bands, messages and an output template. compile_profiles() turns each
+profile into a CompiledProfile whose evaluate() is one Python function
+generated at load time:
+
+- the text is lowercased once and every term of the deduplicated
+  vocabulary (all term sets together, about 45 terms for kaito_full) is
+  looked up with its own ``in`` substring scan, filtered at C level, after
+  which each term set's value is the number of its terms found. One
+  combined lookahead regex over the vocabulary would be a single pass,
+  but it measured about 2x slower than these scans in CPython;
+- regexes run once each on the original text;
+- conditions such as ``"length >= 150 and length <= 280"``, scores,
+  messages and the output template become straight-line code over local
+  variables, never interpreted per request.
+
+RulesFile keeps the compiled profiles of a rules file current: edits to
+the file are picked up without restarting the workers.
+
+Term matching is case-insensitive substring matching, exactly like the
+``term in content.lower()`` checks it replaces.
+"""
+
+import json
+import logging
+import os
+import re
+import string
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class RuleError(ValueError):
+    """Raised when a scoring profile is invalid"""
+
+
+DECIMAL_RE = re.compile(r'\d')
+
+
+def has_digit(content):
+    """Same result as any(char.isdigit() for char in content), without the Python loop"""
+    if DECIMAL_RE.search(content):
+        return True
+    # str.isdigit() also accepts non-decimal digits such as superscripts
+    return not content.isascii() and any(map(str.isdigit, content))
+
+
+BUILTIN_FEATURES = ("length", "words", "digit")
+
+_NAME_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+_KEYWORDS = {"and", "or", "not"}
+
+# ---------------------------------------------------------------------------
+# Conditions
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\s*(?:(>=|<=|==|!=|>|<)|(\()|(\))|(-?\d+(?:\.\d+)?)|([A-Za-z_][A-Za-z0-9_]*))')
+_COMPARISONS = {">=", "<=", "==", "!=", ">", "<"}
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise RuleError(f"Unexpected character in condition {text!r} at {pos}")
+        tokens.append(next(t for t in match.groups() if t is not None))
+        pos = match.end()
+    return tokens
+
+
+def condition_source(text, names, vectorized=False):
+    """Translate a condition into a Python expression over ``v_<name>`` locals.
+
+    Grammar: ``or``/``and``/``not``, parentheses, and comparisons of a
+    name against a number. A bare name is true when its value is truthy
+    (for term sets: at least one term found). With ``vectorized`` the
+    expression works elementwise on NumPy arrays (``&``, ``|``, ``~``).
+    """
+    op_or, op_and = (" | ", " & ") if vectorized else (" or ", " and ")
+    if not isinstance(text, str) or not text.strip():
+        raise RuleError(f"Condition must be a non-empty string, got {text!r}")
+    tokens = _tokenize(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        token = peek()
+        if token is None:
+            raise RuleError(f"Unexpected end of condition {text!r}")
+        pos += 1
+        return token
+
+    def parse_or():
+        parts = [parse_and()]
+        while peek() == "or":
+            take()
+            parts.append(parse_and())
+        return parts[0] if len(parts) == 1 else "(" + op_or.join(parts) + ")"
+
+    def parse_and():
+        parts = [parse_not()]
+        while peek() == "and":
+            take()
+            parts.append(parse_not())
+        return parts[0] if len(parts) == 1 else "(" + op_and.join(parts) + ")"
+
+    def parse_not():
+        if peek() == "not":
+            take()
+            return f"(~{parse_not()})" if vectorized else f"(not {parse_not()})"
+        return parse_comparison()
+
+    def parse_comparison():
+        token = take()
+        if token == "(":
+            inner = parse_or()
+            if take() != ")":
+                raise RuleError(f"Missing ')' in condition {text!r}")
+            return inner
+        if token in _KEYWORDS or token not in names:
+            raise RuleError(f"Unknown name {token!r} in condition {text!r}")
+        if peek() in _COMPARISONS:
+            op = take()
+            number = take()
+            try:
+                float(number)
+            except ValueError:
+                raise RuleError(f"Expected a number after {op!r} in condition {text!r}") from None
+            return f"(v_{token} {op} {number})"
+        return f"(v_{token} != 0)" if vectorized else f"v_{token}"
+
+    source = parse_or()
+    if pos != len(tokens):
+        raise RuleError(f"Unexpected {tokens[pos]!r} in condition {text!r}")
+    return source
+
+
+def _number(value, what):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RuleError(f"{what} must be a number, got {value!r}")
+    return repr(value)
+
+
+# ---------------------------------------------------------------------------
+# Code generation
+# ---------------------------------------------------------------------------
+
+class _Generator:
+    """Collects the body of one profile's evaluate(content) function"""
+
+    def __init__(self, profile_name):
+        self.profile_name = profile_name
+        self.names = set(BUILTIN_FEATURES)
+        self.lists = set()
+        self.lines = []
+
+    def error(self, message):
+        return RuleError(f"{self.profile_name}: {message}")
+
+    def define(self, name, what):
+        if not isinstance(name, str) or not _NAME_RE.match(name) or name in _KEYWORDS:
+            raise self.error(f"invalid {what} name {name!r}")
+        if name in self.names:
+            raise self.error(f"{name!r} is defined twice")
+        self.names.add(name)
+
+    def expect(self, value, kind, what):
+        """``value`` itself if it is a ``kind`` (dict or list), else RuleError"""
+        if not isinstance(value, kind):
+            raise self.error(f"{what} must be {'an object' if kind is dict else 'a list'}, got {value!r}")
+        return value
+
+    def pairs(self, value, what, shape):
+        """``value`` itself if it is a list of two-item lists, else RuleError"""
+        for pair in self.expect(value, list, what):
+            if not isinstance(pair, list) or len(pair) != 2:
+                raise self.error(f"{what} must hold {shape} pairs, got {pair!r}")
+        return value
+
+    def emit(self, line, indent=1):
+        self.lines.append("    " * indent + line)
+
+    def condition(self, text):
+        try:
+            return condition_source(text, self.names)
+        except RuleError as e:
+            raise self.error(str(e)) from None
+
+    def template(self, node):
+        """Python expression that renders an output template node"""
+        if isinstance(node, dict):
+            if "$value" in node:
+                name = node["$value"]
+                if not isinstance(name, str) or name not in self.names:
+                    raise self.error(f"unknown name {name!r} in template")
+                return f"v_{name}"
+            if "$format" in node:
+                fmt = node["$format"]
+                if not isinstance(fmt, str):
+                    raise self.error(f"$format needs a string, got {fmt!r}")
+                try:
+                    fields = [field for _, field, _, _ in string.Formatter().parse(fmt) if field is not None]
+                except ValueError as e:
+                    raise self.error(f"invalid format {fmt!r}: {e}") from None
+                for field in fields:
+                    if field not in self.names:
+                        raise self.error(f"unknown name {field!r} in format {fmt!r}")
+                mapping = ", ".join(f"{field!r}: v_{field}" for field in dict.fromkeys(fields))
+                return f"{fmt!r}.format_map({{{mapping}}})"
+            if "$if" in node:
+                then = self.template(node.get("then", ""))
+                other = self.template(node.get("else", ""))
+                return f"({then} if {self.condition(node['$if'])} else {other})"
+            if "$concat" in node:
+                parts = [self.template(part) for part in self.expect(node["$concat"], list, "$concat")]
+                return "(" + " + ".join(parts) + ")" if parts else "''"
+            if "$list" in node:
+                name = node["$list"]
+                if not isinstance(name, str) or name not in self.lists:
+                    raise self.error(f"unknown message list {name!r} in template")
+                default = self.template(self.expect(node.get("default", []), list, "$list default"))
+                return f"(l_{name} if l_{name} else {default})"
+            items = ", ".join(f"{key!r}: {self.template(value)}" for key, value in node.items())
+            return "{" + items + "}"
+        if isinstance(node, list):
+            return "[" + ", ".join(self.template(value) for value in node) + "]"
+        if isinstance(node, (str, int, float, bool)) or node is None:
+            return repr(node)
+        raise self.error(f"unsupported template node {node!r}")
+
+    def rule(self, rule, with_points=False):
+        """if/else block that appends messages (and adds points inside a score)"""
+        if not isinstance(rule, dict):
+            raise self.error(f"rule must be an object, got {rule!r}")
+        list_name = rule.get("list")
+        if ("message" in rule or "else_message" in rule) and (not isinstance(list_name, str) or list_name not in self.lists):
+            raise self.error(f"message rule needs a declared list, got {list_name!r}")
+        then, other = [], []
+        if with_points:
+            if rule.get("points", 0):
+                then.append(f"score += {_number(rule['points'], 'points')}")
+            if rule.get("else_points", 0):
+                other.append(f"score += {_number(rule['else_points'], 'else_points')}")
+        if "message" in rule:
+            then.append(f"l_{list_name}.append({self.template(rule['message'])})")
+        if "else_message" in rule:
+            other.append(f"l_{list_name}.append({self.template(rule['else_message'])})")
+        if not then and not other:
+            return
+        self.emit(f"if {self.condition(rule['when']) if 'when' in rule else 'True'}:")
+        for line in then or ["pass"]:
+            self.emit(line, 2)
+        if other:
+            self.emit("else:")
+            for line in other:
+                self.emit(line, 2)
+
+    def score(self, score):
+        if not isinstance(score, dict):
+            raise self.error(f"score must be an object, got {score!r}")
+        name = score.get("name")
+        if "rules" in score:
+            self.emit("score = 0")
+            for rule in self.expect(score["rules"], list, f"score {name!r} rules"):
+                self.rule(rule, with_points=True)
+            if score.get("max") is not None:
+                self.emit(f"score = min({_number(score['max'], 'max')}, score)")
+            if score.get("min") is not None:
+                self.emit(f"score = max({_number(score['min'], 'min')}, score)")
+            value = "score"
+        elif "weights" in score:
+            value = "0"
+            for source, weight in self.pairs(score["weights"], f"score {name!r} weights", "[name, weight]"):
+                if not isinstance(source, str) or source not in self.names:
+                    raise self.error(f"score {name!r} weights unknown name {source!r}")
+                term = f"(v_{source} * {_number(weight, 'weight')})"
+                value = term if value == "0" else f"({value} + {term})"
+            if score.get("round") is not None:
+                if isinstance(score["round"], bool) or not isinstance(score["round"], int):
+                    raise self.error(f"score {name!r} round must be an integer, got {score['round']!r}")
+                value = f"round({value}, {score['round']})"
+        elif "from" in score:
+            source = score["from"]
+            if not isinstance(source, str) or source not in self.names:
+                raise self.error(f"score {name!r} reads unknown name {source!r}")
+            value = f"v_{source}"
+            for factor in self.expect(score.get("multiply", []), list, f"score {name!r} multiply"):
+                value = f"({value} * {_number(factor, 'factor')})"
+            if score.get("truncate"):
+                value = f"int({value})"
+        else:
+            raise self.error(f"score {name!r} needs rules, weights or from")
+        self.define(name, "score")
+        self.emit(f"v_{name} = {value}")
+
+    def band(self, name, band):
+        self.expect(band, dict, f"band {name!r}")
+        source = band.get("from")
+        if not isinstance(source, str) or source not in self.names:
+            raise self.error(f"band {name!r} reads unknown name {source!r}")
+        value = repr(band.get("default", ""))
+        for threshold, label in reversed(self.pairs(band.get("thresholds", []), f"band {name!r} thresholds", "[threshold, label]")):
+            value = f"({label!r} if v_{source} >= {_number(threshold, 'threshold')} else {value})"
+        self.define(name, "band")
+        self.emit(f"v_{name} = {value}")
+
+
+# ---------------------------------------------------------------------------
+# Profiles
+# ---------------------------------------------------------------------------
+
+class CompiledProfile:
+    """A scoring profile compiled into one generated evaluate(content) function"""
+
+    def __init__(self, name, spec):
+        if not isinstance(spec, dict):
+            raise RuleError(f"{name}: profile must be an object")
+        self.name = name
+        self.spec = spec
+        gen = _Generator(name)
+        namespace = {"has_digit": has_digit}
+
+        self.terms = {}
+        for set_name, terms in gen.expect(spec.get("terms", {}), dict, "terms").items():
+            if not isinstance(terms, list) or not all(isinstance(t, str) and t for t in terms):
+                raise RuleError(f"{name}: term set {set_name!r} must be a list of non-empty strings")
+            gen.define(set_name, "term set")
+            self.terms[set_name] = namespace[f"T_{set_name}"] = frozenset(t.lower() for t in terms)
+        self.vocabulary = namespace["VOCABULARY"] = tuple(sorted(frozenset().union(*self.terms.values())))
+
+        self.patterns = {}
+        for pattern_name, pattern in gen.expect(spec.get("patterns", {}), dict, "patterns").items():
+            gen.define(pattern_name, "pattern")
+            try:
+                self.patterns[pattern_name] = re.compile(pattern)
+            except (re.error, TypeError) as e:
+                raise RuleError(f"{name}: invalid regex {pattern_name!r}: {e}") from None
+            namespace[f"P_{pattern_name}"] = self.patterns[pattern_name].search
+
+        occurrences = gen.expect(spec.get("occurrences", {}), dict, "occurrences")
+        for occurrence_name, literal in occurrences.items():
+            gen.define(occurrence_name, "occurrence")
+            if not isinstance(literal, str) or not literal:
+                raise RuleError(f"{name}: occurrence {occurrence_name!r} must be a non-empty string")
+
+        for list_name in gen.expect(spec.get("lists", []), list, "lists"):
+            if not isinstance(list_name, str) or not _NAME_RE.match(list_name):
+                raise RuleError(f"{name}: invalid list name {list_name!r}")
+            gen.lists.add(list_name)
+
+        gen.emit("content_lower = content.lower()")
+        gen.emit("found = frozenset(filter(content_lower.__contains__, VOCABULARY))")
+        gen.emit("v_length = len(content)")
+        gen.emit("v_words = len(content.split())")
+        gen.emit("v_digit = has_digit(content)")
+        for set_name, terms in self.terms.items():
+            if not terms:
+                gen.emit(f"v_{set_name} = 0")
+            elif len(terms) == 1:
+                gen.emit(f"v_{set_name} = 1 if {next(iter(terms))!r} in found else 0")
+            else:
+                gen.emit(f"v_{set_name} = len(found & T_{set_name})")
+        for pattern_name in self.patterns:
+            gen.emit(f"v_{pattern_name} = P_{pattern_name}(content) is not None")
+        for occurrence_name, literal in occurrences.items():
+            gen.emit(f"v_{occurrence_name} = content.count({literal!r})")
+
+        for signal_name, condition in gen.expect(spec.get("signals", {}), dict, "signals").items():
+            test = gen.condition(condition)
+            gen.define(signal_name, "signal")
+            gen.emit(f"v_{signal_name} = True if {test} else False")
+
+        for list_name in sorted(gen.lists):
+            gen.emit(f"l_{list_name} = []")
+        for score in gen.expect(spec.get("scores", []), list, "scores"):
+            gen.score(score)
+        for band_name, band in gen.expect(spec.get("bands", {}), dict, "bands").items():
+            gen.band(band_name, band)
+        for rule in gen.expect(spec.get("messages", []), list, "messages"):
+            gen.rule(rule)
+
+        if "output" not in spec:
+            raise RuleError(f"{name}: missing output template")
+        gen.emit(f"return {gen.template(spec['output'])}")
+
+        self.names = frozenset(gen.names)
+        self.source = "def evaluate(content):\n" + "\n".join(gen.lines) + "\n"
+        exec(compile(self.source, f"<scoring profile {name}>", "exec"), namespace)
+        self.evaluate = namespace["evaluate"]
+
+
+def _merge_profile(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if key == "extends":
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict) and key != "output":
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def compile_profiles(config):
+    """Compile every profile of a rules config; ``extends`` overrides a base profile key by key"""
+    if not isinstance(config, dict) or not isinstance(config.get("profiles"), dict):
+        raise RuleError("Rules config must be an object with a 'profiles' object")
+    specs = config["profiles"]
+    resolved = {}
+
+    def resolve(profile_name, chain=()):
+        if profile_name in resolved:
+            return resolved[profile_name]
+        if profile_name in chain:
+            raise RuleError(f"Circular extends: {' -> '.join(chain + (profile_name,))}")
+        if profile_name not in specs:
+            raise RuleError(f"Unknown profile {profile_name!r}")
+        spec = specs[profile_name]
+        if isinstance(spec, dict) and "extends" in spec:
+            spec = _merge_profile(resolve(spec["extends"], chain + (profile_name,)), spec)
+        resolved[profile_name] = spec
+        return spec
+
+    return {profile_name: CompiledProfile(profile_name, resolve(profile_name)) for profile_name in specs}
+
+
+def load_profiles(path):
+    """Read and compile a rules config file"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            config = json.load(f)
+        except ValueError as e:
+            raise RuleError(f"{path}: invalid JSON: {e}") from None
+    return compile_profiles(config)
+
+
+class RulesFile:
+    """Compiled profiles of a rules file, recompiled when the file changes.
+
+    current() stats the file at most every ``check_interval`` seconds. A
+    changed file is loaded, validated and compiled by one thread while the
+    others keep using the current profiles; the new set then replaces the
+    old one in a single assignment, so requests that already hold a
+    profile finish on the ruleset they started with. An invalid file is
+    reported and the previous rules stay active until the next change.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = self._stat()
+        self._current = (1, load_profiles(path))
+        self._next_check = time.monotonic() + check_interval
+        self.loaded_at = time.time()
+        self.reloads = 0
+        self.errors = 0
+        self.last_error = None
+
+    def current(self):
+        """(version, profiles) of the active ruleset; the version changes on every reload"""
+        if time.monotonic() >= self._next_check:
+            self._check()
+        return self._current
+
+    def profiles(self):
+        return self.current()[1]
+
+    def reload(self):
+        """Recompile now; returns True when the new rules were swapped in"""
+        with self._lock:
+            return self._reload(self._stat())
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "version": self._current[0],
+            "profiles": sorted(self._current[1]),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "check_interval": self.check_interval,
+        }
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _check(self):
+        # Whoever gets the lock checks the file; everyone else carries on with the current rules
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            try:
+                signature = self._stat()
+            except OSError as e:
+                self._failed(e)
+                return
+            if signature != self._signature:
+                self._reload(signature)
+        finally:
+            self._lock.release()
+
+    def _reload(self, signature):
+        # Remember the signature even on failure so a broken file is compiled once, not per check
+        self._signature = signature
+        try:
+            profiles = load_profiles(self.path)
+        except Exception as e:
+            # A shape the validation does not catch is still a bad rules file, not a failed request
+            self._failed(e if isinstance(e, (OSError, RuleError)) else f"{type(e).__name__}: {e}")
+            return False
+        self._current = (self._current[0] + 1, profiles)
+        self.loaded_at = time.time()
+        self.reloads += 1
+        self.last_error = None
+        logger.info("Scoring rules reloaded from %s (version %d)", self.path, self._current[0])
+        return True
+
+    def _failed(self, error):
+        self.errors += 1
+        self.last_error = str(error)
+        logger.warning("Scoring rules not reloaded, keeping version %d: %s", self._current[0], error)
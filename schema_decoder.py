@@ -0,0 +1,178 @@
+"""
+Compiled decoders for EAS schema strings
+
+decoder_for("uint64 twitterUserId, string twitterUsername, uint64 yapPoints,
+uint64 timestamp") parses the schema once and returns a SchemaDecoder
+whose records are namedtuples with one typed value per schema field, in
+schema order. Values are read by position, so there is no per-field name
+matching and no dict per attestation.
+
+A record can be built from decodedDataJson, or straight from the
+ABI-encoded ``data`` hex, which skips JSON entirely. ABI decoding covers
+elementary types (uintN/intN, bool, address, bytesN, string, bytes) and
+one-dimensional arrays of static ones. Other schemas fall back to JSON.
+"""
+
+import json
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+_FIELD_RE = re.compile(r'\s*([a-z]+\d*(?:\[\d*\])*)\s+([A-Za-z_$][\w$]*)\s*\Z')
+_INT_RE = re.compile(r'(u?)int(\d*)\Z')
+_BYTES_N_RE = re.compile(r'bytes(\d+)\Z')
+_ARRAY_RE = re.compile(r'(.+)\[\]\Z')
+
+
+def to_int(value):
+    """Decoded uint value (int, decimal/hex string or ethers BigNumber dict) as int, None if not numeric"""
+    if isinstance(value, dict):
+        value = value.get("hex", value.get("value"))
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value, 16) if value[:2].lower() == "0x" else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _json_converter(abi_type):
+    """Turn a decodedDataJson value of ``abi_type`` into a Python value"""
+    if _INT_RE.match(abi_type):
+        return to_int
+    if abi_type == "bool":
+        return lambda value: value if isinstance(value, bool) else str(value).lower() == "true"
+    if abi_type == "address" or _BYTES_N_RE.match(abi_type) or abi_type == "bytes":
+        return lambda value: value.lower() if isinstance(value, str) else value
+    array = _ARRAY_RE.match(abi_type)
+    if array:
+        inner = _json_converter(array.group(1))
+        return lambda value: [inner(item) for item in value] if isinstance(value, list) else value
+    return lambda value: value
+
+
+def _static_reader(abi_type):
+    """Reader for one 32-byte ABI word of a static elementary type, None if unsupported"""
+    integer = _INT_RE.match(abi_type)
+    if integer:
+        signed = not integer.group(1)
+        return lambda word: int.from_bytes(word, "big", signed=signed)
+    if abi_type == "bool":
+        return lambda word: word[-1] == 1
+    if abi_type == "address":
+        return lambda word: "0x" + word[12:].hex()
+    size = _BYTES_N_RE.match(abi_type)
+    if size and 1 <= int(size.group(1)) <= 32:
+        n = int(size.group(1))
+        return lambda word: "0x" + word[:n].hex()
+    return None
+
+
+def _dynamic_reader(abi_type):
+    """Reader(data, offset) for a dynamic type, None if unsupported"""
+    if abi_type in ("string", "bytes"):
+        text = abi_type == "string"
+
+        def read(data, offset):
+            length = int.from_bytes(data[offset:offset + 32], "big")
+            raw = data[offset + 32:offset + 32 + length]
+            return raw.decode("utf-8", "replace") if text else "0x" + raw.hex()
+        return read
+    array = _ARRAY_RE.match(abi_type)
+    if array:
+        inner = _static_reader(array.group(1))
+        if inner is None:
+            return None
+
+        def read(data, offset):
+            length = int.from_bytes(data[offset:offset + 32], "big")
+            start = offset + 32
+            return [inner(data[start + 32 * i:start + 32 * i + 32]) for i in range(length)]
+        return read
+    return None
+
+
+class SchemaDecoder:
+    """Decoder compiled from one EAS schema string"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.types = []
+        names = []
+        for part in schema.split(","):
+            match = _FIELD_RE.match(part)
+            if not match:
+                raise ValueError(f"Unsupported schema field {part.strip()!r} in {schema!r}")
+            self.types.append(match.group(1))
+            names.append(match.group(2))
+        self.names = tuple(names)
+        self.Record = namedtuple("Record", names, rename=True)
+        self._json_converters = [_json_converter(t) for t in self.types]
+
+        readers = []
+        for abi_type in self.types:
+            static = _static_reader(abi_type)
+            if static is not None:
+                readers.append((False, static))
+                continue
+            dynamic = _dynamic_reader(abi_type)
+            if dynamic is None:
+                readers = None
+                break
+            readers.append((True, dynamic))
+        self._abi_readers = readers
+
+    @property
+    def can_decode_data(self):
+        return self._abi_readers is not None
+
+    def from_json(self, decoded_data_json):
+        """Record from decodedDataJson (string or already parsed list)"""
+        fields = json.loads(decoded_data_json) if isinstance(decoded_data_json, str) else decoded_data_json
+        if len(fields) != len(self.types):
+            raise ValueError(f"Expected {len(self.types)} fields for {self.schema!r}, got {len(fields)}")
+        values = []
+        for convert, field in zip(self._json_converters, fields):
+            value = field['value']
+            if isinstance(value, dict) and 'value' in value:
+                value = value['value']
+            values.append(convert(value))
+        return self.Record._make(values)
+
+    def from_data(self, data_hex):
+        """Record from the ABI-encoded ``data`` hex of an attestation"""
+        if self._abi_readers is None:
+            raise ValueError(f"ABI decoding not supported for {self.schema!r}")
+        data = bytes.fromhex(data_hex[2:] if data_hex[:2].lower() == "0x" else data_hex)
+        if len(data) < 32 * len(self._abi_readers):
+            raise ValueError(f"data is {len(data)} bytes, expected at least {32 * len(self._abi_readers)}")
+        values = []
+        for i, (dynamic, read) in enumerate(self._abi_readers):
+            word = data[32 * i:32 * i + 32]
+            values.append(read(data, int.from_bytes(word, "big")) if dynamic else read(word))
+        return self.Record._make(values)
+
+    def decode(self, att):
+        """Record for an attestation dict: from ``data`` when possible, else decodedDataJson; None if neither decodes"""
+        data_hex = att.get('data')
+        if self._abi_readers is not None and data_hex and data_hex != "0x":
+            try:
+                return self.from_data(data_hex)
+            except ValueError:
+                pass
+        if att.get('decodedDataJson'):
+            try:
+                return self.from_json(att['decodedDataJson'])
+            except (ValueError, KeyError, TypeError):
+                pass
+        return None
+
+
+@lru_cache(maxsize=128)
+def decoder_for(schema):
+    """Compiled decoder for a schema string, built once per distinct schema"""
+    return SchemaDecoder(schema)
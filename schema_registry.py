@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Local cache of the EAS schema registry
+
+Schemata are stored in the same SQLite file as attestation_store.py and
+kept in memory keyed by UID and by index (the "#517" number shown on
+easscan). refresh() only fetches schemata registered at or after the
+newest one already cached, so after the first run a refresh is one
+small request. A lookup that misses refreshes once before giving up
+(at most once a minute).
+
+    python schema_registry.py refresh
+    python schema_registry.py show 517 546 0x30c2...
+    python schema_registry.py search yap scaled
+
+Configuration (environment):
+- SCHEMA_REGISTRY_TTL: seconds before lookups refresh the cache (default 3600)
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from eas_client import client, EASError
+from attestation_store import DB_PATH
+
+REGISTRY_TTL = float(os.getenv('SCHEMA_REGISTRY_TTL', '3600'))
+PAGE_SIZE = 500
+# A lookup miss refreshes at most this often (seconds)
+MISS_REFRESH_INTERVAL = 60
+SCHEMA_FIELDS = ("id", "schema", "creator", "resolver", "revocable", "index", "txid", "time")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS schemata (
+    id TEXT PRIMARY KEY,
+    schema_index INTEGER,
+    schema TEXT NOT NULL,
+    creator TEXT,
+    resolver TEXT,
+    revocable INTEGER,
+    txid TEXT,
+    time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schemata_index ON schemata (schema_index);
+CREATE INDEX IF NOT EXISTS idx_schemata_time ON schemata (time);
+CREATE TABLE IF NOT EXISTS schema_registry_state (
+    key TEXT PRIMARY KEY,
+    value REAL
+);
+"""
+
+
+def parse_ref(ref):
+    """'#517', '517' or 517 -> ('index', 517); '0x..' -> ('uid', '0x..')"""
+    if isinstance(ref, int):
+        return "index", ref
+    ref = ref.strip()
+    if ref.lower().startswith("0x"):
+        return "uid", ref.lower()
+    return "index", int(ref.lstrip("#"))
+
+
+def iter_schema_pages(since=0, page_size=PAGE_SIZE, eas=None):
+    """Yield schemata registered at or after ``since`` (unix time), oldest first, one page at a time"""
+    eas = eas or client
+    query = f"""
+    query SchemaPage($where: SchemaWhereInput, $take: Int!, $skip: Int, $cursor: SchemaWhereUniqueInput) {{
+      schemata(
+        where: $where,
+        take: $take,
+        skip: $skip,
+        cursor: $cursor,
+        orderBy: [{{ time: asc }}, {{ id: asc }}]
+      ) {{
+        {" ".join(SCHEMA_FIELDS)}
+      }}
+    }}
+    """
+    variables = {"where": {"time": {"gte": since}}, "take": page_size}
+    while True:
+        result = eas.query(query, variables)
+        if 'data' not in result or not result['data'] or 'schemata' not in result['data']:
+            raise EASError(f"SchemaPage: {result.get('errors', result)}")
+        page = result['data']['schemata']
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        variables["cursor"] = {"id": page[-1]['id']}
+        variables["skip"] = 1
+
+
+def _schema_row(schema):
+    index = schema.get("index")
+    return {
+        "id": schema["id"].lower(),
+        "schema_index": int(index) if index not in (None, "") else None,
+        "schema": schema["schema"],
+        "creator": schema.get("creator"),
+        "resolver": schema.get("resolver"),
+        "revocable": 1 if schema.get("revocable") else 0,
+        "txid": schema.get("txid"),
+        "time": int(schema.get("time") or 0),
+    }
+
+
+def _as_schema(row):
+    """Stored row -> dict shaped like the GraphQL schema object"""
+    return {
+        "id": row["id"],
+        "index": row["schema_index"],
+        "schema": row["schema"],
+        "creator": row["creator"],
+        "resolver": row["resolver"],
+        "revocable": bool(row["revocable"]),
+        "txid": row["txid"],
+        "time": row["time"],
+    }
+
+
+class SchemaRegistry:
+    """Schemata cached in SQLite and in memory, refreshed incrementally"""
+
+    def __init__(self, path=DB_PATH, ttl=REGISTRY_TTL, eas=None):
+        self.path = path
+        self.ttl = ttl
+        self.eas = eas
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA_SQL)
+        self._by_uid = {}
+        self._by_index = {}
+        for row in self.db.execute("SELECT * FROM schemata ORDER BY time, id"):
+            self._remember(_as_schema(row))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._by_uid)
+
+    def _remember(self, schema):
+        self._by_uid[schema["id"]] = schema
+        if schema["index"] is not None:
+            self._by_index[schema["index"]] = schema
+
+    def _state(self, key):
+        row = self.db.execute("SELECT value FROM schema_registry_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else 0
+
+    @property
+    def refreshed_at(self):
+        return self._state("refreshed_at")
+
+    def refresh(self, page_size=PAGE_SIZE):
+        """Fetch schemata registered since the newest cached one; returns how many were new"""
+        # Re-read the newest second: more schemata can be registered in the same block
+        since = max((schema["time"] for schema in self._by_uid.values()), default=0)
+        new = 0
+        for page in iter_schema_pages(since, page_size, self.eas):
+            rows = [_schema_row(schema) for schema in page]
+            new += sum(row["id"] not in self._by_uid for row in rows)
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO schemata ({', '.join(rows[0])}) VALUES ({', '.join(':' + c for c in rows[0])})",
+                rows,
+            )
+            self.db.commit()
+            for row in rows:
+                self._remember(_as_schema(row))
+        self.db.execute("INSERT OR REPLACE INTO schema_registry_state (key, value) VALUES ('refreshed_at', ?)", (time.time(),))
+        self.db.commit()
+        return new
+
+    def ensure_fresh(self):
+        """Refresh when the cache is empty or older than the TTL"""
+        if not self._by_uid or time.time() - self.refreshed_at > self.ttl:
+            self.refresh()
+
+    def get(self, ref, refresh_on_miss=True):
+        """Schema dict by index ('#517', 517) or UID, None if unknown"""
+        kind, key = parse_ref(ref)
+        lookup = self._by_uid if kind == "uid" else self._by_index
+        schema = lookup.get(key)
+        if schema is None and refresh_on_miss and time.time() - self.refreshed_at > MISS_REFRESH_INTERVAL:
+            self.refresh()
+            schema = lookup.get(key)
+        return schema
+
+    def by_index(self, index):
+        return self.get(int(index))
+
+    def by_uid(self, uid):
+        return self.get(uid)
+
+    def search(self, keywords):
+        """Schemata whose definition contains any of the keywords (case-insensitive), by index"""
+        keywords = [keyword.lower() for keyword in keywords]
+        matches = [schema for schema in self._by_uid.values()
+                   if any(keyword in schema["schema"].lower() for keyword in keywords)]
+        return sorted(matches, key=lambda schema: (schema["index"] is None, schema["index"] or 0))
+
+    def all(self):
+        """Every cached schema, by index"""
+        return self.search([""])
+
+
+def _print_schema(schema):
+    print(f"\n=== Schema #{schema['index']} ===")
+    print(f"UID: {schema['id']}")
+    print(f"Schema: {schema['schema']}")
+    print(f"Creator: {schema['creator']}")
+    print(f"Time: {schema['time']}")
+    print(f"TxID: {schema['txid']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local cache of the EAS schema registry")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default {DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh", help="fetch schemata registered since the last refresh")
+    show_cmd = commands.add_parser("show", help="show schemata by index (#517) or UID")
+    show_cmd.add_argument("refs", nargs="+")
+    search_cmd = commands.add_parser("search", help="schemata whose definition contains a keyword")
+    search_cmd.add_argument("keywords", nargs="+")
+    args = parser.parse_args(argv)
+
+    with SchemaRegistry(args.db) as registry:
+        try:
+            if args.command == "refresh":
+                started = time.monotonic()
+                new = registry.refresh()
+                print(f"✅ {new:,} new schema(s), {len(registry):,} cached ({time.monotonic() - started:.1f}s)")
+            elif args.command == "show":
+                registry.ensure_fresh()
+                for ref in args.refs:
+                    try:
+                        schema = registry.get(ref)
+                    except ValueError:
+                        parser.error(f"not a schema index or UID: {ref}")
+                    if schema is None:
+                        print(f"\n❌ Schema {ref} not found")
+                    else:
+                        _print_schema(schema)
+            else:
+                registry.ensure_fresh()
+                matches = registry.search(args.keywords)
+                print(f"🔍 {len(matches)} schema(s) matching {', '.join(args.keywords)}")
+                for schema in matches:
+                    print(f"   #{schema['index']} {schema['id']}: {schema['schema']}")
+        except EASError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+    client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
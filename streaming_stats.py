@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Streaming statistics for attestation values
+
+KLLSketch is a mergeable quantile sketch (Karnin, Lang, Liberty 2016):
+values go into a stack of compactors; a full compactor sorts itself and
+promotes every other item, at double weight, to the level above. Memory
+stays around 3*k items (600 at k=200) whatever the stream length,
+quantile and rank answers are within roughly 1.7/k of the true rank
+(about 1% at k=200), and sketches of different schemas or shards merge
+into one.
+
+StreamingStats adds exact count / min / max / mean on top. schema_stats()
+feeds it one value per user (their newest non-revoked attestation), so
+percentiles describe users rather than every historical snapshot; the
+set of users seen grows with the user count, the sketch does not.
+
+    python streaming_stats.py --field yapPoints --user 1422186185196113922
+    python streaming_stats.py --schema 0x30c2... --schema 0x69a0... --local
+"""
+
+import argparse
+import bisect
+import math
+import random
+import sys
+
+from eas_client import client, iter_attestations, map_concurrent, EASError
+from attestation_store import AttestationStore, DB_PATH, YAPS_SCHEMAS, decoded_fields
+from schema_decoder import to_int
+
+
+class KLLSketch:
+    """Mergeable quantile sketch with O(k) memory"""
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("k must be >= 8")
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._cdf = None
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        for level, items in enumerate(self.compactors):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.compactors):
+                self._grow()
+            items.sort()
+            # An odd item out stays at this level, so total weight is exact
+            keep = [items.pop()] if len(items) % 2 else []
+            self.compactors[level + 1].extend(items[self._rng.randint(0, 1)::2])
+            self.compactors[level] = keep
+            self._size = sum(len(c) for c in self.compactors)
+            if self._size < self._max_size:
+                break
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.n += 1
+        self._size += 1
+        self._cdf = None
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values):
+        for value in values:
+            self.update(value)
+
+    def merge(self, other):
+        """Fold ``other`` into this sketch (other is left unchanged)"""
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        self._size = sum(len(c) for c in self.compactors)
+        self._cdf = None
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self):
+        """Sorted values and their cumulative weights"""
+        if self._cdf is None:
+            pairs = sorted((value, 1 << level) for level, items in enumerate(self.compactors) for value in items)
+            values, cumulative, total = [], [], 0
+            for value, weight in pairs:
+                total += weight
+                values.append(value)
+                cumulative.append(total)
+            self._cdf = (values, cumulative)
+        return self._cdf
+
+    def rank(self, value):
+        """Estimated fraction of the stream <= value"""
+        if not self.n:
+            return 0.0
+        values, cumulative = self._weighted()
+        i = bisect.bisect_right(values, value)
+        return cumulative[i - 1] / self.n if i else 0.0
+
+    def quantile(self, q):
+        """Estimated value at fraction q (0..1) of the stream, None when empty"""
+        if not self.n:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        values, cumulative = self._weighted()
+        i = bisect.bisect_left(cumulative, q * self.n)
+        return values[min(i, len(values) - 1)]
+
+    def quantiles(self, qs):
+        return [self.quantile(q) for q in qs]
+
+    def __len__(self):
+        return self.n
+
+    def retained(self):
+        """Items held in memory"""
+        return self._size
+
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "compactors": [list(items) for items in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, data, seed=None):
+        sketch = cls(data["k"], seed)
+        sketch.compactors = [list(items) for items in data["compactors"]] or [[]]
+        sketch.n = data["n"]
+        sketch._size = sum(len(c) for c in sketch.compactors)
+        sketch._max_size = sum(sketch._capacity(level) for level in range(len(sketch.compactors)))
+        return sketch
+
+
+class StreamingStats:
+    """Exact count / min / max / mean plus a KLL sketch for quantiles and ranks"""
+
+    def __init__(self, k=200, track_lowest=0, seed=None):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sketch = KLLSketch(k, seed)
+        self.track_lowest = track_lowest
+        self.lowest = []
+
+    def update(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.update(value)
+        if self.track_lowest:
+            self._track(value)
+
+    def _track(self, value):
+        # Smallest distinct values seen, kept sorted
+        lowest = self.lowest
+        if len(lowest) == self.track_lowest and value >= lowest[-1]:
+            return
+        i = bisect.bisect_left(lowest, value)
+        if i < len(lowest) and lowest[i] == value:
+            return
+        lowest.insert(i, value)
+        del lowest[self.track_lowest:]
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        self.sketch.merge(other.sketch)
+        if self.track_lowest:
+            for value in other.lowest:
+                self._track(value)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def percentile_rank(self, value):
+        """Share of values <= value, in percent"""
+        return 100 * self.sketch.rank(value)
+
+
+def numeric(value):
+    """Attestation field value as a number, None if it is not numeric"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return to_int(value) if isinstance(value, dict) else None
+
+
+def schema_stats(schema_id, field, twitter_user_id=None, store=None, k=200, eas=None):
+    """(StreamingStats of ``field``, the user's value or None) over one schema, one value per user.
+
+    YAPS schemas hold repeated cumulative snapshots per user, so only each
+    user's newest non-revoked attestation is counted: from the store's
+    latest-per-user view, or the first row per user of the newest-first EAS stream.
+    """
+    stats = StreamingStats(k)
+    user_value = None
+    if store is not None:
+        records = ((row["twitter_user_id"], decoded_fields(row)) for row in store.current_attestations(schema_id))
+    else:
+        records = ((to_int(att['fields'].get("twitterUserId")), att['fields'])
+                   for att in iter_attestations(schema_id, fields=("decodedDataJson", "revoked"), eas=eas)
+                   if att['fields'] is not None and not att['revoked'])
+    seen = set()
+    for user_id, fields in records:
+        if user_id is None or str(user_id) in seen:
+            continue
+        seen.add(str(user_id))
+        value = numeric(fields.get(field))
+        if value is None:
+            continue
+        stats.update(value)
+        if twitter_user_id is not None and str(user_id) == str(twitter_user_id):
+            user_value = value
+    return stats, user_value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming distribution and percentile rank of an attestation field")
+    parser.add_argument("--schema", action="append", help="schema UID (repeatable, sketches are merged; default: all known YAPS schemas)")
+    parser.add_argument("--field", default="yapPoints", help="decoded field name (default yapPoints)")
+    parser.add_argument("--user", help="Twitter user id whose percentile rank to report")
+    parser.add_argument("-k", type=int, default=200, help="sketch size, error is about 1.7/k (default 200)")
+    parser.add_argument("--local", action="store_true", help="read from the local attestation mirror instead of EAS")
+    parser.add_argument("--db", default=DB_PATH, help=f"local mirror database (default {DB_PATH})")
+    args = parser.parse_args(argv)
+
+    schemas = args.schema or list(YAPS_SCHEMAS)
+    store = AttestationStore(args.db) if args.local else None
+    if store is not None:
+        results = [(uid, schema_stats(uid, args.field, args.user, store, args.k), None) for uid in schemas]
+        store.close()
+    else:
+        results = map_concurrent(lambda uid: schema_stats(uid, args.field, args.user, k=args.k), schemas)
+
+    merged = StreamingStats(args.k)
+    user_values = []
+    for schema_id, result, error in results:
+        name = YAPS_SCHEMAS.get(schema_id, schema_id)
+        if error is not None:
+            if not isinstance(error, EASError):
+                raise error
+            print(f"❌ {name}: {error}", file=sys.stderr)
+            continue
+        stats, user_value = result
+        print(f"📊 {name}: {stats.count:,} users with a {args.field} value")
+        merged.merge(stats)
+        if user_value is not None:
+            user_values.append((name, user_value))
+
+    if not merged.count:
+        print(f"❌ No numeric {args.field} values found")
+        return
+    print(f"\n📈 {args.field} over {merged.count:,} users ({merged.sketch.retained():,} values kept in the sketch)")
+    print(f"   Range: {merged.min:,} - {merged.max:,}")
+    print(f"   Average: {merged.mean:,.0f}")
+    for q in (0.5, 0.9, 0.99):
+        print(f"   p{int(q * 100)}: {merged.quantile(q):,}")
+    if args.user:
+        if not user_values:
+            print(f"\n❌ No {args.field} value found for {args.user}")
+        for name, value in user_values:
+            print(f"\n🎯 {args.user} in {name}: {value:,} -> {merged.percentile_rank(value):.1f}th percentile")
+    client.print_stats()
+
+
+if __name__ == "__main__":
+    main()
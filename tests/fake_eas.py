@@ -0,0 +1,100 @@
+"""
+In-process stand-in for the EAS GraphQL endpoint, for the eas= parameter of the EAS helpers
+"""
+
+import json
+import random
+import time
+
+SCHEMA = "0x" + "55" * 32
+
+
+def decoded_json(twitter_user_id, points, username=None, field="yapPoints"):
+    fields = [("twitterUserId", "uint64", str(twitter_user_id)), (field, "uint64", str(points))]
+    if username is not None:
+        fields.append(("twitterUsername", "string", username))
+    return json.dumps([{"name": name, "type": kind, "value": {"name": name, "type": kind, "value": value}}
+                       for name, kind, value in fields])
+
+
+class FakeEAS:
+    """Answers AttestationPage queries from a list of attestation dicts.
+
+    ``fail_on`` holds 1-based query numbers that get a GraphQL error
+    instead of data, like an upstream failure in the middle of a sync.
+    """
+
+    def __init__(self, attestations=(), fail_on=()):
+        self.attestations = list(attestations)
+        self.fail_on = set(fail_on)
+        self.queries = 0
+
+    def add(self, id, twitter_user_id, points, time_created, username=None, schema=SCHEMA, **extra):
+        att = {"id": id, "schemaId": schema, "attester": "0xattester", "recipient": "0xrecipient", "data": "0x",
+               "decodedDataJson": decoded_json(twitter_user_id, points, username), "timeCreated": time_created,
+               "revoked": False, "revocationTime": 0, **extra}
+        self.attestations.append(att)
+        return att
+
+    def revoke(self, id, revocation_time):
+        att = next(att for att in self.attestations if att["id"] == id)
+        att["revoked"], att["revocationTime"] = True, revocation_time
+
+    def query(self, query, variables=None):
+        self.queries += 1
+        if self.queries in self.fail_on:
+            return {"errors": [{"message": "upstream unavailable"}]}
+        where = variables["where"]
+        rows = [att for att in self.attestations if att["schemaId"] == where["schemaId"]["equals"]]
+        if "timeCreated" in where:
+            rows = [att for att in rows if att["timeCreated"] >= where["timeCreated"]["gte"]]
+        if "revoked" in where:
+            rows = [att for att in rows if att["revoked"] == where["revoked"]["equals"]]
+        if "revocationTime" in where:
+            rows = [att for att in rows if att["revocationTime"] >= where["revocationTime"]["gte"]]
+        if "OR" in where:
+            rows = [att for att in rows if any(f["decodedDataJson"]["contains"] in att["decodedDataJson"] for f in where["OR"])]
+        rows.sort(key=lambda att: (att["timeCreated"], att["id"]), reverse="timeCreated: desc" in query)
+        if variables.get("cursor"):
+            rows = rows[[att["id"] for att in rows].index(variables["cursor"]["id"]):]
+        rows = rows[variables.get("skip") or 0:][:variables["take"]]
+        return {"data": {"attestations": [dict(att) for att in rows]}}
+
+
+class RandomHistory:
+    """Random YAPS-style history: a few users re-attested many times, some rows revoked"""
+
+    def __init__(self, seed, users=25, schemas=(SCHEMA,)):
+        self.random = random.Random(seed)
+        self.users = [str(1000000 + self.random.randrange(10 ** 6)) for _ in range(users)]
+        self.schemas = schemas
+        self.clock = int(time.time()) - 100000
+        self.revocation_clock = int(time.time())
+        self.eas = FakeEAS()
+
+    def add(self, count):
+        for _ in range(count):
+            # Several rows can share a second, as on chain
+            self.clock += self.random.choice((0, 0, 1, 7))
+            user_id, points = self.random.choice(self.users), self.random.randrange(50)
+            att = self.eas.add(f"0x{self.random.getrandbits(64):016x}", user_id, points, self.clock,
+                               schema=self.random.choice(self.schemas))
+            att["user"], att["points"] = user_id, points
+
+    def revoke(self, count):
+        standing = [att for att in self.eas.attestations if not att["revoked"]]
+        for att in self.random.sample(standing, min(count, len(standing))):
+            # Revocation times only move forward, like block times
+            self.revocation_clock += self.random.randrange(3)
+            self.eas.revoke(att["id"], self.revocation_clock)
+
+    def latest(self, schema=SCHEMA):
+        """{user id: newest non-revoked attestation} in one schema, by brute force"""
+        latest = {}
+        for att in self.eas.attestations:
+            if att["revoked"] or att["schemaId"] != schema:
+                continue
+            current = latest.get(att["user"])
+            if current is None or (att["timeCreated"], att["id"]) > (current["timeCreated"], current["id"]):
+                latest[att["user"]] = att
+        return latest
@@ -0,0 +1,421 @@
+"""
+The three scorers as they were before scoring_rules.json
+
+analyze_content_full (api/index.py), the root index.py /analyze endpoint
+and app.py's analyze_yaps_score, copied unchanged (the root endpoint's
+analysis dict as a function). The rule engine profiles are tested against
+them; do not edit these to make a test pass.
+"""
+
+import re
+
+
+def analyze_content_full(content):
+    """Shared function for full Kaito + Twitter algorithm analysis"""
+    char_count = len(content)
+    optimal_length = 150 <= char_count <= 280
+    min_length = char_count >= 50
+
+    crypto_keywords = ['defi', 'layer', 'l2', 'ai', 'rwa', 'tvl', 'airdrop', 'protocol', 'chain', 'token', 'nft', 'dao', 'staking', 'yield', 'bridge', 'zk', 'rollup', 'evm', 'smart contract', 'agi', 'funding', 'liquidity']
+    content_lower = content.lower()
+    keyword_count = sum(1 for kw in crypto_keywords if kw in content_lower)
+    has_crypto_focus = keyword_count >= 1
+
+    keyword_stuffing = keyword_count > 5
+
+    generic_phrases = ['to the moon', 'lfg', 'gm', 'ser', 'ngmi', 'wagmi', 'bullish', 'bearish']
+    generic_count = sum(1 for phrase in generic_phrases if phrase in content_lower)
+    is_original = generic_count < 2
+
+    content_opt_score = 0
+    if min_length: content_opt_score += 2
+    if optimal_length: content_opt_score += 3
+    if has_crypto_focus: content_opt_score += 3
+    if is_original: content_opt_score += 2
+    content_opt_score = min(10, content_opt_score)
+
+    has_question = '?' in content
+    has_data = any(char.isdigit() for char in content)
+    has_cta = any(word in content_lower for word in ['what', 'how', 'why', 'thoughts', 'think', 'opinion', 'see', 'do you'])
+
+    engagement_score = 0
+    if has_question: engagement_score += 4
+    if has_data: engagement_score += 3
+    if has_cta: engagement_score += 3
+    engagement_score = min(10, engagement_score)
+
+    has_metrics = bool(re.search(r'\d+[%$MBK]|\$\d+|\d+x', content))
+    has_analysis = len(content.split()) > 15
+    no_spam_pattern = not bool(re.search(r'(.)\1{3,}', content))
+
+    quality_score = 0
+    if has_metrics: quality_score += 4
+    if has_analysis: quality_score += 3
+    if no_spam_pattern: quality_score += 3
+    quality_score = min(10, quality_score)
+
+    content_types = []
+    if 'tvl' in content_lower or 'revenue' in content_lower: content_types.append("Protocol analysis ?")
+    if has_metrics and ('vs' in content_lower or 'compare' in content_lower): content_types.append("Comparison ?")
+    if 'airdrop' in content_lower and 'risk' in content_lower: content_types.append("Airdrop strategy ?")
+    if re.search(r'thread|1/', content_lower): content_types.append("Thread format ?")
+    if '•' in content or '??' in content: content_types.append("Narrative format ?")
+
+    penalties = []
+    if keyword_stuffing: penalties.append("?? Keyword stuffing detected")
+    if 'kaito' in content_lower and '@' in content: penalties.append("?? Avoid tagging Kaito")
+    if generic_count >= 3: penalties.append("?? Too many generic phrases")
+    if char_count < 50: penalties.append("?? Too short (min 50 chars)")
+    if not has_crypto_focus: penalties.append("?? No crypto-specific topic")
+
+    suggestions = []
+    if not has_question: suggestions.append("?? Add question untuk drive discussion")
+    if not has_data: suggestions.append("?? Include metrics/data untuk credibility")
+    if char_count < 150: suggestions.append("?? Expand to 150-280 chars (optimal)")
+    if not content_types: suggestions.append("?? Try protocol deep-dive atau comparison format")
+    if not is_original: suggestions.append("?? Add personal analysis/unique insight")
+
+    total_score = (content_opt_score * 0.3) + (engagement_score * 0.5) + (quality_score * 0.2)
+    total_score = round(total_score, 1)
+
+    estimated_yaps = int(total_score * 0.7 * 75)
+
+    if total_score >= 9:
+        rating = "????? Excellent - High YAPS potential!"
+    elif total_score >= 7:
+        rating = "???? Good - Solid content"
+    elif total_score >= 5:
+        rating = "??? Fair - Needs improvement"
+    else:
+        rating = "?? Poor - Optimize further"
+
+    # Twitter Algorithm scoring
+    twitter_score = 0
+    engagement_factors = []
+    twitter_penalties = []
+
+    if has_question:
+        twitter_score += 35
+        engagement_factors.append("? Has question (+35 pts, drives Reply 75x)")
+    if has_cta:
+        twitter_score += 25
+        engagement_factors.append("?? Call-to-action (+25 pts)")
+    if has_data:
+        twitter_score += 15
+        engagement_factors.append("?? Data/metrics (+15 pts)")
+    if optimal_length:
+        twitter_score += 15
+        engagement_factors.append("?? Optimal length 150-280 chars (+15 pts)")
+    if no_spam_pattern:
+        twitter_score += 10
+        engagement_factors.append("?? No spam patterns (+10 pts)")
+
+    spam_keywords = ['follow me', 'rt this', 'like if']
+    if any(spam in content_lower for spam in spam_keywords):
+        twitter_score -= 20
+        twitter_penalties.append("?? Engagement farming detected (-20 pts)")
+    if keyword_stuffing:
+        twitter_score -= 15
+        twitter_penalties.append("?? Keyword stuffing (-15 pts)")
+
+    twitter_score = max(0, min(100, twitter_score))
+
+    if twitter_score >= 80:
+        twitter_rating = "?? Potensi Viral - Engagement sangat tinggi"
+    elif twitter_score >= 60:
+        twitter_rating = "?? Jangkauan Bagus - Above average"
+    elif twitter_score >= 40:
+        twitter_rating = "?? Jangkauan Sedang - Standard"
+    else:
+        twitter_rating = "?? Jangkauan Rendah - Perlu optimasi"
+
+    return {
+        "kaito_yaps": {
+            "total_score": total_score,
+            "rating": rating,
+            "estimated_yaps": estimated_yaps,
+            "breakdown": {
+                "content_optimization": {
+                    "score": content_opt_score,
+                    "weight": "30%",
+                    "details": {
+                        "length": f"{char_count} chars" + (" ? optimal" if optimal_length else " ?? adjust to 150-280"),
+                        "crypto_focus": "? Yes" if has_crypto_focus else "? No crypto topic",
+                        "originality": "? Original" if is_original else "?? Too generic",
+                        "keywords": f"{keyword_count} keywords" + (" ?" if 1 <= keyword_count <= 3 else " ??")
+                    }
+                },
+                "engagement_strategy": {
+                    "score": engagement_score,
+                    "weight": "50%",
+                    "details": {
+                        "question": "? Yes" if has_question else "? No",
+                        "data_driven": "? Yes" if has_data else "? No data/metrics",
+                        "cta": "? Yes" if has_cta else "? No call-to-action"
+                    }
+                },
+                "content_quality": {
+                    "score": quality_score,
+                    "weight": "20%",
+                    "details": {
+                        "metrics": "? Includes metrics" if has_metrics else "? No specific metrics",
+                        "depth": "? Detailed analysis" if has_analysis else "?? Surface-level",
+                        "spam_check": "? Clean" if no_spam_pattern else "?? Spam pattern detected"
+                    }
+                }
+            },
+            "penalties": penalties if penalties else ["? No penalties detected"]
+        },
+        "twitter_algorithm": {
+            "score": twitter_score,
+            "rating": twitter_rating,
+            "engagement_factors": engagement_factors if engagement_factors else ["?? Standard engagement"],
+            "penalties": twitter_penalties if twitter_penalties else [],
+            "algorithm_notes": [
+                "?? Reply (75x) > Conversation (30x) > Retweet (10x) > Like (1x)",
+                "? 30 menit pertama paling penting untuk velocity",
+                "? Question = boost Reply = 75x engagement weight"
+            ]
+        },
+        "content_types": content_types if content_types else ["?? Standard tweet format"],
+        "suggestions": suggestions if suggestions else ["? Content is well-optimized!"]
+    }
+
+
+def analyze_content_lite(content):
+    """Kaito + Twitter algorithm analysis of the root index.py /analyze endpoint"""
+    char_count = len(content)
+    optimal_length = 150 <= char_count <= 280
+    min_length = char_count >= 50
+
+    crypto_keywords = ['defi', 'layer', 'l2', 'ai', 'rwa', 'tvl', 'airdrop', 'protocol', 'chain', 'token', 'nft', 'dao', 'staking', 'yield', 'bridge', 'zk', 'rollup', 'evm', 'smart contract']
+    content_lower = content.lower()
+    keyword_count = sum(1 for kw in crypto_keywords if kw in content_lower)
+    has_crypto_focus = keyword_count >= 1
+
+    keyword_stuffing = keyword_count > 5
+
+    generic_phrases = ['to the moon', 'lfg', 'gm', 'ser', 'ngmi', 'wagmi', 'bullish', 'bearish']
+    generic_count = sum(1 for phrase in generic_phrases if phrase in content_lower)
+    is_original = generic_count < 2
+
+    content_opt_score = 0
+    if min_length: content_opt_score += 2
+    if optimal_length: content_opt_score += 3
+    if has_crypto_focus: content_opt_score += 3
+    if is_original: content_opt_score += 2
+    content_opt_score = min(10, content_opt_score)
+
+    has_question = '?' in content
+    has_data = any(char.isdigit() for char in content)
+    has_cta = any(word in content_lower for word in ['what', 'how', 'why', 'thoughts', 'think', 'opinion'])
+
+    engagement_score = 0
+    if has_question: engagement_score += 4
+    if has_data: engagement_score += 3
+    if has_cta: engagement_score += 3
+    engagement_score = min(10, engagement_score)
+
+    has_metrics = bool(re.search(r'\d+[%$MBK]|\$\d+|\d+x', content))
+    has_analysis = len(content.split()) > 15
+    no_spam_pattern = not bool(re.search(r'(.)\1{3,}', content))
+
+    quality_score = 0
+    if has_metrics: quality_score += 4
+    if has_analysis: quality_score += 3
+    if no_spam_pattern: quality_score += 3
+    quality_score = min(10, quality_score)
+
+    content_types = []
+    if 'tvl' in content_lower or 'revenue' in content_lower: content_types.append("Protocol analysis ?")
+    if has_metrics and ('vs' in content_lower or 'compare' in content_lower): content_types.append("Comparison ?")
+    if 'airdrop' in content_lower and 'risk' in content_lower: content_types.append("Airdrop strategy ?")
+    if re.search(r'thread|1/', content_lower): content_types.append("Thread format ?")
+
+    penalties = []
+    if keyword_stuffing: penalties.append("?? Keyword stuffing detected")
+    if 'kaito' in content_lower and '@' in content: penalties.append("?? Avoid tagging Kaito")
+    if generic_count >= 3: penalties.append("?? Too many generic phrases")
+    if char_count < 50: penalties.append("?? Too short (min 50 chars)")
+    if not has_crypto_focus: penalties.append("?? No crypto-specific topic")
+
+    suggestions = []
+    if not has_question: suggestions.append("?? Add question untuk drive discussion")
+    if not has_data: suggestions.append("?? Include metrics/data untuk credibility")
+    if char_count < 150: suggestions.append("?? Expand to 150-280 chars (optimal)")
+    if not content_types: suggestions.append("?? Try protocol deep-dive atau comparison format")
+    if not is_original: suggestions.append("?? Add personal analysis/unique insight")
+
+    total_score = (content_opt_score * 0.3) + (engagement_score * 0.5) + (quality_score * 0.2)
+    total_score = round(total_score, 1)
+
+    estimated_yaps = int(total_score * 0.7 * 75)
+
+    if total_score >= 9:
+        rating = "????? Excellent - High YAPS potential!"
+    elif total_score >= 7:
+        rating = "???? Good - Solid content"
+    elif total_score >= 5:
+        rating = "??? Fair - Needs improvement"
+    else:
+        rating = "?? Poor - Optimize further"
+
+    # Build Twitter Algorithm scoring
+    twitter_score = 0
+    engagement_factors = []
+    twitter_penalties = []
+
+    if has_question:
+        twitter_score += 35
+        engagement_factors.append("? Has question (+35 pts, drives Reply 75x)")
+    if has_cta:
+        twitter_score += 25
+        engagement_factors.append("?? Call-to-action (+25 pts)")
+    if has_data:
+        twitter_score += 15
+        engagement_factors.append("?? Data/metrics (+15 pts)")
+    if optimal_length:
+        twitter_score += 15
+        engagement_factors.append("?? Optimal length 150-280 chars (+15 pts)")
+    if no_spam_pattern:
+        twitter_score += 10
+        engagement_factors.append("?? No spam patterns (+10 pts)")
+
+    # Twitter penalties
+    spam_keywords = ['follow me', 'rt this', 'like if']
+    if any(spam in content_lower for spam in spam_keywords):
+        twitter_score -= 20
+        twitter_penalties.append("?? Engagement farming detected (-20 pts)")
+    if keyword_stuffing:
+        twitter_score -= 15
+        twitter_penalties.append("?? Keyword stuffing (-15 pts)")
+
+    twitter_score = max(0, min(100, twitter_score))
+
+    if twitter_score >= 80:
+        twitter_rating = "?? Potensi Viral - Engagement sangat tinggi"
+    elif twitter_score >= 60:
+        twitter_rating = "?? Jangkauan Bagus - Above average"
+    elif twitter_score >= 40:
+        twitter_rating = "?? Jangkauan Sedang - Standard"
+    else:
+        twitter_rating = "?? Jangkauan Rendah - Perlu optimasi"
+
+    return {
+        "kaito_yaps": {
+            "total_score": total_score,
+            "rating": rating,
+            "estimated_yaps": estimated_yaps,
+            "breakdown": {
+                "content_optimization": {
+                    "score": content_opt_score,
+                    "weight": "30%",
+                    "details": {
+                        "length": f"{char_count} chars" + (" ? optimal" if optimal_length else " ?? adjust to 150-280"),
+                        "crypto_focus": "? Yes" if has_crypto_focus else "? No crypto topic",
+                        "originality": "? Original" if is_original else "?? Too generic",
+                        "keywords": f"{keyword_count} keywords" + (" ?" if 1 <= keyword_count <= 3 else " ??")
+                    }
+                },
+                "engagement_strategy": {
+                    "score": engagement_score,
+                    "weight": "50%",
+                    "details": {
+                        "question": "? Yes" if has_question else "? No",
+                        "data_driven": "? Yes" if has_data else "? No data/metrics",
+                        "cta": "? Yes" if has_cta else "? No call-to-action"
+                    }
+                },
+                "content_quality": {
+                    "score": quality_score,
+                    "weight": "20%",
+                    "details": {
+                        "metrics": "? Includes metrics" if has_metrics else "? No specific metrics",
+                        "depth": "? Detailed analysis" if has_analysis else "?? Surface-level",
+                        "spam_check": "? Clean" if no_spam_pattern else "?? Spam pattern detected"
+                    }
+                }
+            },
+            "penalties": penalties if penalties else ["? No penalties detected"]
+        },
+        "twitter_algorithm": {
+            "score": twitter_score,
+            "rating": twitter_rating,
+            "engagement_factors": engagement_factors if engagement_factors else ["?? Standard engagement"],
+            "penalties": twitter_penalties if twitter_penalties else [],
+            "algorithm_notes": [
+                "?? Reply (75x) > Conversation (30x) > Retweet (10x) > Like (1x)",
+                "? 30 menit pertama paling penting untuk velocity",
+                "? Question = boost Reply = 75x engagement weight"
+            ]
+        },
+        "content_types": content_types if content_types else ["?? Standard tweet format"],
+        "suggestions": suggestions if suggestions else ["? Content is well-optimized!"]
+    }
+
+
+def analyze_yaps_score(content):
+    """Simple scoring analysis"""
+    score = {
+        'crypto_relevance': 0,
+        'engagement_potential': 0,
+        'semantic_quality': 0,
+        'total': 0,
+        'feedback': []
+    }
+
+    if len(content) >= 50:
+        score['crypto_relevance'] += 3
+        score['feedback'].append('✅ Length optimal (50+ chars)')
+
+    crypto_keywords = ['DeFi', 'L2', 'TVL', 'funding', 'protocol', 'AI', 'crypto', 'blockchain']
+    if any(kw.lower() in content.lower() for kw in crypto_keywords):
+        score['crypto_relevance'] += 4
+        score['feedback'].append('✅ Crypto-relevant topics')
+
+    if any(char.isdigit() for char in content):
+        score['crypto_relevance'] += 3
+        score['feedback'].append('✅ Contains data/metrics')
+    else:
+        score['feedback'].append('⚠️ Tidak ada data numerik')
+
+    tags_count = content.count('@')
+    if tags_count <= 2:
+        score['engagement_potential'] += 5
+        score['feedback'].append(f'✅ Tags optimal ({tags_count} tags)')
+    else:
+        score['engagement_potential'] += 2
+        score['feedback'].append(f'⚠️ Terlalu banyak tags ({tags_count})')
+
+    if '?' in content:
+        score['engagement_potential'] += 3
+        score['feedback'].append('✅ Ada question untuk engagement')
+
+    if len(content) <= 280:
+        score['engagement_potential'] += 2
+        score['feedback'].append('✅ Twitter-friendly length')
+
+    if any(word in content.lower() for word in ['kenapa', 'bagaimana', 'mengapa', 'analisis', 'thesis']):
+        score['semantic_quality'] += 3
+        score['feedback'].append('✅ Analytical tone')
+
+    if not any(spam in content.lower() for spam in ['gm', 'gn', 'lfg', 'wagmi']):
+        score['semantic_quality'] += 4
+        score['feedback'].append('✅ Tidak ada spam phrases')
+
+    if len(content.split()) > 15:
+        score['semantic_quality'] += 3
+        score['feedback'].append('✅ Depth content (15+ words)')
+
+    score['total'] = score['crypto_relevance'] + score['engagement_potential'] + score['semantic_quality']
+
+    if score['total'] >= 18:
+        score['rating'] = 'EXCELLENT (High YAPS potential)'
+    elif score['total'] >= 14:
+        score['rating'] = 'GOOD (Medium-High YAPS)'
+    elif score['total'] >= 10:
+        score['rating'] = 'FAIR (Medium YAPS)'
+    else:
+        score['rating'] = 'NEEDS IMPROVEMENT'
+
+    return score
@@ -0,0 +1,74 @@
+"""
+POST /analyze/batch of api/index.py through the Flask test client
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+from content_analysis import analyze_content_full, analysis_scores
+
+API_INDEX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api", "index.py")
+
+
+@pytest.fixture(scope="module")
+def api():
+    # Loaded by path: the root index.py takes the module name "index"
+    spec = importlib.util.spec_from_file_location("api_index", API_INDEX)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def client(api):
+    return api.app.test_client()
+
+
+def test_results_keep_input_order_with_per_item_errors(api, client, monkeypatch):
+    analyze = api.analyze_content_cached
+
+    def flaky(content):
+        if content == "boom":
+            raise RuntimeError("scorer failed")
+        return analyze(content)
+
+    monkeypatch.setattr(api, "analyze_content_cached", flaky)
+    contents = ["gm ser, TVL up 40% 🚀", "", 42, "boom", "  padded tweet  "]
+    response = client.post("/analyze/batch", json={"contents": contents})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["count"] == 5
+    assert body["results"] == [
+        {"success": True, "analysis": analyze_content_full("gm ser, TVL up 40% 🚀")},
+        {"success": False, "error": "Content required"},
+        {"success": False, "error": "Content required"},
+        {"success": False, "error": "scorer failed"},
+        {"success": True, "analysis": analyze_content_full("padded tweet")},
+    ]
+
+
+def test_scores_only(client):
+    response = client.post("/analyze/batch", json={"contents": ["why is TVL up?"], "scores_only": True})
+    assert response.get_json()["results"] == [{"success": True, "scores": analysis_scores(analyze_content_full("why is TVL up?"))}]
+
+
+@pytest.mark.parametrize("scores_only", ["false", 0, 1, None, [], {}])
+def test_scores_only_must_be_a_bool(client, scores_only):
+    response = client.post("/analyze/batch", json={"contents": ["gm"], "scores_only": scores_only})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "scores_only must be true or false"}
+
+
+@pytest.mark.parametrize("payload", [["gm"], {"contents": []}, {"contents": "gm"}, {}])
+def test_invalid_payloads(client, payload):
+    assert client.post("/analyze/batch", json=payload).status_code == 400
+
+
+def test_batch_size_limit(api, client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BATCH_SIZE", 3)
+    assert client.post("/analyze/batch", json={"contents": ["a", "b", "c"]}).status_code == 200
+    response = client.post("/analyze/batch", json={"contents": ["a", "b", "c", "d"]})
+    assert response.status_code == 413
+    assert response.get_json() == {"error": "Batch too large (max 3 items)"}
@@ -0,0 +1,44 @@
+"""
+Streaming NDJSON analysis: ordering and bounded lookahead
+"""
+
+import json
+
+from analyze_tweets import analyze_records, parse_records
+from content_analysis import analyze_content_full
+
+
+def _dump(count, tweet_every):
+    for i in range(count):
+        if i % tweet_every == 0:
+            yield json.dumps({"id": i, "text": f"TVL up {i}% vs last week, thoughts?"}) + "\n"
+        else:
+            yield json.dumps({"delete": {"status": {"id": i}}}) + "\n"
+
+
+def test_outputs_follow_input_order():
+    lines = ['{"id": 1, "text": "gm ser"}\n', "{not json\n", '"  a string tweet  "\n', '{"id": 4}\n', "plain text tweet\n"]
+    out = list(analyze_records(parse_records(lines), chunk_size=2))
+    assert [o["line"] for o in out] == [1, 2, 3, 4, 5]
+    assert out[0]["id"] == 1 and out[0]["analysis"] == analyze_content_full("gm ser")
+    assert out[1]["error"].startswith("Invalid JSON")
+    assert out[2]["analysis"] == analyze_content_full("a string tweet")
+    assert out[3] == {"line": 4, "id": 4, "error": "Content required"}
+    assert out[4]["analysis"] == analyze_content_full("plain text tweet")
+
+
+def test_lookahead_is_bounded_by_chunk_size_when_most_records_are_errors():
+    read = 0
+
+    def counted(lines):
+        nonlocal read
+        for line in lines:
+            read += 1
+            yield line
+
+    chunk_size = 50
+    max_ahead = 0
+    for written, out in enumerate(analyze_records(parse_records(counted(_dump(20000, 1000))), chunk_size=chunk_size), 1):
+        max_ahead = max(max_ahead, read - written)
+    assert written == 20000
+    assert max_ahead <= chunk_size
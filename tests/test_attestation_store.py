@@ -0,0 +1,53 @@
+"""
+latest_attestations against a brute-force newest-standing-row-per-user scan
+"""
+
+import pytest
+
+from attestation_store import AttestationStore
+from eas_client import EASError
+from fake_eas import RandomHistory, SCHEMA
+
+OTHER_SCHEMA = "0x" + "66" * 32
+
+
+def latest_view(store, schema_id):
+    return {row["twitter_user_id"]: row["id"] for row in store.current_attestations(schema_id)}
+
+
+def assert_matches(store, history):
+    for schema_id in history.schemas:
+        expected = {user_id: att["id"] for user_id, att in history.latest(schema_id).items()}
+        assert latest_view(store, schema_id) == expected
+        for user_id in history.users:
+            assert [row["id"] for row in store.latest(user_id, schema_id)] == ([expected[user_id]] if user_id in expected else [])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_sync_keeps_the_latest_view_current(tmp_path, seed):
+    history = RandomHistory(seed, schemas=(SCHEMA, OTHER_SCHEMA))
+    with AttestationStore(str(tmp_path / "yaps.db")) as store:
+        for _ in range(12):
+            history.add(history.random.randrange(40))
+            history.revoke(history.random.randrange(10))
+            for schema_id in history.schemas:
+                store.sync(schema_id, page_size=9, eas=history.eas)
+            assert_matches(store, history)
+        # The incremental view equals a rebuild from the full history
+        before = {schema_id: latest_view(store, schema_id) for schema_id in history.schemas}
+        store.rebuild_latest()
+        assert {schema_id: latest_view(store, schema_id) for schema_id in history.schemas} == before
+
+
+def test_interrupted_sync_resumes_with_a_consistent_view(tmp_path):
+    history = RandomHistory(3)
+    history.add(120)
+    history.revoke(15)
+    history.eas.fail_on = {4}
+    with AttestationStore(str(tmp_path / "yaps.db")) as store:
+        with pytest.raises(EASError):
+            store.sync(SCHEMA, page_size=10, eas=history.eas)
+        history.add(30)
+        history.revoke(5)
+        store.sync(SCHEMA, page_size=10, eas=history.eas)
+        assert_matches(store, history)
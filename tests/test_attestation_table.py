@@ -0,0 +1,66 @@
+"""
+AttestationTable column types and row round trips
+"""
+
+from array import array
+
+import pytest
+
+from attestation_table import AttestationTable, StringColumn
+from schema_decoder import decoder_for
+
+SCHEMA = ("uint64 twitterUserId, int32 delta, uint256 total, bool active, string twitterUsername, "
+          "address wallet, bytes32 tag, bytes32[] proofs, uint64[] history")
+
+
+def rows():
+    return [
+        ("1422186185196113922", -5, 2 ** 200, True, "alice", "0x" + "11" * 20, "0x" + "ab" * 32, ["0xab", "0xcd"], [1, 2, 3]),
+        ("7", 12, 0, False, "bob", "0x" + "22" * 20, "0x" + "cd" * 32, [], []),
+        ("8", 0, 1, True, "alice", "0x" + "11" * 20, "0x" + "ab" * 32, ["0xef"], [4]),
+    ]
+
+
+def test_columns_follow_the_abi_types():
+    table = AttestationTable(decoder_for(SCHEMA))
+    columns = table.columns
+    assert columns["twitterUserId"].typecode == "Q" and columns["delta"].typecode == "q"
+    assert columns["active"].typecode == "B"
+    for name in ("twitterUsername", "wallet", "tag"):
+        assert isinstance(columns[name], StringColumn)
+    # uint256 and arrays keep Python objects
+    for name in ("total", "proofs", "history"):
+        assert type(columns[name]) is list
+
+
+def test_rows_round_trip():
+    decoder = decoder_for(SCHEMA)
+    table = AttestationTable(decoder)
+    for i, values in enumerate(rows()):
+        record = decoder.Record(int(values[0]), *values[1:])
+        assert table.append({"id": f"0x{i + 1:064x}", "timeCreated": 1700000000 + i, "attester": "0xattester",
+                             "revoked": i == 1, "record": record})
+    assert len(table) == 3
+    for i, values in enumerate(rows()):
+        row = table[i]
+        assert (row.twitterUserId, row.delta, row.total, row.active, row.twitterUsername, row.wallet, row.tag,
+                row.proofs, row.history) == (int(values[0]), *values[1:])
+        assert (row.id, row.timeCreated, row.revoked) == (f"0x{i + 1:064x}", 1700000000 + i, int(i == 1))
+    assert table[-1].proofs == ["0xef"]
+    # Repeated strings share one code
+    assert table.columns["twitterUsername"].values == [None, "alice", "bob"]
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_numpy_views_numeric_columns_only():
+    np = pytest.importorskip("numpy")
+    decoder = decoder_for(SCHEMA)
+    table = AttestationTable(decoder)
+    for values in rows():
+        table.append({"id": "0x01", "record": decoder.Record(int(values[0]), *values[1:])})
+    assert table.numpy("twitterUserId").tolist() == [1422186185196113922, 7, 8]
+    assert table.numpy("delta").dtype == np.int64
+    with pytest.raises(TypeError):
+        table.numpy("proofs")
+    assert isinstance(table.column("active"), array)
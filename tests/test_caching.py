@@ -0,0 +1,166 @@
+"""
+StaleWhileRevalidateCache and LRUCache behavior under a controlled clock
+"""
+
+import threading
+import time
+
+import pytest
+
+import caching
+from caching import LRUCache, StaleWhileRevalidateCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(caching.time, "monotonic", clock)
+    return clock
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class Loader:
+    """Counts calls; returns 1, 2, 3, ... or raises while ``error`` is set; can be held at a gate"""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.gate = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.calls
+
+
+def test_fresh_values_are_served_from_cache(clock):
+    loader = Loader()
+    cache = StaleWhileRevalidateCache(loader, ttl=60)
+    assert [cache.get() for _ in range(5)] == [1] * 5
+    assert loader.calls == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 4
+
+
+def test_stale_value_is_served_while_one_refresh_runs(clock):
+    loader = Loader()
+    cache = StaleWhileRevalidateCache(loader, ttl=60)
+    assert cache.get() == 1
+    clock.now += 61
+    loader.gate = threading.Event()
+    assert [cache.get() for _ in range(20)] == [1] * 20
+    wait_for(lambda: loader.calls == 2)
+    assert cache.stats()["stale_hits"] == 20
+    loader.gate.set()
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.get() == 2
+    assert loader.calls == 2
+
+
+def test_failed_refresh_keeps_the_stale_value_until_retry_after(clock):
+    loader = Loader()
+    cache = StaleWhileRevalidateCache(loader, ttl=60, retry_after=30)
+    cache.get()
+    loader.error = RuntimeError("upstream down")
+    clock.now += 61
+    assert cache.get() == 1
+    wait_for(lambda: cache.stats()["errors"] == 1)
+    # Not retried on every request
+    assert cache.get() == 1 and loader.calls == 2
+    loader.error = None
+    clock.now += 31
+    assert cache.get() == 1
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.get() == 3
+
+
+def test_cold_failure_serves_the_fallback_until_retry_after(clock):
+    loader = Loader()
+    loader.error = RuntimeError("upstream down")
+    cache = StaleWhileRevalidateCache(loader, ttl=60, fallback=lambda: "fallback", retry_after=30)
+    assert cache.get() == "fallback"
+    assert cache.get() == "fallback" and loader.calls == 1
+    loader.error = None
+    clock.now += 31
+    assert cache.get() == "fallback"
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert cache.get() == 2
+    assert cache.stats()["errors"] == 1
+
+
+def test_cold_failure_without_fallback_raises_and_retries(clock):
+    loader = Loader()
+    loader.error = RuntimeError("upstream down")
+    cache = StaleWhileRevalidateCache(loader, ttl=60)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            cache.get()
+    assert loader.calls == 2 and not cache.stats()["cached"]
+    loader.error = None
+    assert cache.get() == 3
+
+
+def test_invalidate_reloads_synchronously(clock):
+    loader = Loader()
+    cache = StaleWhileRevalidateCache(loader, ttl=60)
+    assert cache.get() == 1
+    cache.invalidate()
+    assert not cache.stats()["cached"]
+    assert cache.get() == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_the_least_recently_used(clock):
+    cache = LRUCache(max_size=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"   # a is now the most recently used
+    cache.put("d", "D")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["A", "C", "D"]
+    cache.put("c", "C2")            # overwriting refreshes without growing
+    assert len(cache) == 3 and cache.get("c") == "C2"
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"], stats["misses"]) == (3, 1, 5, 1)
+    assert stats["hit_rate"] == round(5 / 6, 4)
+
+
+def test_lru_expires_entries_older_than_max_age(clock):
+    cache = LRUCache(max_size=10, max_age=60)
+    cache.put("a", 1)
+    clock.now += 30
+    cache.put("b", 2)
+    clock.now += 31
+    assert cache.get("a") is None and cache.get("b") == 2
+    assert "a" not in cache._entries
+    stats = cache.stats()
+    assert (stats["expirations"], stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1, 1)
+
+
+def test_lru_get_or_compute_computes_once_per_key(clock):
+    cache, computed = LRUCache(max_size=2), []
+
+    def compute(key):
+        return lambda: computed.append(key) or key * 2
+
+    assert [cache.get_or_compute(key, compute(key)) for key in (1, 1, 2, 1, 3, 2)] == [2, 2, 4, 2, 6, 4]
+    # 2 was evicted by 3 (1 had been used more recently), so it is computed again
+    assert computed == [1, 2, 3, 2]
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hit_rate"] == round(2 / 6, 4)
@@ -0,0 +1,80 @@
+"""
+Leaderboard sync against a brute-force latest-per-user ranking
+"""
+
+import pytest
+
+from caching import StaleWhileRevalidateCache
+from eas_client import EASError
+from fake_eas import RandomHistory, SCHEMA
+from leaderboard import Leaderboard, leaderboard_response, rank_response, refresher
+
+
+def brute_force(history):
+    """{user id: (rank, attestation)} by competition ranking over the newest standing attestations"""
+    latest = history.latest()
+    return {user_id: (1 + sum(other["points"] > att["points"] for other in latest.values()), att)
+            for user_id, att in latest.items()}
+
+
+def assert_matches(board, history):
+    expected = brute_force(history)
+    assert len(board) == len(expected)
+    top = board.top(len(expected) + 5)
+    assert [entry["twitterUserId"] for entry in top] == sorted(expected, key=lambda user_id: (-expected[user_id][1]["points"], user_id))
+    for entry in top:
+        rank, att = expected[entry["twitterUserId"]]
+        assert (entry["rank"], entry["points"], entry["id"]) == (rank, att["points"], att["id"])
+        assert board.lookup(entry["twitterUserId"]) == {"total": len(expected), **entry}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_sync_matches_brute_force(seed):
+    history = RandomHistory(seed)
+    board = Leaderboard(SCHEMA)
+    history.add(200)
+    history.revoke(20)
+    board.sync(page_size=7, eas=history.eas)
+    assert_matches(board, history)
+    for _ in range(10):
+        history.add(history.random.randrange(30))
+        history.revoke(history.random.randrange(8))
+        board.sync(page_size=7, eas=history.eas)
+        assert_matches(board, history)
+
+
+def test_failed_first_pass_keeps_the_index_and_resumes():
+    history = RandomHistory(1)
+    history.add(100)
+    history.eas.fail_on = {3}
+    board = Leaderboard(SCHEMA)
+    with pytest.raises(EASError):
+        board.sync(page_size=10, eas=history.eas)
+    assert not board.complete and 0 < len(board) == len(board._entries)
+    history.add(20)
+    board.sync(page_size=10, eas=history.eas)
+    assert board.complete
+    assert_matches(board, history)
+
+
+def test_parameters_are_validated_before_the_board_is_loaded():
+    def get_board():
+        raise AssertionError("board loaded for an invalid request")
+
+    for limit, offset in (("abc", 0), (10, "x"), (0, 0), (10, -1), (5000, 0)):
+        assert leaderboard_response(get_board, limit, offset)[1] == 400
+
+
+def test_cold_board_answers_503_while_it_loads(tmp_path):
+    history = RandomHistory(2)
+    history.add(150)
+    board = Leaderboard(SCHEMA)
+    cache = StaleWhileRevalidateCache(refresher(board, db_path=str(tmp_path / "missing.db"), eas=history.eas), ttl=60)
+    payload, status = leaderboard_response(cache.get, 10, 0)
+    assert status == 503 and payload["loading"]
+    board._warmup.join(10)
+    payload, status = leaderboard_response(cache.get, 500, 0)
+    assert status == 200 and payload["total"] == len(brute_force(history))
+    user_id = payload["entries"][0]["twitterUserId"]
+    assert rank_response(cache.get, user_id) == ({"success": True, "schema": SCHEMA, "field": board.field, **board.lookup(user_id)}, 200)
+    assert_matches(board, history)
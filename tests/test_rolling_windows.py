@@ -0,0 +1,72 @@
+"""
+RollingWindows running sums against recomputing every window from the raw events
+"""
+
+import random
+
+import pytest
+
+from rolling_windows import RollingWindows, WINDOWS, DAY
+
+
+class BruteForce:
+    """Keeps every accepted delta and sums each window from scratch"""
+
+    def __init__(self, windows):
+        self.windows = windows
+        self.events = {}
+        self.clock = {}
+        self.last = {}
+
+    def append(self, user_id, points, timestamp, attestation_id):
+        key = (timestamp, attestation_id)
+        if user_id in self.last and key <= self.last[user_id][0]:
+            return None
+        previous = self.last.get(user_id, (None, None))[1]
+        self.last[user_id] = (key, points)
+        self.clock[user_id] = max(self.clock.get(user_id, 0), timestamp)
+        if previous is None:
+            self.events.setdefault(user_id, [])
+            return None
+        self.events[user_id].append((timestamp, points - previous))
+        return points - previous
+
+    def window(self, user_id, name, now=None):
+        if user_id not in self.last:
+            return None
+        if now is not None:
+            self.clock[user_id] = max(self.clock[user_id], now)
+        cutoff = self.clock[user_id] - self.windows[name]
+        return sum(delta for timestamp, delta in self.events.get(user_id, ()) if timestamp > cutoff)
+
+
+@pytest.mark.parametrize("windows, step", [({"10s": 10, "1m": 60, "5m": 300}, 20), (WINDOWS, DAY // 2)])
+@pytest.mark.parametrize("seed", range(4))
+def test_window_sums_match_brute_force(windows, step, seed):
+    rng = random.Random(seed)
+    users = [str(1000 + i) for i in range(8)]
+    rolling, brute = RollingWindows(windows), BruteForce(windows)
+    clock, points = 1_700_000_000, {user_id: 0 for user_id in users}
+    for i in range(3000):
+        action = rng.random()
+        user_id = rng.choice(users)
+        if action < 0.7:
+            clock += rng.randrange(step)
+            points[user_id] += rng.randrange(-5, 100)
+            # Mostly in order; some re-reads and late rows, which only run forward
+            timestamp = clock - (rng.randrange(3 * step) if rng.random() < 0.1 else 0)
+            attestation_id = f"0x{rng.getrandbits(32):08x}"
+            assert rolling.append(user_id, points[user_id], timestamp, attestation_id) == \
+                brute.append(user_id, points[user_id], timestamp, attestation_id)
+        elif action < 0.9:
+            name = rng.choice(list(windows))
+            now = clock + rng.randrange(2 * step) if rng.random() < 0.5 else None
+            assert rolling.window(user_id, name, now) == brute.window(user_id, name, now)
+        else:
+            name = rng.choice(list(windows))
+            now = clock + rng.randrange(4 * step)
+            expected = sorted(((brute.window(u, name, now), u) for u in users if u in brute.last), reverse=True)[:3]
+            assert rolling.top(name, 3, now) == [(u, gained) for gained, u in expected]
+    for user_id in users:
+        if user_id in brute.last:
+            assert rolling.user_windows(user_id) == {name: brute.window(user_id, name) for name in windows}
@@ -0,0 +1,142 @@
+"""
+The rule engine profiles against the scorers they replaced
+"""
+
+import json
+import logging
+import random
+
+import pytest
+
+import legacy_scorers
+from content_analysis import RULES_PATH, scoring_profile
+from rule_engine import RuleError, RulesFile, compile_profiles
+
+FUZZ_TEXTS = 5000
+
+WORDS = [
+    "defi", "Layer", "l2", "AI", "rwa", "TVL", "airdrop", "protocol", "chain", "token", "nft", "dao", "staking",
+    "yield", "bridge", "zk", "rollup", "evm", "smart contract", "agi", "funding", "liquidity", "crypto", "blockchain",
+    "to the moon", "lfg", "gm", "gn", "ser", "ngmi", "wagmi", "bullish", "bearish", "what", "how", "why", "thoughts",
+    "think", "opinion", "see", "do you", "follow me", "rt this", "like if", "revenue", "vs", "compare", "risk",
+    "thread", "1/", "kaito", "@kaito", "@", "?", "??", "•", "kenapa", "bagaimana", "mengapa", "analisis", "thesis",
+    "20%", "$5", "3x", "100M", "2B", "²", "aaaa", "!!!!", "hello", "world", "the", "a",
+]
+
+
+def fuzz_texts(seed, count=FUZZ_TEXTS):
+    rng = random.Random(seed)
+    texts = ["", " ", "x" * 300, "a" * 150, "?" * 4]
+    for _ in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 70)))
+        texts.append(text[:rng.randint(0, 400)])
+    return texts
+
+
+@pytest.mark.parametrize("profile, legacy", [
+    ("kaito_full", legacy_scorers.analyze_content_full),
+    ("kaito_lite", legacy_scorers.analyze_content_lite),
+    ("yaps_simple", legacy_scorers.analyze_yaps_score),
+])
+def test_profile_matches_legacy_scorer(profile, legacy):
+    evaluate = scoring_profile(profile).evaluate
+    for text in fuzz_texts(seed=profile):
+        expected = legacy(text)
+        result = evaluate(text)
+        assert result == expected, text
+        # Same key order as well, since the JSON responses are built from these dicts
+        assert json.dumps(result) == json.dumps(expected), text
+
+
+def test_bulk_scorer_matches_profile():
+    pytest.importorskip("numpy")
+    from bulk_scoring import score_bulk
+
+    texts = fuzz_texts(seed="bulk")
+    scores = score_bulk(texts)
+    for i, text in enumerate(texts):
+        analysis = legacy_scorers.analyze_content_full(text)
+        kaito = analysis["kaito_yaps"]
+        breakdown = kaito["breakdown"]
+        assert scores["content_opt_score"][i] == breakdown["content_optimization"]["score"]
+        assert scores["engagement_score"][i] == breakdown["engagement_strategy"]["score"]
+        assert scores["quality_score"][i] == breakdown["content_quality"]["score"]
+        assert scores["total_score"][i] == kaito["total_score"]
+        assert scores["estimated_yaps"][i] == kaito["estimated_yaps"]
+        assert scores["twitter_score"][i] == analysis["twitter_algorithm"]["score"]
+
+
+def test_bulk_scorer_follows_edited_rules():
+    pytest.importorskip("numpy")
+    from bulk_scoring import score_bulk
+
+    with open(RULES_PATH, encoding="utf-8") as f:
+        config = json.load(f)
+    kaito = config["profiles"]["kaito_full"]
+    kaito["terms"]["crypto_keywords"].append("hello")
+    kaito["scores"][0]["rules"][1]["points"] = 2.5
+    kaito["scores"][3]["weights"] = [["content_opt_score", 0.25], ["engagement_score", 0.45], ["quality_score", 0.35]]
+    kaito["scores"][4]["multiply"] = [0.65, 80]
+    profile = compile_profiles(config)["kaito_full"]
+
+    texts = fuzz_texts(seed="edited", count=2000)
+    scores = score_bulk(texts, profile)
+    for i, text in enumerate(texts):
+        kaito_yaps = profile.evaluate(text)["kaito_yaps"]
+        assert scores["total_score"][i] == kaito_yaps["total_score"]
+        assert scores["estimated_yaps"][i] == kaito_yaps["estimated_yaps"]
+
+
+def _kaito_full(config):
+    return config["profiles"]["kaito_full"]
+
+
+@pytest.mark.parametrize("edit", [
+    lambda p: p.update(terms=["a"]),
+    lambda p: p.update(patterns=[1]),
+    lambda p: p.update(scores={}),
+    lambda p: p.update(bands={"b": 5}),
+    lambda p: p["scores"][0].update(rules=3),
+    lambda p: p["scores"][3].update(weights=5),
+    lambda p: p["scores"][3].update(weights=[["content_opt_score"]]),
+    lambda p: p["scores"][3].update(round="1"),
+    lambda p: p["scores"][4].update(multiply=2),
+    lambda p: p["bands"]["rating"].update(thresholds=[5]),
+])
+def test_malformed_rules_raise_rule_error(edit):
+    with open(RULES_PATH, encoding="utf-8") as f:
+        config = json.load(f)
+    edit(_kaito_full(config))
+    with pytest.raises(RuleError):
+        compile_profiles(config)
+
+
+def test_rules_file_keeps_previous_rules_on_a_bad_edit(tmp_path, caplog, capsys):
+    caplog.set_level(logging.INFO, logger="rule_engine")
+    path = tmp_path / "scoring_rules.json"
+    with open(RULES_PATH, encoding="utf-8") as f:
+        config = json.load(f)
+    path.write_text(json.dumps(config), encoding="utf-8")
+    rules = RulesFile(str(path), check_interval=0)
+    text = "TVL up 20% vs last week, thoughts?"
+    before = rules.profiles()["kaito_full"].evaluate(text)
+
+    _kaito_full(config)["terms"] = ["a"]
+    path.write_text(json.dumps(config) + " ", encoding="utf-8")
+    assert rules.profiles()["kaito_full"].evaluate(text) == before
+    # Compile errors outside the validated shapes count as failed reloads too
+    config["profiles"]["kaito_lite"]["extends"] = ["kaito_full"]
+    path.write_text(json.dumps(config), encoding="utf-8")
+    assert rules.profiles()["kaito_full"].evaluate(text) == before
+    stats = rules.stats()
+    assert stats["version"] == 1
+    assert stats["errors"] == 2
+    assert stats["last_error"]
+
+    # Notices go to the rule_engine logger, not stdout (every worker process would print them)
+    with open(RULES_PATH, encoding="utf-8") as f:
+        path.write_text(f.read(), encoding="utf-8")
+    assert rules.profiles()["kaito_full"].evaluate(text) == before
+    assert rules.stats()["version"] == 2
+    assert [record.levelname for record in caplog.records if record.name == "rule_engine"] == ["WARNING", "WARNING", "INFO"]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,77 @@
+"""
+SingleFlight: concurrent callers of one key share a single upstream call
+"""
+
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def burst(flight, fn, callers=16):
+    """Start ``callers`` threads on one key; returns (threads, results) once all but the leader wait"""
+    results = [None] * callers
+
+    def call(i):
+        try:
+            results[i] = ("ok", flight.do("kaito:projects", fn))
+        except Exception as e:
+            results[i] = ("error", e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: flight.stats()["shared"] == callers - 1)
+    return threads, results
+
+
+def test_concurrent_callers_share_one_call_and_result():
+    flight, release, upstream = SingleFlight(), threading.Event(), []
+
+    def fetch():
+        upstream.append(1)
+        release.wait(5)
+        return {"projects": ["monad"]}
+
+    threads, results = burst(flight, fetch)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(upstream) == 1
+    assert all(status == "ok" and value is results[0][1] for status, value in results)
+    assert flight.stats() == {"calls": 1, "shared": 15, "in_flight": 0}
+
+
+def test_concurrent_callers_share_one_exception():
+    flight, release = SingleFlight(), threading.Event()
+    error = RuntimeError("upstream down")
+
+    def fetch():
+        release.wait(5)
+        raise error
+
+    threads, results = burst(flight, fetch)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert all(status == "error" and value is error for status, value in results)
+    assert flight.stats()["calls"] == 1
+
+
+def test_finished_calls_are_forgotten():
+    flight, upstream = SingleFlight(), []
+    assert flight.do("a", lambda: upstream.append(1) or len(upstream)) == 1
+    assert flight.do("a", lambda: upstream.append(1) or len(upstream)) == 2
+    with pytest.raises(ValueError):
+        flight.do("a", int, "not a number")
+    assert flight.do("b", max, 3, 4) == 4
+    assert flight.stats() == {"calls": 4, "shared": 0, "in_flight": 0}
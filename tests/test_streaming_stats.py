@@ -0,0 +1,38 @@
+"""
+schema_stats counts each user's newest value once
+"""
+
+import pytest
+
+from attestation_store import AttestationStore
+from fake_eas import FakeEAS, SCHEMA
+from streaming_stats import schema_stats
+
+
+def history():
+    eas = FakeEAS()
+    # A frequently attested user: old cumulative snapshots must not be counted
+    for i, points in enumerate((10, 20, 30, 40, 500)):
+        eas.add(f"0x1{i}", 111, points, 1000 + i)
+    eas.add("0x20", 222, 100, 1001)
+    eas.add("0x21", 222, 200, 1002)
+    eas.add("0x22", 222, 999, 1003)
+    eas.revoke("0x22", 2000)
+    eas.add("0x30", 333, 300, 1001)
+    return eas
+
+
+@pytest.mark.parametrize("local", [False, True])
+def test_only_the_latest_value_per_user_is_counted(tmp_path, local):
+    eas = history()
+    if local:
+        with AttestationStore(str(tmp_path / "yaps.db")) as store:
+            store.sync(SCHEMA, page_size=3, eas=eas)
+            stats, user_value = schema_stats(SCHEMA, "yapPoints", 111, store=store)
+    else:
+        stats, user_value = schema_stats(SCHEMA, "yapPoints", 111, eas=eas)
+    assert stats.count == 3
+    assert (stats.min, stats.max, stats.total) == (200, 500, 1000)
+    assert user_value == 500
+    assert stats.percentile_rank(user_value) == 100
+    assert stats.percentile_rank(250) == pytest.approx(100 / 3)